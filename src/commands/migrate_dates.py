@@ -0,0 +1,108 @@
+"""
+Migración única de fechas guardadas como cadena a fechas BSON.
+
+Convierte createdAt/updatedAt de las solicitudes de audio y las fechas de
+lastMembership de los usuarios. Es idempotente y puede repetirse; las cadenas
+vacías pasan a null y las que no se pueden interpretar se conservan y se
+informan como pendientes.
+
+Cuando una colección queda sin pendientes se puede activar
+HYPNOSIS_DATES_MIGRATED o USER_MEMBERSHIP_DATES_MIGRATED para que las
+consultas dejen de usar $convert.
+
+Uso:
+    python -m src.commands.migrate_dates [--collection all|audio-requests|users] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from src.modules.v1.hypnosis.repository import HYPNOSIS_REPOSITORY
+from src.modules.v1.users.repository import USERS_REPOSITORY
+
+LOGGER = logging.getLogger("uvicorn").getChild("commands.migrate_dates")
+
+AUDIO_REQUESTS_COLLECTION = "audio-requests"
+USERS_COLLECTION = "users"
+
+# Variable de entorno que se activa cuando la colección ya no tiene cadenas.
+MIGRATED_FLAGS: dict[str, str] = {
+    AUDIO_REQUESTS_COLLECTION: "HYPNOSIS_DATES_MIGRATED",
+    USERS_COLLECTION: "USER_MEMBERSHIP_DATES_MIGRATED",
+}
+
+
+async def _migrateCollection(collection: str, dryRun: bool) -> bool:
+    """Migra una colección y devuelve True si ya no quedan fechas como cadena."""
+
+    if collection == AUDIO_REQUESTS_COLLECTION:
+        countPending = HYPNOSIS_REPOSITORY.countStringDates
+        migrate = HYPNOSIS_REPOSITORY.migrateDates
+    else:
+        countPending = USERS_REPOSITORY.countStringMembershipDates
+        migrate = USERS_REPOSITORY.migrateMembershipDates
+
+    pending = await countPending()
+    LOGGER.info("%s: fechas guardadas como cadena antes de migrar: %s", collection, pending)
+
+    if dryRun:
+        return not any(pending.values())
+
+    if any(pending.values()):
+        await migrate()
+        pending = await countPending()
+
+    if any(pending.values()):
+        LOGGER.warning(
+            "%s: quedan fechas que no se pudieron convertir y requieren revisión: %s",
+            collection,
+            pending,
+        )
+        return False
+
+    LOGGER.info("%s: sin fechas pendientes; se puede activar %s=true", collection, MIGRATED_FLAGS[collection])
+    return True
+
+
+async def migrateDates(collections: list[str], dryRun: bool) -> bool:
+    """
+    Migra las colecciones indicadas en orden.
+
+    Returns:
+        bool: True si ninguna colección tiene fechas pendientes.
+    """
+
+    results = [await _migrateCollection(collection, dryRun) for collection in collections]
+    return all(results)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Convierte a fechas BSON las fechas guardadas como cadena.")
+    parser.add_argument(
+        "--collection",
+        choices=["all", AUDIO_REQUESTS_COLLECTION, USERS_COLLECTION],
+        default="all",
+        help="Colección a migrar (por defecto todas).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Solo cuenta las fechas pendientes, sin modificar documentos.",
+    )
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    collections = (
+        [AUDIO_REQUESTS_COLLECTION, USERS_COLLECTION]
+        if arguments.collection == "all"
+        else [arguments.collection]
+    )
+
+    isComplete = asyncio.run(migrateDates(collections, arguments.dry_run))
+    return 0 if isComplete else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+import typing
+import pydantic_settings
+import pydantic
+
+class CacheConfig(pydantic_settings.BaseSettings):
+    
+    model_config = pydantic_settings.SettingsConfigDict(
+        env_file=".env",
+        extra="ignore",
+        case_sensitive=False,
+        env_file_encoding="utf-8",
+        env_nested_delimiter="__",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True
+    )
+
+    CACHE_BACKEND: typing.Literal["memory", "sqlite", "redis"] = pydantic.Field(
+        default="memory",
+        description=(
+            "Backend de cache para los servicios: memory (por proceso), sqlite (archivo local "
+            "compartido entre workers del mismo host) o redis (compartido entre hosts)."
+        ),
+    )
+
+    CACHE_REDIS_URL: str = pydantic.Field(
+        default="redis://localhost:6379/0",
+        description="URL del servidor compatible con el protocolo Redis cuando CACHE_BACKEND=redis.",
+    )
+
+    CACHE_SQLITE_PATH: str = pydantic.Field(
+        default="/tmp/mental-data-cache.sqlite3",
+        description="Ruta del archivo SQLite cuando CACHE_BACKEND=sqlite.",
+    )
+
+    CACHE_NAMESPACE: str = pydantic.Field(
+        default="mental-data:",
+        description="Prefijo de las claves en los backends compartidos.",
+    )
+
+    CACHE_LOCK_POLL_INTERVAL_SECONDS: float = pydantic.Field(
+        default=0.05,
+        description="Intervalo de sondeo mientras otro worker calcula el mismo valor (protección de estampida).",
+        gt=0,
+    )
+    CACHE_RANGE_QUANTIZATION_ENABLED: bool = pydantic.Field(
+        default=True,
+        description=(
+            "Ajusta fromDate/toDate a bordes de minuto, hora o día antes de consultar el cache, "
+            "para que rangos relativos a 'ahora' compartan la misma clave."
+        ),
+    )
+
+    CACHE_RANGE_MINUTE_MAX_SECONDS: int = pydantic.Field(
+        default=86_400,
+        description="Largo máximo (segundos) de un rango que se ajusta a minutos; sobre este valor se ajusta a horas.",
+        gt=0,
+    )
+
+    CACHE_RANGE_HOUR_MAX_SECONDS: int = pydantic.Field(
+        default=31 * 86_400,
+        description="Largo máximo (segundos) de un rango que se ajusta a horas; sobre este valor se ajusta a días.",
+        gt=0,
+    )
+
+    CACHE_ANALYTICS_MAX_STALE_SECONDS: int = pydantic.Field(
+        default=900,
+        description=(
+            "Tiempo máximo (segundos) que un resultado analítico vencido se sigue entregando mientras "
+            "se recalcula en segundo plano (stale-while-revalidate). 0 desactiva el modo."
+        ),
+        ge=0,
+    )
+
+    CACHE_REVALIDATION_LEASE_SECONDS: int = pydantic.Field(
+        default=60,
+        description="Duración máxima del lock de una revalidación en segundo plano si el worker que la ejecuta cae.",
+        gt=0,
+    )
+
+    CACHE_WARMER_ENABLED: bool = pydantic.Field(
+        default=True,
+        description="Recalcula periódicamente las consultas por defecto del dashboard antes de que venzan.",
+    )
+
+    CACHE_WARMER_INTERVAL_SECONDS: int = pydantic.Field(
+        default=240,
+        description="Intervalo entre ciclos de precalentado; debe ser menor que el ttl de los servicios (300 s).",
+        gt=0,
+    )
+
+    CACHE_WARMER_JITTER_SECONDS: int = pydantic.Field(
+        default=30,
+        description="Variación aleatoria máxima (segundos) aplicada al inicio y al intervalo de cada ciclo.",
+        ge=0,
+    )
+
+    CACHE_WARMER_CONCURRENCY: int = pydantic.Field(
+        default=2,
+        description="Máximo de consultas simultáneas a Mongo durante el precalentado (por worker con CACHE_BACKEND=memory).",
+        gt=0,
+    )
+
+    CACHE_NEGATIVE_TTL_SECONDS: int = pydantic.Field(
+        default=30,
+        description=(
+            "ttl (segundos) de los resultados vacíos, p. ej. conteos en cero por rangos futuros o "
+            "muy acotados. Nunca supera el ttl normal de la función."
+        ),
+        gt=0,
+    )
+
+    CACHE_MEMORY_MAX_ENTRIES: int = pydantic.Field(
+        default=1024,
+        description="Máximo de entradas por función con CACHE_BACKEND=memory antes de expulsar las menos usadas (LRU).",
+        gt=0,
+    )
+
+    CACHE_MEMORY_MAX_BYTES: int = pydantic.Field(
+        default=32 * 1024 * 1024,
+        description="Tamaño aproximado máximo (bytes, medido como JSON) por función con CACHE_BACKEND=memory.",
+        gt=0,
+    )
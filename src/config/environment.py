@@ -6,6 +6,7 @@ from .sentry_config import SentryConfig
 from .hypnosis_config import HypnosisConfig
 from .connections_config import ConnectionsConfig
 from .auth_config import AuthConfig
+from .cache_config import CacheConfig
 
 class EnvironmentConfig(pydantic_settings.BaseSettings):
 
@@ -48,4 +49,9 @@ class EnvironmentConfig(pydantic_settings.BaseSettings):
     AUTH_CONFIG: AuthConfig = pydantic.Field(
         default_factory=AuthConfig,
         description="Configuración de la integración de autenticación upstream.",
+    )
+
+    CACHE_CONFIG: CacheConfig = pydantic.Field(
+        default_factory=CacheConfig,
+        description="Configuración del backend de cache de los servicios.",
     )
\ No newline at end of file
@@ -44,4 +44,24 @@ class HypnosisConfig(pydantic_settings.BaseSettings):
     HYPNOSIS_WS_URL: str = pydantic.Field(
         default="ws://localhost:8000",
         description="URL del WebSocket de la API de hipnosis.",
-    )
\ No newline at end of file
+    )
+
+    HYPNOSIS_PAGE_SIZE_DEFAULT: int = pydantic.Field(
+        default=50,
+        description="Solicitudes de audio por página del listado cuando no se indica pageSize.",
+        gt=0,
+    )
+
+    HYPNOSIS_PAGE_SIZE_MAX: int = pydantic.Field(
+        default=500,
+        description="Máximo de solicitudes de audio por página (y de IDs por consulta) aceptado.",
+        gt=0,
+    )
+
+    HYPNOSIS_DATES_MIGRATED: bool = pydantic.Field(
+        default=False,
+        description=(
+            "Indica que createdAt/updatedAt de las solicitudes de audio ya son fechas BSON "
+            "(python -m src.commands.migrate_dates); las consultas dejan de convertirlas con $convert."
+        ),
+    )
@@ -24,4 +24,69 @@ class UsersConfig(pydantic_settings.BaseSettings):
     USER_COLLECTION_NAME: str = pydantic.Field(
         default="users",
         description="Nombre de la colección que contiene los documentos de usuarios.",
-    )
\ No newline at end of file
+    )
+
+    USER_DISTRIBUTION_VECTORIZED_MIN_USERS: int = pydantic.Field(
+        default=5_000,
+        description=(
+            "Cantidad de usuarios desde la cual las distribuciones se calculan en bloque con "
+            "pandas/NumPy en lugar del recorrido usuario por usuario."
+        ),
+        gt=0,
+    )
+
+    USER_BIRTHDATE_CACHE_MAX_ENTRIES: int = pydantic.Field(
+        default=65_536,
+        description=(
+            "Máximo de fechas de nacimiento distintas cuyo bucket de edad se mantiene en memoria; "
+            "el cache se vacía al cambiar el día."
+        ),
+        gt=0,
+    )
+
+    USER_DISTRIBUTION_PROCESS_WORKERS: int = pydantic.Field(
+        default=0,
+        description=(
+            "Procesos usados para calcular distribuciones grandes fuera del worker web; "
+            "0 las calcula en un hilo."
+        ),
+        ge=0,
+    )
+
+    USER_DISTRIBUTION_PROCESS_MIN_USERS: int = pydantic.Field(
+        default=20_000,
+        description="Cantidad de usuarios desde la cual la distribución se envía a un proceso aparte.",
+        gt=0,
+    )
+
+    USER_EXPORT_BATCH_SIZE: int = pydantic.Field(
+        default=1_000,
+        description="Documentos leídos del cursor y filas escritas por bloque en las exportaciones.",
+        gt=0,
+    )
+
+    USER_PAGE_SIZE_DEFAULT: int = pydantic.Field(
+        default=100,
+        description="Usuarios por página del listado cuando no se indica pageSize.",
+        gt=0,
+    )
+
+    USER_PAGE_SIZE_MAX: int = pydantic.Field(
+        default=1_000,
+        description="Máximo de usuarios por página aceptado por el listado.",
+        gt=0,
+    )
+
+    USER_ID_BATCH_SIZE: int = pydantic.Field(
+        default=1_000,
+        description="Máximo de IDs por consulta $in al cargar usuarios por lista de IDs.",
+        gt=0,
+    )
+
+    USER_MEMBERSHIP_DATES_MIGRATED: bool = pydantic.Field(
+        default=False,
+        description=(
+            "Indica que las fechas de lastMembership ya son fechas BSON (python -m src.commands.migrate_dates); "
+            "las consultas dejan de convertirlas con $convert."
+        ),
+    )
@@ -1,3 +1,4 @@
+import contextlib
 import os
 import fastapi
 import sentry_sdk
@@ -8,6 +9,7 @@ from guard.models import SecurityConfig
 from .config import ENVIRONMENT_CONFIG
 from .modules import ALL_MODULE_ROUTERS
 from .modules.auth.guards.token_guard import verifyAccessToken
+from .modules.v1.dashboard.services import warmup_service
 
 sentry_sdk.init(
     dsn=ENVIRONMENT_CONFIG.SENTRY_CONFIG.SENTRY_DSN,
@@ -18,10 +20,19 @@ sentry_sdk.init(
     enable_logs=ENVIRONMENT_CONFIG.SENTRY_CONFIG.SENTRY_ENABLE_LOGS
 )
 
+@contextlib.asynccontextmanager
+async def lifespan(app: fastapi.FastAPI):
+    # Precalienta en segundo plano las consultas por defecto del dashboard.
+    warmup_service.startCacheWarmer()
+    yield
+    await warmup_service.stopCacheWarmer()
+
+
 APP = fastapi.FastAPI(
     title="MENTAL DATA API" + " - " + ENVIRONMENT_CONFIG.SENTRY_CONFIG.SENTRY_ENVIRONMENT,
     version=ENVIRONMENT_CONFIG.SENTRY_CONFIG.SENTRY_RELEASE,
     description="Aplicación FastAPI para el procesamiento de datos de Mental",
+    lifespan=lifespan,
 )
 
 APP.add_middleware(
@@ -0,0 +1,5 @@
+from .cache_controller import ROUTER as CACHE_ROUTER
+
+ALL_CONTROLLERS = [
+    CACHE_ROUTER,
+]
\ No newline at end of file
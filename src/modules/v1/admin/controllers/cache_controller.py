@@ -0,0 +1,116 @@
+import typing
+import fastapi
+import logging
+from ..schemas import cache_schema
+from ..services import cache_admin_service
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.admin.controllers.cache")
+
+
+ROUTER = fastapi.APIRouter(
+    prefix="/cache",
+)
+
+
+@ROUTER.get(
+    "/stats",
+    summary="Obtener métricas del cache de servicios",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=cache_schema.CacheStatsSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": cache_schema.CacheStatsSchema},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getCacheStats() -> cache_schema.CacheStatsSchema:
+    """
+    Entrega por función cacheada los aciertos, fallos, esperas por estampida y
+    tiempos de cálculo, junto con las entradas vigentes y su tamaño aproximado.
+
+    Los contadores pertenecen al worker que atiende la solicitud; las entradas
+    reflejan el backend configurado (compartido con sqlite o redis).
+    """
+
+    return await cache_admin_service.getCacheStats()
+
+
+@ROUTER.get(
+    "/metrics",
+    summary="Obtener métricas del cache en formato Prometheus",
+    response_class=fastapi.responses.PlainTextResponse,
+    responses={
+        200: {"description": "Métricas en formato de texto de Prometheus", "content": {"text/plain": {}}},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getCacheMetrics() -> fastapi.responses.PlainTextResponse:
+    """Expone las mismas métricas de /cache/stats para ser recolectadas por Prometheus."""
+
+    stats = await cache_admin_service.getCacheStats()
+
+    return fastapi.responses.PlainTextResponse(
+        content=cache_admin_service.renderPrometheusMetrics(stats),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@ROUTER.post(
+    "/invalidate",
+    summary="Invalidar entradas del cache de servicios",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=cache_schema.CacheInvalidationSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": cache_schema.CacheInvalidationSchema},
+        400: {"description": "Solicitud inválida"},
+        404: {"description": "No existe una función cacheada con ese nombre"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def invalidateCache(
+    request: fastapi.Request,
+    functionName: typing.Annotated[
+        typing.Optional[str],
+        fastapi.Query(description="Función cacheada a invalidar, p. ej. getUsersWithAURACount."),
+    ] = None,
+    prefix: typing.Annotated[
+        typing.Optional[str],
+        fastapi.Query(description="Prefijo de clave a invalidar, p. ej. src.modules.v1.users."),
+    ] = None,
+) -> cache_schema.CacheInvalidationSchema:
+    """
+    Elimina entradas del cache después de una carga o corrección de datos.
+
+    Debe indicarse exactamente uno de functionName o prefix. Con el backend en
+    memoria solo se limpia el worker que atiende la solicitud.
+    """
+
+    # Exactamente uno de los dos criterios
+    if (functionName is None) == (prefix is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Debe proporcionarse exactamente uno de functionName o prefix.",
+        )
+
+    if prefix is not None and not prefix.strip():
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro prefix no puede estar vacío.",
+        )
+
+    result = await cache_admin_service.invalidateCache(
+        functionName=functionName,
+        prefix=prefix,
+    )
+
+    if functionName is not None and not result.functions:
+        raise fastapi.HTTPException(
+            status_code=404,
+            detail=f"No existe una función cacheada llamada {functionName}.",
+        )
+
+    LOGGER.info(
+        f"Cache invalidado por la sesión {getattr(request.state, 'authSessionId', None)}: "
+        f"functionName={functionName}, prefix={prefix}, eliminadas={result.deleted}"
+    )
+
+    return result
@@ -0,0 +1,3 @@
+from . import (
+    cache_schema as cache_schema,
+)
\ No newline at end of file
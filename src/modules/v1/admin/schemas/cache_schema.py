@@ -0,0 +1,156 @@
+import pydantic
+import typing
+
+
+class CacheFunctionStatsSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    function: str = pydantic.Field(
+        ...,
+        description="Nombre completo (módulo y función) de la función cacheada.",
+    )
+
+    hits: int = pydantic.Field(
+        default=0,
+        description="Respuestas entregadas desde el cache estando vigentes.",
+    )
+
+    staleHits: int = pydantic.Field(
+        default=0,
+        description="Respuestas vencidas entregadas mientras se revalidaban en segundo plano.",
+    )
+
+    misses: int = pydantic.Field(
+        default=0,
+        description="Llamadas que no encontraron valor y calcularon el resultado.",
+    )
+
+    stampedeWaits: int = pydantic.Field(
+        default=0,
+        description="Llamadas que esperaron a que otro cálculo de la misma clave terminara.",
+    )
+
+    evictions: int = pydantic.Field(
+        default=0,
+        description="Entradas descartadas por el límite de entradas o bytes del cache en memoria.",
+    )
+
+    computes: int = pydantic.Field(
+        default=0,
+        description="Ejecuciones reales de la función (incluye revalidación y precalentado).",
+    )
+
+    computeSeconds: float = pydantic.Field(
+        default=0.0,
+        description="Tiempo total (segundos) invertido en calcular la función.",
+    )
+
+    avgComputeSeconds: float = pydantic.Field(
+        default=0.0,
+        description="Tiempo promedio (segundos) por cálculo.",
+    )
+
+    maxComputeSeconds: float = pydantic.Field(
+        default=0.0,
+        description="Cálculo más lento observado (segundos).",
+    )
+
+    hitRatio: float = pydantic.Field(
+        default=0.0,
+        description="Proporción de llamadas resueltas desde el cache (incluye staleHits).",
+    )
+
+    entries: int = pydantic.Field(
+        default=0,
+        description="Entradas vigentes de la función en el backend.",
+    )
+
+    approxBytes: int = pydantic.Field(
+        default=0,
+        description="Tamaño aproximado (bytes) de las entradas vigentes.",
+    )
+
+
+class CacheStatsSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+        json_schema_extra={
+            "example": {
+                "backend": "sqlite",
+                "totalEntries": 12,
+                "totalApproxBytes": 48213,
+                "functions": [
+                    {
+                        "function": "src.modules.v1.users.services.users_service._getUsersWithAURACount",
+                        "hits": 120,
+                        "staleHits": 4,
+                        "misses": 6,
+                        "stampedeWaits": 2,
+                        "evictions": 0,
+                        "computes": 8,
+                        "computeSeconds": 3.2,
+                        "avgComputeSeconds": 0.4,
+                        "maxComputeSeconds": 0.9,
+                        "hitRatio": 0.95,
+                        "entries": 3,
+                        "approxBytes": 96,
+                    }
+                ],
+            }
+        },
+    )
+
+    backend: str = pydantic.Field(
+        ...,
+        description="Backend de cache configurado (memory, sqlite o redis).",
+    )
+
+    totalEntries: int = pydantic.Field(
+        ...,
+        description="Suma de entradas vigentes de todas las funciones.",
+    )
+
+    totalApproxBytes: int = pydantic.Field(
+        ...,
+        description="Suma del tamaño aproximado de todas las entradas.",
+    )
+
+    functions: typing.List[CacheFunctionStatsSchema] = pydantic.Field(
+        default_factory=list,
+        description="Métricas por función. Los contadores son del worker que responde; entries y approxBytes reflejan el backend.",
+    )
+
+
+class CacheInvalidationSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    backend: str = pydantic.Field(
+        ...,
+        description="Backend de cache configurado. Con memory solo se invalida el worker que atendió la solicitud.",
+    )
+
+    functions: typing.List[str] = pydantic.Field(
+        default_factory=list,
+        description="Funciones cacheadas afectadas por la invalidación.",
+    )
+
+    deleted: int = pydantic.Field(
+        ...,
+        description="Cantidad de entradas eliminadas.",
+    )
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+
+from src.config import ENVIRONMENT_CONFIG
+from src.modules.v1.shared import cache as cache_utils
+from ..schemas import cache_schema
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.admin.services.cache")
+
+PROMETHEUS_PREFIX = "mental_data_cache"
+
+# (campo del schema, nombre de la métrica, tipo, ayuda)
+_PROMETHEUS_METRICS: tuple[tuple[str, str, str, str], ...] = (
+    ("hits", "hits_total", "counter", "Respuestas entregadas desde el cache estando vigentes."),
+    ("staleHits", "stale_hits_total", "counter", "Respuestas vencidas entregadas mientras se revalidaban."),
+    ("misses", "misses_total", "counter", "Llamadas sin valor en cache."),
+    ("stampedeWaits", "stampede_waits_total", "counter", "Llamadas que esperaron otro cálculo de la misma clave."),
+    ("evictions", "evictions_total", "counter", "Entradas expulsadas por el límite del cache en memoria."),
+    ("computes", "computes_total", "counter", "Ejecuciones reales de la función."),
+    ("computeSeconds", "compute_seconds_total", "counter", "Tiempo total invertido en calcular la función."),
+    ("maxComputeSeconds", "compute_seconds_max", "gauge", "Cálculo más lento observado."),
+    ("entries", "entries", "gauge", "Entradas vigentes en el backend."),
+    ("approxBytes", "entry_bytes", "gauge", "Tamaño aproximado de las entradas vigentes."),
+)
+
+
+async def getCacheStats() -> cache_schema.CacheStatsSchema:
+    """
+    Combina los contadores del worker con el estado actual del backend para
+    cada función decorada con cachedStampede.
+    """
+
+    counters = cache_utils.getCacheStats()
+    registered = cache_utils.getRegisteredCaches()
+
+    names = sorted(set(counters) | set(registered))
+
+    async def describe(name: str) -> tuple[int, int]:
+        decorated = registered.get(name)
+        if decorated is None:
+            return 0, 0
+        try:
+            return await decorated.describeEntries()
+        except Exception:
+            LOGGER.exception("No se pudieron contar las entradas de %s", name)
+            return 0, 0
+
+    descriptions = await asyncio.gather(*(describe(name) for name in names))
+
+    functions: list[cache_schema.CacheFunctionStatsSchema] = []
+    for name, (entries, approxBytes) in zip(names, descriptions):
+        functions.append(
+            cache_schema.CacheFunctionStatsSchema(
+                function=name,
+                entries=entries,
+                approxBytes=approxBytes,
+                **counters.get(name, {}),
+            )
+        )
+
+    return cache_schema.CacheStatsSchema(
+        backend=ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_BACKEND,
+        totalEntries=sum(function.entries for function in functions),
+        totalApproxBytes=sum(function.approxBytes for function in functions),
+        functions=functions,
+    )
+
+
+def _escapeLabel(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def renderPrometheusMetrics(stats: cache_schema.CacheStatsSchema) -> str:
+    """Serializa las métricas de cache en el formato de texto de Prometheus."""
+
+    lines: list[str] = []
+    backend = _escapeLabel(stats.backend)
+
+    for field, metric, metricType, description in _PROMETHEUS_METRICS:
+        name = f"{PROMETHEUS_PREFIX}_{metric}"
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metricType}")
+        for function in stats.functions:
+            labels = f'function="{_escapeLabel(function.function)}",backend="{backend}"'
+            lines.append(f"{name}{{{labels}}} {getattr(function, field)}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _matchFunctionName(
+    registered: dict[str, cache_utils.SharedCachedStampede | cache_utils.BatchLoader],
+    functionName: str,
+) -> list[str]:
+    # Se acepta el nombre completo, el de la función privada o el del alias público.
+    candidates = {functionName, f"_{functionName}"}
+    return [
+        name
+        for name, decorated in registered.items()
+        if name == functionName or decorated.functionName in candidates
+    ]
+
+
+async def invalidateCache(
+    functionName: str | None,
+    prefix: str | None,
+) -> cache_schema.CacheInvalidationSchema:
+    """
+    Elimina entradas del cache de servicios tras una carga o corrección de datos.
+
+    Args:
+        functionName: Función cacheada (nombre completo, privado o público).
+        prefix: Prefijo de clave, p. ej. "src.modules.v1.users" o la clave de
+            una función con parte de sus argumentos.
+
+    Returns:
+        cache_schema.CacheInvalidationSchema: Funciones afectadas y entradas
+        eliminadas. Si functionName no existe, la lista de funciones va vacía.
+    """
+
+    registered = cache_utils.getRegisteredCaches()
+    deleted = 0
+
+    if functionName is not None:
+        affected = _matchFunctionName(registered, functionName)
+        for name in affected:
+            deleted += await registered[name].invalidate()
+    else:
+        affected = [
+            name
+            for name, decorated in registered.items()
+            if decorated.keyPrefix.startswith(prefix) or prefix.startswith(decorated.keyPrefix)
+        ]
+
+        # Con backend compartido todas las funciones usan la misma instancia; se limpia una vez.
+        caches = {id(registered[name].cache): registered[name].cache for name in affected}
+        for cache in caches.values():
+            deleted += await cache_utils.deleteKeys(cache, prefix)
+
+    LOGGER.info(
+        "Invalidación de cache: %s entradas eliminadas en %s",
+        deleted,
+        ", ".join(affected) or "ninguna función",
+    )
+
+    return cache_schema.CacheInvalidationSchema(
+        backend=ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_BACKEND,
+        functions=sorted(affected),
+        deleted=deleted,
+    )
@@ -0,0 +1 @@
+from .router import ROUTER as ROUTER
\ No newline at end of file
@@ -0,0 +1,5 @@
+from .dashboard_controller import ROUTER as DASHBOARD_ROUTER
+
+ALL_CONTROLLERS = [
+    DASHBOARD_ROUTER,
+]
\ No newline at end of file
@@ -0,0 +1,64 @@
+import typing
+import fastapi
+import logging
+from src.modules.v1.shared import cache as cache_utils
+from ..schemas import dashboard_schema
+from ..services import dashboard_service
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.dashboard.controllers.dashboard")
+
+
+ROUTER = fastapi.APIRouter()
+
+
+@ROUTER.get(
+    "/summary",
+    summary="Obtener resumen de conteos del dashboard",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=dashboard_schema.DashboardSummarySchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": dashboard_schema.DashboardSummarySchema},
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getDashboardSummary(
+    subscriberActive: typing.Annotated[
+        typing.Optional[bool],
+        fastapi.Query(
+            description="Filtra los conteos de AURA e hipnosis por suscriptores activos (True) o inactivos (False)."
+        ),
+    ] = None,
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+) -> dashboard_schema.DashboardSummarySchema:
+    """
+    Obtiene en una sola respuesta los conteos del dashboard principal.
+
+    Equivale a /users/suscribers/count (activos e inactivos), /users/count/aura,
+    /users/count/user-with-hypnosis-request, /hypnosis/count/audio-requests y
+    /hypnosis/count/audio-requests/listened-status con el mismo rango de fechas.
+    """
+
+    # Ambas fechas deben ser provistas juntas o ninguna
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Los parámetros fromDate y toDate deben proporcionarse juntos o no incluirse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro toDate debe ser mayor o igual que fromDate.",
+        )
+
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+
+    summary = await dashboard_service.getDashboardSummary(
+        fromDate=fromDate,
+        toDate=toDate,
+        subscriberActive=subscriberActive,
+    )
+
+    return summary
\ No newline at end of file
@@ -0,0 +1,3 @@
+from . import (
+    dashboard_schema as dashboard_schema,
+)
\ No newline at end of file
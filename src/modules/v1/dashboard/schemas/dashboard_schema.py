@@ -0,0 +1,62 @@
+import pydantic
+import typing
+
+
+class DashboardSummarySchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    activeSuscribers: int = pydantic.Field(
+        ...,
+        description="Cantidad de suscriptores activos.",
+    )
+
+    inactiveSuscribers: int = pydantic.Field(
+        ...,
+        description="Cantidad de suscriptores inactivos.",
+    )
+
+    usersWithAURA: int = pydantic.Field(
+        ...,
+        description="Cantidad de usuarios con AURA habilitado.",
+    )
+
+    usersWithHypnosisRequest: int = pydantic.Field(
+        ...,
+        description="Cantidad de usuarios con al menos una solicitud de hipnosis.",
+    )
+
+    audioRequests: int = pydantic.Field(
+        ...,
+        description="Cantidad total de solicitudes de audio.",
+    )
+
+    listenedAudioRequests: int = pydantic.Field(
+        ...,
+        description="Solicitudes de audio escuchadas.",
+    )
+
+    notListenedAudioRequests: int = pydantic.Field(
+        ...,
+        description="Solicitudes de audio aún no escuchadas.",
+    )
+
+    subscriberActive: typing.Optional[bool] = pydantic.Field(
+        default=None,
+        description="Filtro de suscripción aplicado a los conteos de AURA e hipnosis (None incluye todos).",
+    )
+
+    fromDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp inicial (segundos Unix) utilizado en el filtrado.",
+    )
+
+    toDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp final (segundos Unix) utilizado en el filtrado.",
+    )
\ No newline at end of file
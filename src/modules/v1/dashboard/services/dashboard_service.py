@@ -0,0 +1,58 @@
+import asyncio
+
+from src.modules.v1.users.services import suscribers_service, users_service
+from src.modules.v1.hypnosis.services import hypnosis_service
+from ..schemas import dashboard_schema
+
+
+async def getDashboardSummary(
+    fromDate: int | None,
+    toDate: int | None,
+    subscriberActive: bool | None,
+) -> dashboard_schema.DashboardSummarySchema:
+    """
+    Calcula todos los conteos del dashboard principal en paralelo.
+
+    Cada conteo reutiliza la función cacheada del servicio correspondiente, por
+    lo que comparte cache con los endpoints individuales.
+    """
+
+    (
+        suscribersByStatus,
+        userFactsCube,
+        audioRequests,
+        listenedAudioRequests,
+        notListenedAudioRequests,
+    ) = await asyncio.gather(
+        suscribers_service.getSuscribersCountByStatus(fromDate, toDate),
+        users_service.getUserFactsCube(fromDate, toDate),
+        hypnosis_service.getAllHypnosisRequestsCount(fromDate, toDate),
+        hypnosis_service.getHypnosisRequestsCountByListenedStatus(True, fromDate, toDate),
+        hypnosis_service.getHypnosisRequestsCountByListenedStatus(False, fromDate, toDate),
+    )
+
+    # Los conteos de AURA e hipnosis se derivan del mismo cubo de usuarios.
+    usersWithAURA = users_service.countFromUserFactsCube(
+        userFactsCube,
+        auraEnabled=True,
+        subscriberActive=subscriberActive,
+        createdInRange=True,
+    )
+    usersWithHypnosisRequest = users_service.countFromUserFactsCube(
+        userFactsCube,
+        subscriberActive=subscriberActive,
+        hasHypnosisRequest=True,
+    )
+
+    return dashboard_schema.DashboardSummarySchema(
+        activeSuscribers=suscribersByStatus.active.total,
+        inactiveSuscribers=suscribersByStatus.inactive.total,
+        usersWithAURA=usersWithAURA,
+        usersWithHypnosisRequest=usersWithHypnosisRequest,
+        audioRequests=audioRequests,
+        listenedAudioRequests=listenedAudioRequests,
+        notListenedAudioRequests=notListenedAudioRequests,
+        subscriberActive=subscriberActive,
+        fromDate=fromDate,
+        toDate=toDate,
+    )
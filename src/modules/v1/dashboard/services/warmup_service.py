@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import random
+import time
+import typing
+
+from src.config import ENVIRONMENT_CONFIG
+from src.modules.v1.shared import cache as cache_utils
+from src.modules.v1.users.services import suscribers_service, users_service
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.dashboard.services.warmup")
+
+DAY_SECONDS = 86_400
+
+# Rangos relativos (en días) que el dashboard consulta por defecto.
+WARMUP_RANGE_DAYS: tuple[int, ...] = (7, 30)
+
+_warmerTask: asyncio.Task | None = None
+
+WarmupJob = typing.Callable[[], typing.Awaitable[typing.Any]]
+
+
+def _buildWarmupRanges(now: float) -> list[tuple[int | None, int | None]]:
+    """
+    Rangos canónicos del dashboard ya cuantizados igual que en los controladores:
+    histórico completo, el día UTC en curso y los últimos 7 y 30 días.
+    """
+
+    nowSeconds = int(now)
+    todayStart = (nowSeconds // DAY_SECONDS) * DAY_SECONDS
+
+    ranges: list[tuple[int | None, int | None]] = [
+        (None, None),
+        cache_utils.quantizeDateRange(todayStart, todayStart + DAY_SECONDS - 1),
+    ]
+    for days in WARMUP_RANGE_DAYS:
+        ranges.append(cache_utils.quantizeDateRange(nowSeconds - days * DAY_SECONDS, nowSeconds))
+
+    return ranges
+
+
+def _buildWarmupJobs(
+    ranges: list[tuple[int | None, int | None]],
+    portals: list[int],
+) -> list[WarmupJob]:
+    jobs: list[WarmupJob] = []
+
+    for fromDate, toDate in ranges:
+        # Los argumentos replican los valores por defecto de los endpoints para compartir la clave.
+        jobs.extend(
+            [
+                lambda fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    suscribers_service.getSuscribersCountByStatus, fromDate, toDate
+                ),
+                lambda fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    suscribers_service.getAllSuscribersCount, True, fromDate, toDate
+                ),
+                lambda fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    users_service.getUserFactsCube, fromDate, toDate
+                ),
+                lambda fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    users_service.getUsersWithAURACount, True, fromDate, toDate, None
+                ),
+                lambda fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    users_service.getUsersByHypnosisRequestCount, True, fromDate, toDate, None
+                ),
+                lambda fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    users_service.getGeneralUserDistribution, None, None, fromDate, toDate, None, None
+                ),
+            ]
+        )
+
+        for portal in portals:
+            jobs.append(
+                lambda portal=portal, fromDate=fromDate, toDate=toDate: cache_utils.refreshCached(
+                    users_service.getUserPortalDistribution,
+                    str(portal),
+                    fromDate,
+                    toDate,
+                    None,
+                    None,
+                    None,
+                    None,
+                )
+            )
+
+    return jobs
+
+
+async def runCacheWarmup() -> int:
+    """
+    Recalcula una vez las consultas por defecto del dashboard.
+
+    Las consultas se ejecutan con un máximo de CACHE_WARMER_CONCURRENCY en
+    paralelo para no saturar Mongo; un fallo individual no detiene el resto.
+
+    Returns:
+        int: Cantidad de consultas recalculadas sin error.
+    """
+
+    cacheConfig = ENVIRONMENT_CONFIG.CACHE_CONFIG
+
+    portals = await cache_utils.refreshCached(users_service.getUserPortals) or []
+    jobs = _buildWarmupJobs(_buildWarmupRanges(time.time()), portals)
+
+    semaphore = asyncio.Semaphore(cacheConfig.CACHE_WARMER_CONCURRENCY)
+
+    async def runJob(job: WarmupJob) -> bool:
+        async with semaphore:
+            try:
+                await job()
+            except Exception:
+                LOGGER.exception("Falló una consulta del precalentado de cache")
+                return False
+            return True
+
+    results = await asyncio.gather(*(runJob(job) for job in jobs))
+    return sum(results)
+
+
+async def _runCacheWarmer() -> None:
+    global _warmerTask
+
+    cacheConfig = ENVIRONMENT_CONFIG.CACHE_CONFIG
+    interval = cacheConfig.CACHE_WARMER_INTERVAL_SECONDS
+    jitter = cacheConfig.CACHE_WARMER_JITTER_SECONDS
+    leaseSeconds = max(1, interval - jitter)
+
+    try:
+        # El retraso inicial evita que todos los workers arranquen el ciclo a la vez.
+        await asyncio.sleep(random.uniform(0, jitter))
+
+        while True:
+            startedAt = time.monotonic()
+
+            try:
+                # Con un backend compartido solo un worker precalienta por ciclo. El lease
+                # vence antes del siguiente intento más temprano (interval - jitter), así
+                # que el worker que lo tomó nunca se encuentra con su propio lease vigente.
+                if await cache_utils.acquireSharedLease("cache-warmer", ttl=leaseSeconds):
+                    warmed = await runCacheWarmup()
+                    LOGGER.info(
+                        "Precalentado de cache: %s consultas en %.2f segundos",
+                        warmed,
+                        time.monotonic() - startedAt,
+                    )
+            except Exception:
+                LOGGER.exception("Falló el ciclo de precalentado de cache")
+
+            await asyncio.sleep(max(0.0, interval + random.uniform(-jitter, jitter)))
+    finally:
+        _warmerTask = None
+
+
+def startCacheWarmer() -> None:
+    """
+    Inicia la tarea periódica de precalentado si está habilitada.
+
+    Con CACHE_BACKEND=memory cada worker precalienta su propio cache; la carga
+    sobre Mongo queda acotada por CACHE_WARMER_CONCURRENCY en cada réplica.
+    """
+
+    global _warmerTask
+
+    cacheConfig = ENVIRONMENT_CONFIG.CACHE_CONFIG
+    if not cacheConfig.CACHE_WARMER_ENABLED or _warmerTask is not None:
+        return
+
+    _warmerTask = asyncio.create_task(_runCacheWarmer())
+
+
+async def stopCacheWarmer() -> None:
+    """Cancela la tarea de precalentado y espera a que termine."""
+
+    task = _warmerTask
+    if task is None:
+        return
+
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
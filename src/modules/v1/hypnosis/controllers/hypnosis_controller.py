@@ -1,6 +1,8 @@
 import typing
+import zoneinfo
 import fastapi
 import logging
+from src.config import ENVIRONMENT_CONFIG
 from ..schemas import audiorequest_schema
 from ..services import hypnosis_service
 
@@ -109,4 +111,282 @@ async def getAudioRequestsCountByListenedStatus(
         fromDate=fromDate,
         toDate=toDate,
         isListened=isListened,
-    )
\ No newline at end of file
+    )
+
+
+@ROUTER.get(
+    "/count/audio-requests/by-portal",
+    summary="Obtener conteo de solicitudes de audio por portal",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=audiorequest_schema.AudioRequestCountByPortalSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": audiorequest_schema.AudioRequestCountByPortalSchema},
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getAudioRequestsCountByPortal(
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+) -> audiorequest_schema.AudioRequestCountByPortalSchema:
+    """
+    Obtiene, para cada userLevel, el total de solicitudes de audio, las
+    escuchadas, las no escuchadas y el desglose por estado.
+
+    Las solicitudes de un userLevel pertenecen a los usuarios del portal
+    userLevel + 1. Sin rango de fechas consulta el histórico.
+    """
+
+    # Ambas fechas deben ser provistas juntas o ninguna
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Los parámetros fromDate y toDate deben proporcionarse juntos o no incluirse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro toDate debe ser mayor o igual que fromDate.",
+        )
+
+    counts = await hypnosis_service.getHypnosisRequestsCountByPortal(
+        fromDate,
+        toDate,
+    )
+
+    return counts
+
+
+@ROUTER.get(
+    "/series/audio-requests",
+    summary="Obtener serie temporal de solicitudes de audio",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=audiorequest_schema.AudioRequestSeriesSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": audiorequest_schema.AudioRequestSeriesSchema},
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getAudioRequestsSeries(
+    fromDate: typing.Annotated[int, fastapi.Query(description="Timestamp Unix (segundos, entero)")],
+    toDate: typing.Annotated[int, fastapi.Query(description="Timestamp Unix (segundos, entero)")],
+    granularity: typing.Annotated[
+        typing.Literal["hour", "day", "week", "month"],
+        fastapi.Query(description="Tamaño de cada bucket de la serie."),
+    ] = "day",
+    timezone: typing.Annotated[
+        str,
+        fastapi.Query(description="Zona horaria IANA usada para alinear los buckets (por ejemplo America/Santiago)."),
+    ] = "UTC",
+    splitBy: typing.Annotated[
+        typing.Optional[list[typing.Literal["isAvailable", "status", "userLevel"]]],
+        fastapi.Query(description="Campos por los que dividir cada bucket (repetible)."),
+    ] = None,
+) -> audiorequest_schema.AudioRequestSeriesSchema:
+    """
+    Obtiene el número de solicitudes de audio por bucket de tiempo.
+
+    Todos los buckets del intervalo fromDate/toDate se calculan en una sola
+    agregación, opcionalmente divididos por isAvailable, status y/o userLevel.
+    """
+
+    if toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro toDate debe ser mayor o igual que fromDate.",
+        )
+
+    try:
+        zoneinfo.ZoneInfo(timezone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail=f"La zona horaria '{timezone}' no es válida.",
+        )
+
+    # Orden estable para que combinaciones equivalentes compartan la misma clave de cache.
+    normalizedSplitBy = tuple(sorted(set(splitBy or [])))
+
+    series = await hypnosis_service.getHypnosisRequestsSeries(
+        fromDate,
+        toDate,
+        granularity,
+        timezone,
+        normalizedSplitBy,
+    )
+
+    return series
+
+
+_FIELDS_QUERY_DESCRIPTION = (
+    "Campos de AudioRequestSchema separados por coma (el id siempre se incluye). "
+    "Tiene prioridad sobre view."
+)
+
+AudioRequestViewQuery = typing.Annotated[
+    typing.Literal["summary", "detail", "full"],
+    fastapi.Query(
+        description=(
+            "Nivel de detalle cuando no se indica fields: summary (estado y fechas), detail "
+            "(agrega usuario y cuestionario) o full (incluye secciones y texto generado)."
+        ),
+    ),
+]
+
+
+def _parseFieldsOrRaise(fields: str | None, view: str) -> tuple[str, ...]:
+    try:
+        return hypnosis_service.parseAudioRequestFields(fields, view)
+    except ValueError as error:
+        raise fastapi.HTTPException(status_code=400, detail=str(error))
+
+
+@ROUTER.get(
+    "/audio-requests",
+    summary="Listar solicitudes de audio con paginación por cursor",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=audiorequest_schema.AudioRequestPageSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": audiorequest_schema.AudioRequestPageSchema},
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def listAudioRequests(
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    fields: typing.Annotated[typing.Optional[str], fastapi.Query(description=_FIELDS_QUERY_DESCRIPTION)] = None,
+    view: AudioRequestViewQuery = "summary",
+    cursor: typing.Annotated[
+        typing.Optional[str],
+        fastapi.Query(description="Token nextCursor de la página anterior; omitir para la primera página."),
+    ] = None,
+    pageSize: typing.Annotated[
+        int,
+        fastapi.Query(
+            ge=1,
+            le=ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_PAGE_SIZE_MAX,
+            description="Cantidad de solicitudes por página.",
+        ),
+    ] = ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_PAGE_SIZE_DEFAULT,
+) -> audiorequest_schema.AudioRequestPageSchema:
+    """
+    Lista las solicitudes de audio de la más reciente a la más antigua.
+
+    Las páginas se recorren con el token nextCursor, por lo que cada página
+    tiene el mismo costo sin importar cuán avanzada esté. fromDate/toDate y
+    fields deben repetirse al pedir la página siguiente.
+
+    Hasta activar HYPNOSIS_DATES_MIGRATED se ordena y pagina por _id; después,
+    por (createdAt, _id), y solo se listan solicitudes con createdAt de tipo
+    fecha. Se espera un índice {createdAt: -1, _id: -1} en la colección.
+    """
+
+    # Ambas fechas deben ser provistas juntas o ninguna
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Los parámetros fromDate y toDate deben proporcionarse juntos o no incluirse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro toDate debe ser mayor o igual que fromDate.",
+        )
+
+    normalizedFields = _parseFieldsOrRaise(fields, view)
+
+    try:
+        page = await hypnosis_service.getAllHypnosisRequests(
+            fromDate,
+            toDate,
+            normalizedFields,
+            cursor,
+            pageSize,
+        )
+    except ValueError as error:
+        raise fastapi.HTTPException(status_code=400, detail=str(error))
+
+    return page
+
+
+@ROUTER.get(
+    "/audio-requests/by-ids",
+    summary="Obtener solicitudes de audio por lista de IDs",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=audiorequest_schema.AudioRequestListSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": audiorequest_schema.AudioRequestListSchema},
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getAudioRequestsByIDs(
+    ids: typing.Annotated[
+        list[str],
+        fastapi.Query(description="IDs de las solicitudes (repetible)."),
+    ],
+    fields: typing.Annotated[typing.Optional[str], fastapi.Query(description=_FIELDS_QUERY_DESCRIPTION)] = None,
+    view: AudioRequestViewQuery = "summary",
+) -> audiorequest_schema.AudioRequestListSchema:
+    """
+    Obtiene varias solicitudes de audio en una sola consulta, en el orden de
+    los IDs recibidos. Los IDs inexistentes se omiten de la respuesta.
+    """
+
+    maxIDs = ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_PAGE_SIZE_MAX
+    if len(ids) > maxIDs:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail=f"Se pueden solicitar como máximo {maxIDs} IDs por consulta.",
+        )
+
+    normalizedFields = _parseFieldsOrRaise(fields, view)
+
+    requests = await hypnosis_service.getHypnosisRequestsByListOfIDs(
+        tuple(dict.fromkeys(ids)),
+        normalizedFields,
+    )
+
+    return requests
+
+
+@ROUTER.get(
+    "/audio-requests/{requestID}",
+    summary="Obtener una solicitud de audio por ID",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=audiorequest_schema.AudioRequestItem,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": audiorequest_schema.AudioRequestItem},
+        400: {"description": "Solicitud inválida"},
+        404: {"description": "Solicitud no encontrada"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getAudioRequestByID(
+    requestID: str,
+    fields: typing.Annotated[typing.Optional[str], fastapi.Query(description=_FIELDS_QUERY_DESCRIPTION)] = None,
+    view: AudioRequestViewQuery = "summary",
+) -> audiorequest_schema.AudioRequestItem:
+    """
+    Obtiene una solicitud de audio en el nivel de view, o en el menor que
+    cubre los campos pedidos en fields.
+    """
+
+    normalizedFields = _parseFieldsOrRaise(fields, view)
+
+    request = await hypnosis_service.getHypnosisRequestByID(
+        requestID,
+        normalizedFields,
+    )
+
+    if request is None:
+        raise fastapi.HTTPException(
+            status_code=404,
+            detail=f"No existe una solicitud de audio con ID {requestID}.",
+        )
+
+    return request
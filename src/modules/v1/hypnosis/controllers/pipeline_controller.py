@@ -18,7 +18,12 @@ from fastapi import (
 
 from src.config import ENVIRONMENT_CONFIG
 from src.modules.v1.hypnosis.services.pipeline_service import PipelineService
-from src.modules.v1.hypnosis.schemas.pipeline_schema import LoggingEventsResponse, RemainingTasksResponse, LoggingSchema
+from src.modules.v1.hypnosis.schemas.pipeline_schema import (
+    LoggingEventsResponse,
+    RemainingTasksResponse,
+    LoggingSchema,
+    PipelineEventsStatsResponse,
+)
 from src.modules.v1.hypnosis.services import pipeline_events_stream_service
 
 router = APIRouter(prefix="/pipeline", tags=["Hypnosis Pipeline"])
@@ -36,6 +41,24 @@ async def getLoggingEvents(
 ):
     return await service.getLoggingEvents(fromDate=fromDate, toDate=toDate, eventType=eventType)
 
+@router.get("/logging/stats", response_model=PipelineEventsStatsResponse)
+async def getLoggingStats(
+    artifact: typing.Annotated[
+        typing.Optional[str],
+        Query(description="Artifact to summarize (omit to include all artifacts)."),
+    ] = None,
+):
+    """
+    Conteos de eventos por artefacto y eventType en ventanas de 1s, 1m y 5m.
+
+    Para cada ventana se devuelve la ventana en curso (closed=false) y la
+    última ventana cerrada, si existe.
+    """
+    filterKey = pipeline_events_stream_service.normalizeArtifactFilter(artifact)
+    return PipelineEventsStatsResponse(
+        items=pipeline_events_stream_service.getEventStats(filterKey),
+    )
+
 @router.get("/{artifact}/tasks/count-remaining", response_model=RemainingTasksResponse)
 async def getRemainingTasks(
     artifact: str = Path(..., description="Artifact identifier (maker, export, decorator)."),
@@ -54,15 +77,55 @@ async def websocketLoggingProxy(
         default=False,
         description="Cuando es true, omite el envío inicial de eventos recientes.",
     ),
+    eventType: typing.Annotated[
+        typing.Optional[list[str]],
+        Query(description="Tipos de evento a recibir (repetible). Omitir para recibir todos."),
+    ] = None,
+    userLevel: typing.Annotated[
+        typing.Optional[int],
+        Query(description="Solo eventos asociados a este userLevel.", ge=0),
+    ] = None,
+    userLanguage: typing.Annotated[
+        typing.Optional[str],
+        Query(description="Solo eventos asociados a este idioma."),
+    ] = None,
+    audioRequestID: typing.Annotated[
+        typing.Optional[str],
+        Query(description="Solo eventos de esta solicitud de audio."),
+    ] = None,
+    sampleRate: typing.Annotated[
+        typing.Optional[float],
+        Query(description="Fracción de eventos en vivo a enviar (0 < sampleRate <= 1).", gt=0, le=1),
+    ] = None,
+    maxEventsPerSecond: typing.Annotated[
+        typing.Optional[float],
+        Query(description="Tope de eventos en vivo por segundo; el excedente se descarta.", gt=0),
+    ] = None,
+    encoding: typing.Annotated[
+        typing.Literal["json", "msgpack"],
+        Query(description="Codificación de los frames: json (texto) o msgpack (binario, sin campos nulos)."),
+    ] = "json",
 ):
     filterKey = pipeline_events_stream_service.normalizeArtifactFilter(artifact)
+    subscription = pipeline_events_stream_service.RealtimeSubscription(
+        eventTypes=eventType,
+        userLevel=userLevel,
+        userLanguage=userLanguage,
+        audioRequestID=audioRequestID,
+        sampleRate=sampleRate,
+        maxEventsPerSecond=maxEventsPerSecond,
+        encoding=encoding,
+    )
     await websocket.accept()
-    await pipeline_events_stream_service.registerConnection(filterKey, websocket)
+    await pipeline_events_stream_service.registerConnection(filterKey, websocket, subscription)
 
     if not skipSnapshot:
-        snapshot = await pipeline_events_stream_service.snapshotEvents(filterKey)
+        snapshot = await pipeline_events_stream_service.snapshotEvents(filterKey, subscription)
         for item in snapshot:
-            await websocket.send_json(item.model_dump(mode="json", by_alias=True, round_trip=True))
+            await pipeline_events_stream_service.sendEncoded(
+                websocket,
+                pipeline_events_stream_service.encodeEvent(item, encoding),
+            )
 
     try:
         while True:
@@ -80,6 +143,52 @@ async def websocketLoggingProxy(
         raise
 
 
+@router.websocket("/logging/stats/ws")
+async def websocketLoggingStats(
+    websocket: WebSocket,
+    window: str = Query(
+        default="1s",
+        description="Aggregation window to stream (1s, 1m, 5m).",
+    ),
+    artifact: typing.Annotated[
+        typing.Optional[str],
+        Query(description="Artifact to summarize (omit to include all artifacts)."),
+    ] = None,
+    skipSnapshot: bool = Query(
+        default=False,
+        description="Cuando es true, omite el envío inicial de la última ventana cerrada.",
+    ),
+):
+    windowKey = pipeline_events_stream_service.normalizeStatsWindow(window)
+    if windowKey is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid window.")
+        return
+
+    filterKey = pipeline_events_stream_service.normalizeArtifactFilter(artifact)
+    await websocket.accept()
+    await pipeline_events_stream_service.registerStatsConnection(windowKey, filterKey, websocket)
+
+    if not skipSnapshot:
+        summary = pipeline_events_stream_service.lastClosedWindow(windowKey, filterKey)
+        if summary is not None:
+            await websocket.send_json(summary.model_dump(mode="json"))
+
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        logging.getLogger("uvicorn").getChild("v1.hypnosis.pipeline.ws").info(
+            "Client disconnected from logging stats websocket",
+        )
+        await pipeline_events_stream_service.removeStatsConnection(windowKey, websocket)
+    except Exception:
+        logging.getLogger("uvicorn").getChild("v1.hypnosis.pipeline.ws").exception(
+            "Unexpected error in stats websocket connection",
+        )
+        await pipeline_events_stream_service.removeStatsConnection(windowKey, websocket)
+        raise
+
+
 @router.post(
     "/logging/events/webhook",
     status_code=status.HTTP_202_ACCEPTED,
@@ -1,4 +1,7 @@
 from .hypnosis_repository import (
     HypnosisRepository as HypnosisRepository,
     HYPNOSIS_REPOSITORY as HYPNOSIS_REPOSITORY,
+    AUDIO_REQUEST_FIELDS as AUDIO_REQUEST_FIELDS,
+    AUDIO_REQUEST_SUMMARY_FIELDS as AUDIO_REQUEST_SUMMARY_FIELDS,
+    AUDIO_REQUEST_VIEW_FIELDS as AUDIO_REQUEST_VIEW_FIELDS,
 )
\ No newline at end of file
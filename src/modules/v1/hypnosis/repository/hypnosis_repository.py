@@ -1,14 +1,50 @@
+import datetime
 import logging
+import typing
 
+import bson
+import bson.errors
 import pydantic_mongo
 import pymongo
 
 from src.config import ENVIRONMENT_CONFIG
 from src.modules.v1.shared.utils import dates as dates_utils
+from src.modules.v1.shared.utils import mongo_dates as mongo_dates_utils
 from ..schemas import audiorequest_schema
 
 LOGGER = logging.getLogger("uvicorn").getChild("v1.hypnosis.repository.hypnosis")
 
+# Campos de primer nivel que pueden pedirse con fields= ("id" corresponde a _id).
+AUDIO_REQUEST_FIELDS: frozenset[str] = frozenset(audiorequest_schema.AudioRequestSchema.model_fields)
+
+# Campos proyectados por cada nivel de view= (summary, detail, full).
+AUDIO_REQUEST_VIEW_FIELDS: dict[str, tuple[str, ...]] = {
+    view: tuple(sorted(model.model_fields))
+    for view, model in audiorequest_schema.AUDIO_REQUEST_VIEWS.items()
+}
+
+# Proyección por defecto de los listados: deja fuera generatedSections/generatedText,
+# que pueden pesar varios megabytes por documento.
+AUDIO_REQUEST_SUMMARY_FIELDS: tuple[str, ...] = AUDIO_REQUEST_VIEW_FIELDS["summary"]
+
+# Fechas que la migración convierte de cadena a fecha BSON.
+AUDIO_REQUEST_DATE_FIELDS: tuple[str, ...] = ("createdAt", "updatedAt")
+
+# Clave de paginación: (createdAt, _id) del último documento entregado.
+AudioRequestKeyset = tuple[typing.Any, bson.ObjectId]
+
+
+def _normalizeValue(value: typing.Any) -> typing.Any:
+    if isinstance(value, bson.ObjectId):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return int(dates_utils.datetimeToTimestamp(value))
+    if isinstance(value, list):
+        return [_normalizeValue(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalizeValue(item) for key, item in value.items()}
+    return value
+
 
 class HypnosisRepository(
     pydantic_mongo.AbstractRepository[audiorequest_schema.AudioRequestSchema]
@@ -88,6 +124,434 @@ class HypnosisRepository(
         count: int = await self.get_collection().count_documents(finalQuery)
         return count
 
+    async def countAudioRequestsInSegments(
+        self,
+        segments: list[tuple[float, float, bool]],
+    ) -> audiorequest_schema.AudioRequestStatusCountsSchema:
+        """
+        Cuenta las solicitudes de audio (total, escuchadas y no escuchadas) creadas
+        dentro de varios segmentos de tiempo con una sola agregación.
+
+        Cada segmento es (inicio, fin, incluyeFin) en segundos Unix; el inicio
+        siempre es inclusivo.
+        """
+
+        if not segments:
+            return audiorequest_schema.AudioRequestStatusCountsSchema()
+
+        rangeFilters: list[dict[str, typing.Any]] = []
+        for segmentStart, segmentEnd, includeEnd in segments:
+            rangeFilters.append(
+                {
+                    "createdAt": {
+                        "$gte": dates_utils.timestampToDatetime(segmentStart),
+                        "$lte" if includeEnd else "$lt": dates_utils.timestampToDatetime(segmentEnd),
+                    }
+                }
+            )
+
+        if len(rangeFilters) == 1:
+            finalQuery = rangeFilters[0]
+        else:
+            finalQuery = {"$or": rangeFilters}
+
+        pipeline: list[dict[str, typing.Any]] = [
+            {"$match": finalQuery},
+            {
+                "$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "listened": {
+                        "$sum": {"$cond": [{"$eq": ["$isAvailable", False]}, 1, 0]}
+                    },
+                    "notListened": {
+                        "$sum": {"$cond": [{"$eq": ["$isAvailable", True]}, 1, 0]}
+                    },
+                }
+            },
+        ]
+
+        cursor = await self.get_collection().aggregate(pipeline)
+        result = await cursor.to_list(length=1)
+        if not result:
+            return audiorequest_schema.AudioRequestStatusCountsSchema()
+
+        return audiorequest_schema.AudioRequestStatusCountsSchema.model_validate(result[0])
+
+    async def countAudioRequestsByPortal(
+        self,
+        fromDate: int | None,
+        toDate: int | None,
+    ) -> list[audiorequest_schema.AudioRequestPortalCountsSchema]:
+        """
+        Cuenta las solicitudes de audio por userLevel (total, escuchadas, no
+        escuchadas y por estado) con una sola agregación.
+
+        userLevel se normaliza a string porque se almacena tanto como string
+        como numérico. Las solicitudes de un userLevel corresponden a los
+        usuarios del portal userLevel + 1 (ver getUsersByPortal).
+        """
+
+        queryFilters: dict[str, typing.Any] = {}
+
+        if fromDate is not None and toDate is not None:
+            queryFilters["createdAt"] = {
+                "$gte": dates_utils.timestampToDatetime(fromDate),
+                "$lte": dates_utils.timestampToDatetime(toDate),
+            }
+
+        pipeline: list[dict[str, typing.Any]] = [
+            {"$match": queryFilters},
+            {
+                "$group": {
+                    "_id": {
+                        "userLevel": {
+                            "$convert": {
+                                "input": "$userLevel",
+                                "to": "string",
+                                "onError": None,
+                                "onNull": None,
+                            }
+                        },
+                        "status": "$status",
+                    },
+                    "total": {"$sum": 1},
+                    "listened": {
+                        "$sum": {"$cond": [{"$eq": ["$isAvailable", False]}, 1, 0]}
+                    },
+                    "notListened": {
+                        "$sum": {"$cond": [{"$eq": ["$isAvailable", True]}, 1, 0]}
+                    },
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$_id.userLevel",
+                    "total": {"$sum": "$total"},
+                    "listened": {"$sum": "$listened"},
+                    "notListened": {"$sum": "$notListened"},
+                    "byStatus": {"$push": {"status": "$_id.status", "count": "$total"}},
+                }
+            },
+            {"$sort": {"_id": 1}},
+        ]
+
+        cursor = await self.get_collection().aggregate(pipeline)
+        documents = await cursor.to_list(length=None)
+
+        portals: list[audiorequest_schema.AudioRequestPortalCountsSchema] = []
+        for document in documents:
+            userLevel = document["_id"]
+            try:
+                portal = int(userLevel) + 1
+            except (TypeError, ValueError):
+                portal = None
+
+            byStatus: dict[str, int] = {}
+            for statusCount in document["byStatus"]:
+                status = statusCount.get("status")
+                status = "unknown" if status is None else str(status)
+                byStatus[status] = byStatus.get(status, 0) + statusCount["count"]
+
+            portals.append(
+                audiorequest_schema.AudioRequestPortalCountsSchema(
+                    userLevel=userLevel,
+                    portal=portal,
+                    total=document["total"],
+                    listened=document["listened"],
+                    notListened=document["notListened"],
+                    byStatus=dict(sorted(byStatus.items())),
+                )
+            )
+
+        LOGGER.info(
+            "Se contaron solicitudes de audio de %s userLevel con la consulta: %s",
+            len(portals),
+            queryFilters,
+        )
+
+        return portals
+
+    async def getAudioRequestsSeries(
+        self,
+        fromDate: int,
+        toDate: int,
+        granularity: str,
+        timezone: str,
+        splitBy: tuple[str, ...],
+    ) -> list[audiorequest_schema.AudioRequestSeriesPointSchema]:
+        """
+        Agrupa las solicitudes de audio en buckets de tiempo con una sola agregación.
+
+        Los buckets se calculan con $dateTrunc en la zona horaria indicada (las
+        semanas comienzan el lunes). splitBy agrega al agrupamiento los campos
+        isAvailable, status y/o userLevel. Los buckets sin solicitudes no se
+        incluyen en el resultado.
+        """
+
+        fromDateParsed = dates_utils.timestampToDatetime(fromDate)
+        toDateParsed = dates_utils.timestampToDatetime(toDate)
+
+        groupID: dict[str, typing.Any] = {
+            "bucket": {
+                "$dateTrunc": {
+                    "date": "$createdAt",
+                    "unit": granularity,
+                    "timezone": timezone,
+                    "startOfWeek": "monday",
+                }
+            }
+        }
+
+        if "isAvailable" in splitBy:
+            groupID["isAvailable"] = "$isAvailable"
+
+        if "status" in splitBy:
+            groupID["status"] = "$status"
+
+        if "userLevel" in splitBy:
+            # userLevel se almacena tanto como string como numérico.
+            groupID["userLevel"] = {
+                "$convert": {
+                    "input": "$userLevel",
+                    "to": "string",
+                    "onError": None,
+                    "onNull": None,
+                }
+            }
+
+        pipeline: list[dict[str, typing.Any]] = [
+            {
+                "$match": {
+                    "createdAt": {
+                        "$gte": fromDateParsed,
+                        "$lte": toDateParsed,
+                    }
+                }
+            },
+            {"$group": {"_id": groupID, "count": {"$sum": 1}}},
+            {"$sort": {"_id.bucket": 1}},
+        ]
+
+        cursor = await self.get_collection().aggregate(pipeline)
+        documents = await cursor.to_list(length=None)
+
+        LOGGER.info(
+            "Se obtuvieron %s buckets de solicitudes de audio con el pipeline: %s",
+            len(documents),
+            pipeline,
+        )
+
+        points: list[audiorequest_schema.AudioRequestSeriesPointSchema] = []
+        for document in documents:
+            key = document["_id"]
+            points.append(
+                audiorequest_schema.AudioRequestSeriesPointSchema(
+                    bucketStart=int(dates_utils.datetimeToTimestamp(key["bucket"])),
+                    count=int(document["count"]),
+                    isAvailable=key.get("isAvailable"),
+                    status=key.get("status"),
+                    userLevel=key.get("userLevel"),
+                )
+            )
+
+        return points
+
+
+    @staticmethod
+    def _buildProjection(fields: typing.Iterable[str]) -> dict[str, int]:
+        projection = {"_id": 1, "createdAt": 1}
+        for field in fields:
+            if field != "id":
+                projection[field] = 1
+        return projection
+
+    @staticmethod
+    def _normalizeDocument(
+        document: dict[str, typing.Any],
+        fields: typing.Iterable[str],
+    ) -> dict[str, typing.Any]:
+        """Devuelve id y los campos pedidos con ObjectId y fechas convertidos a JSON."""
+
+        normalized: dict[str, typing.Any] = {"id": str(document["_id"])}
+        for field in fields:
+            if field != "id" and field in document:
+                normalized[field] = _normalizeValue(document[field])
+        return normalized
+
+    async def getAllAudioRequests(
+        self,
+        fromDate: int | None,
+        toDate: int | None,
+        fields: tuple[str, ...],
+        after: AudioRequestKeyset | None,
+        pageSize: int,
+    ) -> tuple[list[dict[str, typing.Any]], AudioRequestKeyset | None]:
+        """
+        Obtiene una página de solicitudes de audio, de la más reciente a la más
+        antigua, proyectando solo los campos pedidos.
+
+        Con HYPNOSIS_DATES_MIGRATED la paginación es por (createdAt, _id) y se
+        limita a documentos cuyo createdAt es fecha BSON; sin migrar, createdAt
+        puede ser cadena o faltar y el orden de tipos de Mongo dejaría fuera
+        documentos al cruzar de un tipo a otro, por lo que se pagina solo por
+        _id (que crece con la creación). En ambos casos cada página continúa
+        después de la clave after sobre un índice, por lo que su costo no
+        depende de la posición.
+
+        Returns:
+            tuple[list[dict], AudioRequestKeyset | None]: Solicitudes de la
+            página y la clave para pedir la siguiente (None si no hay más).
+
+        Raises:
+            ValueError: Si after no tiene un createdAt de tipo fecha estando
+                la colección migrada.
+        """
+
+        isMigrated = ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_DATES_MIGRATED
+
+        queryFilters: list[dict[str, typing.Any]] = []
+
+        if fromDate is not None and toDate is not None:
+            fromDateParsed = dates_utils.timestampToDatetime(fromDate)
+            toDateParsed = dates_utils.timestampToDatetime(toDate)
+
+            queryFilters.append(
+                {
+                    "createdAt": {
+                        "$gte": fromDateParsed,
+                        "$lte": toDateParsed,
+                    }
+                }
+            )
+        elif isMigrated:
+            queryFilters.append({"createdAt": {"$type": "date"}})
+
+        sort: list[tuple[str, int]]
+        if isMigrated:
+            sort = [("createdAt", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)]
+        else:
+            sort = [("_id", pymongo.DESCENDING)]
+
+        if after is not None:
+            afterCreatedAt, afterID = after
+            if not isMigrated:
+                queryFilters.append({"_id": {"$lt": afterID}})
+            elif isinstance(afterCreatedAt, datetime.datetime):
+                queryFilters.append(
+                    {
+                        "$or": [
+                            {"createdAt": {"$lt": afterCreatedAt}},
+                            {"createdAt": afterCreatedAt, "_id": {"$lt": afterID}},
+                        ]
+                    }
+                )
+            else:
+                # Cursor emitido antes de la migración: no sirve para el orden por createdAt.
+                raise ValueError("El cursor de paginación no es válido.")
+
+        if len(queryFilters) == 1:
+            finalQuery = queryFilters[0]
+        elif queryFilters:
+            finalQuery = {"$and": queryFilters}
+        else:
+            finalQuery = {}
+
+        cursor = self.get_collection().find(
+            finalQuery,
+            projection=self._buildProjection(fields),
+            sort=sort,
+            limit=pageSize + 1,
+        )
+        documents = await cursor.to_list(length=pageSize + 1)
+
+        nextKey: AudioRequestKeyset | None = None
+        if len(documents) > pageSize:
+            documents = documents[:pageSize]
+            nextKey = (documents[-1].get("createdAt"), documents[-1]["_id"])
+
+        LOGGER.info(
+            "Se obtuvo una página de %s solicitudes de audio con la consulta: %s",
+            len(documents),
+            finalQuery,
+        )
+
+        return [self._normalizeDocument(document, fields) for document in documents], nextKey
+
+    async def getAudioRequestByID(
+        self,
+        requestID: str,
+        fields: tuple[str, ...],
+    ) -> dict[str, typing.Any] | None:
+        """
+        Obtiene una solicitud de audio por su ID con los campos pedidos, o None
+        si el ID no existe o no es un ObjectId válido.
+        """
+
+        try:
+            objectID = bson.ObjectId(requestID)
+        except (bson.errors.InvalidId, TypeError):
+            return None
+
+        document = await self.get_collection().find_one(
+            {"_id": objectID},
+            projection=self._buildProjection(fields),
+        )
+        if document is None:
+            return None
+
+        return self._normalizeDocument(document, fields)
+
+    async def getAudioRequestsByListOfIDs(
+        self,
+        requestIDs: list[str],
+        fields: tuple[str, ...],
+    ) -> list[dict[str, typing.Any]]:
+        """
+        Obtiene las solicitudes de audio de requestIDs con los campos pedidos,
+        en el orden de los IDs; los inexistentes o inválidos se omiten.
+        """
+
+        objectIDs: list[bson.ObjectId] = []
+        for requestID in dict.fromkeys(requestIDs):
+            try:
+                objectIDs.append(bson.ObjectId(requestID))
+            except (bson.errors.InvalidId, TypeError):
+                LOGGER.warning("ID de solicitud de audio inválido ignorado: %s", requestID)
+
+        if not objectIDs:
+            return []
+
+        cursor = self.get_collection().find(
+            {"_id": {"$in": objectIDs}},
+            projection=self._buildProjection(fields),
+        )
+        documents = await cursor.to_list(length=len(objectIDs))
+
+        documentsByID = {document["_id"]: document for document in documents}
+        return [
+            self._normalizeDocument(documentsByID[objectID], fields)
+            for objectID in objectIDs
+            if objectID in documentsByID
+        ]
+
+    async def countStringDates(self) -> dict[str, int]:
+        """Solicitudes de audio cuyo createdAt/updatedAt sigue guardado como cadena, por campo."""
+
+        return await mongo_dates_utils.countStringDates(self.get_collection(), AUDIO_REQUEST_DATE_FIELDS)
+
+    async def migrateDates(self) -> dict[str, int]:
+        """
+        Convierte a fechas BSON los createdAt/updatedAt guardados como cadena.
+
+        Returns:
+            dict[str, int]: Solicitudes modificadas por campo.
+        """
+
+        modified = await mongo_dates_utils.convertStringDates(self.get_collection(), AUDIO_REQUEST_DATE_FIELDS)
+        LOGGER.info("Fechas de solicitudes de audio migradas a BSON: %s", modified)
+        return modified
+
 
 HYPNOSIS_MONGO_CLIENT = pymongo.AsyncMongoClient(
     ENVIRONMENT_CONFIG.CONNECTIONS_CONFIG.MONGO_DATABASE_URL
@@ -1,3 +1,5 @@
+import datetime
+import functools
 import pydantic
 import pydantic_mongo
 import typing
@@ -14,6 +16,12 @@ class MongoDateSchema(pydantic.BaseModel):
     date: str = pydantic.Field(..., alias="$date")
 
 
+# Fecha de una solicitud: BSON (datetime) una vez migrada; antes de migrar puede
+# llegar como cadena o en JSON extendido ({"$date": ...}). Las lecturas de la API
+# entregan las fechas BSON como segundos Unix (int).
+MongoDateValue = typing.Union[int, datetime.datetime, MongoDateSchema, str]
+
+
 class AudioMotiveSchema(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(
         extra="ignore",
@@ -141,9 +149,12 @@ class StepDataSchema(pydantic.BaseModel):
     decoratorStepData: typing.Optional[DecoratorStepDataSchema] = None
 
 
-class AudioRequestSchema(pydantic.BaseModel):
+class AudioRequestSummarySchema(pydantic.BaseModel):
     """
-    Schema para la solicitud de audios de hipnosis.
+    Schema resumido de una solicitud de audio: identificación, estado y fechas.
+
+    Es el nivel de los listados. Los campos que la proyección (fields=) deja
+    fuera quedan en None.
     """
 
     model_config = pydantic.ConfigDict(
@@ -154,29 +165,69 @@ class AudioRequestSchema(pydantic.BaseModel):
     )
 
     id: pydantic_mongo.ObjectIdAnnotation = pydantic.Field(..., alias="_id")
-    userId: str
-    email: str
-    requestDate: str
-    membershipDate: str
-    status: str
-    audioMotive: AudioMotiveSchema
-    postHypnosis: str
-    questions: typing.List[QuestionSchema]
-    generatedSections: typing.List[GeneratedSectionSchema]
-    generatedText: typing.List[str]
+    userId: typing.Optional[str] = None
+    status: typing.Optional[str] = None
     userLevel: typing.Optional[str] = None
-    userData: UserDataSchema
-    version: str
-    publicationDate: str
-    errorStatus: typing.List[typing.Any]
-    createdAt: MongoDateSchema
-    updatedAt: MongoDateSchema
-    stepData: typing.Optional[StepDataSchema] = None
-    isAvailable: bool = pydantic.Field(
-        default=True,
+    requestDate: typing.Optional[str] = None
+    publicationDate: typing.Optional[str] = None
+    createdAt: typing.Optional[MongoDateValue] = None
+    updatedAt: typing.Optional[MongoDateValue] = None
+    isAvailable: typing.Optional[bool] = pydantic.Field(
+        default=None,
         description="Indica si el audio está disponible para escuchar (aparece como un icono en la app). True significa que aun no se ha escuchado (el icono es visible), False que ya se ha escuchado. (Desaparece el icono).",
     )
 
+
+class AudioRequestDetailSchema(AudioRequestSummarySchema):
+    """
+    Schema de detalle: agrega los datos del usuario y del cuestionario, sin el
+    contenido generado (generatedSections/generatedText).
+    """
+
+    email: typing.Optional[str] = None
+    membershipDate: typing.Optional[str] = None
+    audioMotive: typing.Optional[AudioMotiveSchema] = None
+    postHypnosis: typing.Optional[str] = None
+    questions: typing.Optional[typing.List[QuestionSchema]] = None
+    userData: typing.Optional[UserDataSchema] = None
+    version: typing.Optional[str] = None
+    errorStatus: typing.Optional[typing.List[typing.Any]] = None
+    stepData: typing.Optional[StepDataSchema] = None
+
+
+_GENERATED_SECTIONS_ADAPTER = pydantic.TypeAdapter(typing.List[GeneratedSectionSchema])
+
+
+class AudioRequestSchema(AudioRequestDetailSchema):
+    """
+    Schema para la solicitud de audios de hipnosis.
+
+    generatedSections se guarda sin validar (secciones → audios → textHistorial
+    puede tener miles de elementos) y se valida recién al leer
+    parsedGeneratedSections, una sola vez por instancia.
+    """
+
+    generatedSections: typing.Optional[typing.List[typing.Dict[str, typing.Any]]] = None
+    generatedText: typing.Optional[typing.List[str]] = None
+
+    @functools.cached_property
+    def parsedGeneratedSections(self) -> typing.List[GeneratedSectionSchema]:
+        return _GENERATED_SECTIONS_ADAPTER.validate_python(self.generatedSections or [])
+
+
+# Niveles de detalle disponibles con view= en las lecturas de solicitudes de audio,
+# de menor a mayor.
+AUDIO_REQUEST_VIEWS: typing.Dict[str, typing.Type[AudioRequestSummarySchema]] = {
+    "summary": AudioRequestSummarySchema,
+    "detail": AudioRequestDetailSchema,
+    "full": AudioRequestSchema,
+}
+
+# Solicitud de audio en cualquiera de sus niveles; el orden importa para que
+# pydantic conserve el nivel más chico que cubre los campos recibidos.
+AudioRequestItem = typing.Union[AudioRequestSummarySchema, AudioRequestDetailSchema, AudioRequestSchema]
+
+
 class AudioRequestCountSchema(pydantic.BaseModel):
     """
     Schema para el conteo de solicitudes de audios de hipnosis.
@@ -208,4 +259,282 @@ class AudioRequestCountSchema(pydantic.BaseModel):
     isListened: typing.Optional[bool] = pydantic.Field(
         default=None,
         description="Indica si el conteo corresponde a solicitudes escuchadas (True) o no escuchadas (False).",
-    )
\ No newline at end of file
+    )
+
+class AudioRequestSeriesPointSchema(pydantic.BaseModel):
+    """
+    Schema para un bucket de la serie temporal de solicitudes de audio.
+    """
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    bucketStart: int = pydantic.Field(
+        ...,
+        description="Inicio del bucket (segundos Unix).",
+    )
+
+    count: int = pydantic.Field(
+        ...,
+        description="Número de solicitudes creadas dentro del bucket.",
+    )
+
+    isAvailable: typing.Optional[bool] = pydantic.Field(
+        default=None,
+        description="Valor de isAvailable del grupo (solo cuando se divide por isAvailable).",
+    )
+
+    status: typing.Optional[str] = pydantic.Field(
+        default=None,
+        description="Estado de las solicitudes del grupo (solo cuando se divide por status).",
+    )
+
+    userLevel: typing.Optional[str] = pydantic.Field(
+        default=None,
+        description="userLevel de las solicitudes del grupo (solo cuando se divide por userLevel).",
+    )
+
+
+class AudioRequestSeriesSchema(pydantic.BaseModel):
+    """
+    Schema para la serie temporal de solicitudes de audios de hipnosis.
+    """
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    granularity: str = pydantic.Field(
+        ...,
+        description="Tamaño de los buckets (hour, day, week o month).",
+    )
+
+    timezone: str = pydantic.Field(
+        ...,
+        description="Zona horaria utilizada para alinear los buckets.",
+    )
+
+    fromDate: int = pydantic.Field(
+        ...,
+        description="Timestamp inicial (segundos Unix) utilizado para el filtrado.",
+    )
+
+    toDate: int = pydantic.Field(
+        ...,
+        description="Timestamp final (segundos Unix) utilizado para el filtrado.",
+    )
+
+    splitBy: typing.List[str] = pydantic.Field(
+        default_factory=list,
+        description="Campos adicionales por los que se dividió cada bucket.",
+    )
+
+    total: int = pydantic.Field(
+        ...,
+        description="Total de solicitudes en el rango (suma de todos los buckets).",
+    )
+
+    points: typing.List[AudioRequestSeriesPointSchema] = pydantic.Field(
+        default_factory=list,
+        description="Buckets ordenados cronológicamente; los buckets vacíos se omiten.",
+    )
+
+
+class AudioRequestStatusCountsSchema(pydantic.BaseModel):
+    """
+    Schema para los conteos de solicitudes de audio por estado de escucha.
+    """
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    total: int = pydantic.Field(
+        default=0,
+        description="Total de solicitudes de audio.",
+    )
+
+    listened: int = pydantic.Field(
+        default=0,
+        description="Solicitudes escuchadas (isAvailable=False).",
+    )
+
+    notListened: int = pydantic.Field(
+        default=0,
+        description="Solicitudes no escuchadas (isAvailable=True).",
+    )
+
+
+class AudioRequestPortalCountsSchema(AudioRequestStatusCountsSchema):
+    """
+    Schema para los conteos de solicitudes de audio de un userLevel.
+    """
+
+    userLevel: typing.Optional[str] = pydantic.Field(
+        default=None,
+        description="userLevel de las solicitudes (normalizado a string); None si no está informado.",
+    )
+
+    portal: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Portal de los usuarios que hicieron las solicitudes (userLevel + 1); None si userLevel no es numérico.",
+    )
+
+    byStatus: typing.Dict[str, int] = pydantic.Field(
+        default_factory=dict,
+        description="Solicitudes por estado (status); las que no tienen estado se agrupan en unknown.",
+    )
+
+
+class AudioRequestCountByPortalSchema(pydantic.BaseModel):
+    """
+    Schema para los conteos de solicitudes de audio agrupados por portal.
+    """
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+        json_schema_extra={
+            "example": {
+                "fromDate": 1717200000,
+                "toDate": 1719791999,
+                "total": 130,
+                "portals": [
+                    {
+                        "userLevel": "1",
+                        "portal": 2,
+                        "total": 80,
+                        "listened": 50,
+                        "notListened": 30,
+                        "byStatus": {"completed": 75, "processing": 5},
+                    },
+                    {
+                        "userLevel": "2",
+                        "portal": 3,
+                        "total": 50,
+                        "listened": 20,
+                        "notListened": 30,
+                        "byStatus": {"completed": 50},
+                    },
+                ],
+            }
+        },
+    )
+
+    fromDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp inicial (segundos Unix) utilizado para el filtrado.",
+    )
+
+    toDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp final (segundos Unix) utilizado para el filtrado.",
+    )
+
+    total: int = pydantic.Field(
+        default=0,
+        description="Total de solicitudes de audio de todos los portales.",
+    )
+
+    portals: typing.List[AudioRequestPortalCountsSchema] = pydantic.Field(
+        default_factory=list,
+        description="Conteos por userLevel, ordenados por userLevel.",
+    )
+
+
+class AudioRequestPageSchema(pydantic.BaseModel):
+    """
+    Schema para una página del listado de solicitudes de audio.
+    """
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {
+                        "_id": "665f1c2e9b1e8a0012345678",
+                        "userId": "664a0b1c9b1e8a0012345600",
+                        "status": "completed",
+                        "userLevel": "3",
+                        "isAvailable": False,
+                        "requestDate": "2024-06-04T12:00:00.000Z",
+                        "publicationDate": "2024-06-05T12:00:00.000Z",
+                        "createdAt": 1717502400,
+                        "updatedAt": 1717588800,
+                    }
+                ],
+                "fields": ["createdAt", "id", "isAvailable", "publicationDate", "requestDate", "status", "updatedAt", "userId", "userLevel"],
+                "pageSize": 50,
+                "nextCursor": "eyJjIjp7ImRhdGUiOiIyMDI0LTA2LTA0VDEyOjAwOjAwIn0sImkiOiI2NjVmMWMyZTliMWU4YTAwMTIzNDU2NzgifQ",
+            }
+        },
+    )
+
+    items: typing.List[AudioRequestItem] = pydantic.Field(
+        default_factory=list,
+        description="Solicitudes de la página (más recientes primero) en el nivel de view, o el menor que cubre fields; las fechas BSON se entregan como segundos Unix.",
+    )
+
+    fields: typing.List[str] = pydantic.Field(
+        default_factory=list,
+        description="Campos incluidos en cada solicitud.",
+    )
+
+    pageSize: int = pydantic.Field(
+        ...,
+        description="Tamaño de página solicitado.",
+    )
+
+    nextCursor: typing.Optional[str] = pydantic.Field(
+        default=None,
+        description="Token opaco para pedir la página siguiente; None cuando no hay más solicitudes.",
+    )
+
+    fromDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp inicial (segundos Unix) utilizado para el filtrado.",
+    )
+
+    toDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp final (segundos Unix) utilizado para el filtrado.",
+    )
+
+
+class AudioRequestListSchema(pydantic.BaseModel):
+    """
+    Schema para solicitudes de audio obtenidas por lista de IDs.
+    """
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    items: typing.List[AudioRequestItem] = pydantic.Field(
+        default_factory=list,
+        description="Solicitudes encontradas, en el orden de los IDs pedidos y en el nivel de view o el menor que cubre fields; los IDs inexistentes se omiten.",
+    )
+
+    fields: typing.List[str] = pydantic.Field(
+        default_factory=list,
+        description="Campos incluidos en cada solicitud.",
+    )
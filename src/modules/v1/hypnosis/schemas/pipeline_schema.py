@@ -28,3 +28,15 @@ class RemainingTasksResponse(pydantic.BaseModel):
     artifact: str = pydantic.Field(..., description="Artifact identifier (MAKER, EXPORT, DECORATOR, ...).")
     total: int = pydantic.Field(0, description="Total pending tasks across queues.", ge=0)
     queues: Dict[str, QueueCount] = pydantic.Field(..., description="Breakdown per logical queue key.")
+
+class PipelineEventsWindowSchema(pydantic.BaseModel):
+    window: str = pydantic.Field(..., description="Window label (1s, 1m, 5m).")
+    windowSeconds: int = pydantic.Field(..., description="Window length in seconds.", ge=1)
+    windowStart: int = pydantic.Field(..., description="Window start (Unix timestamp in seconds, inclusive).")
+    windowEnd: int = pydantic.Field(..., description="Window end (Unix timestamp in seconds, exclusive).")
+    closed: bool = pydantic.Field(..., description="True when the window is complete; False for the window still in progress.")
+    total: int = pydantic.Field(0, description="Total events received in the window.", ge=0)
+    counts: Dict[str, Dict[str, int]] = pydantic.Field(default_factory=dict, description="Event counts per artifact and eventType.")
+
+class PipelineEventsStatsResponse(pydantic.BaseModel):
+    items: List[PipelineEventsWindowSchema] = pydantic.Field(..., description="Current and last closed window for every window size.")
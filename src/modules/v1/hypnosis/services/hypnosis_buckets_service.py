@@ -0,0 +1,203 @@
+import collections
+import logging
+import math
+import time
+
+from ..repository import HYPNOSIS_REPOSITORY
+from ..schemas import audiorequest_schema
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.hypnosis.services.buckets")
+
+DAY_SECONDS = 86_400
+HOUR_SECONDS = 3_600
+
+# Niveles de bucket (segundos, unidad de $dateTrunc) del más grueso al más fino.
+BUCKET_LEVELS: tuple[tuple[int, str], ...] = (
+    (DAY_SECONDS, "day"),
+    (HOUR_SECONDS, "hour"),
+)
+
+# Margen tras el fin de un bucket antes de considerarlo cerrado, para no
+# perder documentos insertados con algunos segundos de retraso.
+BUCKET_CLOSE_GRACE_SECONDS = 120
+
+# isAvailable cambia cuando el usuario escucha el audio, por lo que el desglose
+# escuchado/no escuchado de un bucket cerrado sí puede variar. El total de un
+# bucket cerrado es inmutable; el desglose se recalcula pasado este tiempo.
+LISTENED_SPLIT_TTL_SECONDS = 300
+
+# Máximo de buckets guardados por nivel; al superarlo se descartan los usados
+# hace más tiempo (≈11 años de días o ≈170 días de horas).
+BUCKET_STORE_MAX_ENTRIES = 4096
+
+Segment = tuple[float, float, bool]
+
+
+class _BucketEntry:
+    __slots__ = ("counts", "computedAt")
+
+    def __init__(
+        self,
+        counts: audiorequest_schema.AudioRequestStatusCountsSchema,
+        computedAt: float,
+    ) -> None:
+        self.counts = counts
+        self.computedAt = computedAt
+
+
+_bucketStore: dict[int, collections.OrderedDict[int, _BucketEntry]] = {
+    size: collections.OrderedDict() for size, _ in BUCKET_LEVELS
+}
+
+
+def _decomposeRange(
+    fromDate: float,
+    toDate: float,
+    now: float,
+) -> tuple[dict[int, list[int]], list[Segment]]:
+    """
+    Divide [fromDate, toDate] en buckets cerrados y segmentos a consultar en vivo.
+
+    Primero se toman los días completos y cerrados, luego las horas completas y
+    cerradas de los bordes; lo que sobra (fracciones de hora y el bucket en
+    curso) se devuelve como segmentos (inicio, fin, incluyeFin).
+    """
+
+    buckets: dict[int, list[int]] = {size: [] for size, _ in BUCKET_LEVELS}
+    pending: list[Segment] = [(fromDate, toDate, True)]
+
+    for size, _ in BUCKET_LEVELS:
+        closedLimit = int((now - BUCKET_CLOSE_GRACE_SECONDS) // size) * size
+        remaining: list[Segment] = []
+
+        for segmentStart, segmentEnd, includeEnd in pending:
+            firstStart = math.ceil(segmentStart / size) * size
+            lastEnd = min(int(segmentEnd // size) * size, closedLimit)
+
+            if firstStart + size > lastEnd:
+                remaining.append((segmentStart, segmentEnd, includeEnd))
+                continue
+
+            buckets[size].extend(range(firstStart, lastEnd, size))
+
+            if segmentStart < firstStart:
+                remaining.append((segmentStart, firstStart, False))
+            if lastEnd < segmentEnd or (lastEnd == segmentEnd and includeEnd):
+                remaining.append((lastEnd, segmentEnd, includeEnd))
+
+        pending = remaining
+
+    return buckets, pending
+
+
+async def _loadBuckets(
+    size: int,
+    granularity: str,
+    starts: list[int],
+    requireListenedSplit: bool,
+    now: float,
+) -> list[audiorequest_schema.AudioRequestStatusCountsSchema]:
+    """Devuelve los conteos de los buckets pedidos, calculando solo los faltantes."""
+
+    store = _bucketStore[size]
+    missing = [
+        start
+        for start in starts
+        if start not in store
+        or (requireListenedSplit and now - store[start].computedAt > LISTENED_SPLIT_TTL_SECONDS)
+    ]
+
+    # Se toman antes de consultar: otra llamada concurrente puede expulsarlos mientras tanto.
+    entries = {start: store[start] for start in starts if start in store}
+
+    if missing:
+        spanStart = missing[0]
+        spanEnd = missing[-1] + size
+
+        # Una sola agregación cubre todos los buckets faltantes; los buckets sin
+        # solicitudes no aparecen en el resultado y se guardan en cero.
+        points = await HYPNOSIS_REPOSITORY.getAudioRequestsSeries(
+            fromDate=spanStart,
+            toDate=spanEnd,
+            granularity=granularity,
+            timezone="UTC",
+            splitBy=("isAvailable",),
+        )
+
+        fresh: dict[int, dict[str, int]] = {
+            start: {"total": 0, "listened": 0, "notListened": 0}
+            for start in range(spanStart, spanEnd, size)
+        }
+
+        for point in points:
+            counts = fresh.get(point.bucketStart)
+            if counts is None:
+                continue
+            counts["total"] += point.count
+            if point.isAvailable is False:
+                counts["listened"] += point.count
+            elif point.isAvailable is True:
+                counts["notListened"] += point.count
+
+        for start, counts in fresh.items():
+            entries[start] = _BucketEntry(
+                audiorequest_schema.AudioRequestStatusCountsSchema(**counts),
+                now,
+            )
+
+        LOGGER.info(
+            "Se calcularon %s buckets de %s segundos (%s faltantes)",
+            len(fresh),
+            size,
+            len(missing),
+        )
+
+    for start in starts:
+        store[start] = entries[start]
+        store.move_to_end(start)
+    while len(store) > BUCKET_STORE_MAX_ENTRIES:
+        store.popitem(last=False)
+
+    return [entries[start].counts for start in starts]
+
+
+async def countAudioRequestsInRange(
+    fromDate: int,
+    toDate: int,
+    requireListenedSplit: bool,
+) -> audiorequest_schema.AudioRequestStatusCountsSchema:
+    """
+    Cuenta las solicitudes de audio creadas en [fromDate, toDate] sumando buckets
+    cerrados en cache más una consulta en vivo para los bordes y el bucket abierto.
+
+    Con requireListenedSplit se garantiza que el desglose escuchado/no escuchado
+    de los buckets no supere LISTENED_SPLIT_TTL_SECONDS de antigüedad.
+    """
+
+    now = time.time()
+    bucketsBySize, liveSegments = _decomposeRange(fromDate, toDate, now)
+
+    total = 0
+    listened = 0
+    notListened = 0
+
+    for size, granularity in BUCKET_LEVELS:
+        starts = bucketsBySize[size]
+        if not starts:
+            continue
+        for counts in await _loadBuckets(size, granularity, starts, requireListenedSplit, now):
+            total += counts.total
+            listened += counts.listened
+            notListened += counts.notListened
+
+    if liveSegments:
+        liveCounts = await HYPNOSIS_REPOSITORY.countAudioRequestsInSegments(liveSegments)
+        total += liveCounts.total
+        listened += liveCounts.listened
+        notListened += liveCounts.notListened
+
+    return audiorequest_schema.AudioRequestStatusCountsSchema(
+        total=total,
+        listened=listened,
+        notListened=notListened,
+    )
@@ -1,22 +1,40 @@
-import aiocache
+import base64
+import datetime
+import json
 import typing
 
-from ..repository import HYPNOSIS_REPOSITORY
+import bson
+import bson.errors
+
+from src.modules.v1.shared import cache as cache_utils
+
+from ..repository import AUDIO_REQUEST_FIELDS, AUDIO_REQUEST_VIEW_FIELDS, HYPNOSIS_REPOSITORY
+from ..repository.hypnosis_repository import AudioRequestKeyset
 from ..schemas import audiorequest_schema
+from . import hypnosis_buckets_service
 
 CACHE_TTL_SECONDS = 5  # Keep dashboard time series highly up-to-date
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=CACHE_TTL_SECONDS,
-    skip_cache_func=lambda count: count == 0,
+    isNegativeResult=lambda count: count == 0,
 )
 async def _getAllHypnosisRequestsCount(
     fromDate: int | None,
     toDate: int | None,
 ) -> int:
 
+    # Los rangos se resuelven con buckets cerrados en cache más una consulta en vivo.
+    if fromDate is not None and toDate is not None:
+        counts = await hypnosis_buckets_service.countAudioRequestsInRange(
+            fromDate=fromDate,
+            toDate=toDate,
+            requireListenedSplit=False,
+        )
+        return counts.total
+
     count = await HYPNOSIS_REPOSITORY.countAudioRequests(
         fromDate=fromDate,
         toDate=toDate,
@@ -25,10 +43,10 @@ async def _getAllHypnosisRequestsCount(
     return count
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=CACHE_TTL_SECONDS,
-    skip_cache_func=lambda count: count == 0,
+    isNegativeResult=lambda count: count == 0,
 )
 async def _getHypnosisRequestsCountByListenedStatus(
     isListened: bool,
@@ -36,6 +54,14 @@ async def _getHypnosisRequestsCountByListenedStatus(
     toDate: int | None,
 ) -> int:
 
+    if fromDate is not None and toDate is not None:
+        counts = await hypnosis_buckets_service.countAudioRequestsInRange(
+            fromDate=fromDate,
+            toDate=toDate,
+            requireListenedSplit=True,
+        )
+        return counts.listened if isListened else counts.notListened
+
     count = await HYPNOSIS_REPOSITORY.countAudioRequestsByListenedStatus(
         isListened=isListened,
         fromDate=fromDate,
@@ -45,46 +71,197 @@ async def _getHypnosisRequestsCountByListenedStatus(
     return count
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
+    lease=2,
+    ttl=CACHE_TTL_SECONDS,
+    isNegativeResult=lambda counts: counts.total == 0,
+)
+async def _getHypnosisRequestsCountByPortal(
+    fromDate: int | None,
+    toDate: int | None,
+) -> audiorequest_schema.AudioRequestCountByPortalSchema:
+
+    portals = await HYPNOSIS_REPOSITORY.countAudioRequestsByPortal(
+        fromDate=fromDate,
+        toDate=toDate,
+    )
+
+    return audiorequest_schema.AudioRequestCountByPortalSchema(
+        fromDate=fromDate,
+        toDate=toDate,
+        total=sum(portal.total for portal in portals),
+        portals=portals,
+    )
+
+
+@cache_utils.cachedStampede(
+    lease=2,
+    ttl=CACHE_TTL_SECONDS,
+)
+async def _getHypnosisRequestsSeries(
+    fromDate: int,
+    toDate: int,
+    granularity: str,
+    timezone: str,
+    splitBy: tuple[str, ...],
+) -> audiorequest_schema.AudioRequestSeriesSchema:
+
+    points = await HYPNOSIS_REPOSITORY.getAudioRequestsSeries(
+        fromDate=fromDate,
+        toDate=toDate,
+        granularity=granularity,
+        timezone=timezone,
+        splitBy=splitBy,
+    )
+
+    return audiorequest_schema.AudioRequestSeriesSchema(
+        granularity=granularity,
+        timezone=timezone,
+        fromDate=fromDate,
+        toDate=toDate,
+        splitBy=list(splitBy),
+        total=sum(point.count for point in points),
+        points=points,
+    )
+
+
+def parseAudioRequestFields(fields: str | None, view: str = "summary") -> tuple[str, ...]:
+    """
+    Convierte el parámetro fields= (separado por comas) en la tupla de campos
+    a proyectar, ordenada para compartir la clave de cache.
+
+    Sin campos se usan los del nivel view (summary, detail o full).
+
+    Raises:
+        ValueError: Si view no existe o algún campo no existe en AudioRequestSchema.
+    """
+
+    if view not in AUDIO_REQUEST_VIEW_FIELDS:
+        raise ValueError(f"Nivel de detalle no reconocido: {view}.")
+
+    if not fields:
+        return AUDIO_REQUEST_VIEW_FIELDS[view]
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    if not requested:
+        return AUDIO_REQUEST_VIEW_FIELDS[view]
+
+    unknown = sorted(requested - AUDIO_REQUEST_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos no reconocidos en fields: {', '.join(unknown)}.")
+
+    return tuple(sorted(requested | {"id"}))
+
+
+def _getAudioRequestModel(fields: tuple[str, ...]) -> type[audiorequest_schema.AudioRequestSummarySchema]:
+    """Nivel de schema más chico (summary, detail o full) que cubre los campos proyectados."""
+
+    for model in audiorequest_schema.AUDIO_REQUEST_VIEWS.values():
+        if set(fields) <= set(model.model_fields):
+            return model
+    return audiorequest_schema.AudioRequestSchema
+
+
+def _encodeAudioRequestsCursor(key: AudioRequestKeyset) -> str:
+    createdAt, objectID = key
+    if isinstance(createdAt, datetime.datetime):
+        encodedCreatedAt = {"date": createdAt.isoformat()}
+    else:
+        encodedCreatedAt = {"value": createdAt}
+
+    payload = json.dumps({"c": encodedCreatedAt, "i": str(objectID)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decodeAudioRequestsCursor(cursor: str) -> AudioRequestKeyset:
+    """Convierte el token de continuación en la clave (createdAt, _id) de la última solicitud."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        encodedCreatedAt = payload["c"]
+        if "date" in encodedCreatedAt:
+            createdAt = datetime.datetime.fromisoformat(encodedCreatedAt["date"])
+        else:
+            createdAt = encodedCreatedAt["value"]
+        return createdAt, bson.ObjectId(payload["i"])
+    except (ValueError, TypeError, KeyError, bson.errors.InvalidId) as error:
+        raise ValueError("El cursor de paginación no es válido.") from error
+
+
+@cache_utils.cachedStampede(
     lease=2,
     ttl=CACHE_TTL_SECONDS,
 )
 async def _getAllHypnosisRequests(
     fromDate: int | None,
     toDate: int | None,
-) -> list[audiorequest_schema.AudioRequestSchema]:
+    fields: tuple[str, ...],
+    cursor: str | None,
+    pageSize: int,
+) -> audiorequest_schema.AudioRequestPageSchema:
 
-    requests = await HYPNOSIS_REPOSITORY.getAllAudioRequests(
+    after = _decodeAudioRequestsCursor(cursor) if cursor else None
+
+    items, nextKey = await HYPNOSIS_REPOSITORY.getAllAudioRequests(
         fromDate=fromDate,
         toDate=toDate,
+        fields=fields,
+        after=after,
+        pageSize=pageSize,
     )
 
-    return requests
+    model = _getAudioRequestModel(fields)
+
+    return audiorequest_schema.AudioRequestPageSchema(
+        items=[model.model_validate(item) for item in items],
+        fields=list(fields),
+        pageSize=pageSize,
+        nextCursor=_encodeAudioRequestsCursor(nextKey) if nextKey is not None else None,
+        fromDate=fromDate,
+        toDate=toDate,
+    )
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=CACHE_TTL_SECONDS,
 )
 async def _getHypnosisRequestByID(
     requestID: str,
-) -> audiorequest_schema.AudioRequestSchema | None:
+    fields: tuple[str, ...],
+) -> audiorequest_schema.AudioRequestItem | None:
 
-    request = await HYPNOSIS_REPOSITORY.getAudioRequestByID(requestID=requestID)
+    request = await HYPNOSIS_REPOSITORY.getAudioRequestByID(
+        requestID=requestID,
+        fields=fields,
+    )
+    if request is None:
+        return None
 
-    return request
+    return _getAudioRequestModel(fields).model_validate(request)
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=CACHE_TTL_SECONDS,
+    isNegativeResult=lambda requests: len(requests.items) == 0,
 )
 async def _getHypnosisRequestsByListOfIDs(
-    requestIDs: list[str],
-) -> list[audiorequest_schema.AudioRequestSchema]:
+    requestIDs: tuple[str, ...],
+    fields: tuple[str, ...],
+) -> audiorequest_schema.AudioRequestListSchema:
 
-    requests = await HYPNOSIS_REPOSITORY.getAudioRequestsByListOfIDs(requestIDs=requestIDs)
+    items = await HYPNOSIS_REPOSITORY.getAudioRequestsByListOfIDs(
+        requestIDs=list(requestIDs),
+        fields=fields,
+    )
 
-    return requests
+    model = _getAudioRequestModel(fields)
+
+    return audiorequest_schema.AudioRequestListSchema(
+        items=[model.model_validate(item) for item in items],
+        fields=list(fields),
+    )
 
 
 getAllHypnosisRequestsCount = typing.cast(
@@ -100,18 +277,34 @@ getHypnosisRequestsCountByListenedStatus = typing.cast(
     _getHypnosisRequestsCountByListenedStatus,
 )
 
-getAllHypnosisRequests = typing.cast(
+getHypnosisRequestsCountByPortal = typing.cast(
     typing.Callable[
         [int | None, int | None],
-        typing.Awaitable[list[audiorequest_schema.AudioRequestSchema]],
+        typing.Awaitable[audiorequest_schema.AudioRequestCountByPortalSchema],
+    ],
+    _getHypnosisRequestsCountByPortal,
+)
+
+getHypnosisRequestsSeries = typing.cast(
+    typing.Callable[
+        [int, int, str, str, tuple[str, ...]],
+        typing.Awaitable[audiorequest_schema.AudioRequestSeriesSchema],
+    ],
+    _getHypnosisRequestsSeries,
+)
+
+getAllHypnosisRequests = typing.cast(
+    typing.Callable[
+        [int | None, int | None, tuple[str, ...], str | None, int],
+        typing.Awaitable[audiorequest_schema.AudioRequestPageSchema],
     ],
     _getAllHypnosisRequests,
 )
 
 getHypnosisRequestByID = typing.cast(
     typing.Callable[
-        [str],
-        typing.Awaitable[audiorequest_schema.AudioRequestSchema | None],
+        [str, tuple[str, ...]],
+        typing.Awaitable[audiorequest_schema.AudioRequestItem | None],
     ],
     _getHypnosisRequestByID,
 )
@@ -119,8 +312,8 @@ getHypnosisRequestByID = typing.cast(
 
 getHypnosisRequestsByListOfIDs = typing.cast(
     typing.Callable[
-        [list[str]],
-        typing.Awaitable[list[audiorequest_schema.AudioRequestSchema]],
+        [tuple[str, ...], tuple[str, ...]],
+        typing.Awaitable[audiorequest_schema.AudioRequestListSchema],
     ],
     _getHypnosisRequestsByListOfIDs,
 )
\ No newline at end of file
@@ -1,11 +1,14 @@
 import asyncio
 import logging
+import random
+import time
 import typing
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 
 import fastapi
+import msgpack
 
-from ..schemas.pipeline_schema import LoggingSchema
+from ..schemas.pipeline_schema import LoggingSchema, PipelineEventsWindowSchema
 
 LOGGER = logging.getLogger("uvicorn").getChild("v1.hypnosis.pipeline.events")
 
@@ -15,10 +18,147 @@ _ALL_ARTIFACT_KEY = "ALL"
 _eventBuffer: dict[str, deque[LoggingSchema]] = defaultdict(
     lambda: deque(maxlen=_EVENT_BUFFER_MAX_LENGTH),
 )
-_activeConnections: dict[str, set[fastapi.WebSocket]] = defaultdict(set)
+_activeConnections: dict[str, dict[fastapi.WebSocket, "RealtimeSubscription"]] = defaultdict(dict)
 _bufferLock = asyncio.Lock()
 _connectionsLock = asyncio.Lock()
 
+# Ventanas de agregación (tumbling) expuestas por /logging/stats.
+STATS_WINDOWS: dict[str, int] = {"1s": 1, "1m": 60, "5m": 300}
+
+EventPredicate = typing.Callable[[LoggingSchema], bool]
+
+# Codificaciones de frame soportadas por el websocket de logging.
+JSON_ENCODING = "json"
+MSGPACK_ENCODING = "msgpack"
+
+
+def encodeEvent(event: LoggingSchema, encoding: str) -> str | bytes:
+    """
+    Serializa un evento una sola vez para todos los clientes con la misma codificación.
+
+    JSON produce texto equivalente a ``send_json``; msgpack produce un frame
+    binario y omite los campos nulos.
+    """
+    if encoding == MSGPACK_ENCODING:
+        payload = event.model_dump(mode="json", by_alias=True, exclude_none=True)
+        return typing.cast(bytes, msgpack.packb(payload, use_bin_type=True))
+    return event.model_dump_json(by_alias=True, round_trip=True)
+
+
+async def sendEncoded(websocket: fastapi.WebSocket, frame: str | bytes) -> None:
+    """Envía un frame ya codificado como texto o binario según su tipo."""
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
+
+
+class RealtimeSubscription:
+    """
+    Filtros y límites de envío asociados a una conexión websocket.
+
+    Los filtros se compilan una sola vez en una tupla de predicados para que
+    cada evento se evalúe sin volver a interpretar los parámetros del cliente.
+    El muestreo (sampleRate) y el tope de eventos por segundo
+    (maxEventsPerSecond) se aplican después de los filtros y antes de
+    serializar el evento con la codificación elegida (json o msgpack).
+    """
+
+    __slots__ = (
+        "predicates",
+        "sampleRate",
+        "maxEventsPerSecond",
+        "encoding",
+        "_tokens",
+        "_lastRefill",
+    )
+
+    def __init__(
+        self,
+        eventTypes: typing.Optional[typing.Iterable[str]] = None,
+        userLevel: typing.Optional[int] = None,
+        userLanguage: typing.Optional[str] = None,
+        audioRequestID: typing.Optional[str] = None,
+        sampleRate: typing.Optional[float] = None,
+        maxEventsPerSecond: typing.Optional[float] = None,
+        encoding: str = JSON_ENCODING,
+    ) -> None:
+        self.predicates: tuple[EventPredicate, ...] = _compilePredicates(
+            eventTypes=eventTypes,
+            userLevel=userLevel,
+            userLanguage=userLanguage,
+            audioRequestID=audioRequestID,
+        )
+        self.sampleRate = sampleRate
+        self.maxEventsPerSecond = maxEventsPerSecond
+        self.encoding = encoding
+        self._tokens = maxEventsPerSecond or 0.0
+        self._lastRefill = time.monotonic()
+
+    def matches(self, event: LoggingSchema) -> bool:
+        """Indica si el evento cumple todos los filtros de la suscripción."""
+        for predicate in self.predicates:
+            if not predicate(event):
+                return False
+        return True
+
+    def admit(self, event: LoggingSchema) -> bool:
+        """Aplica filtros, muestreo y tope de tasa; True si el evento debe enviarse."""
+        if not self.matches(event):
+            return False
+
+        if self.sampleRate is not None and random.random() >= self.sampleRate:
+            return False
+
+        if self.maxEventsPerSecond is not None:
+            # Token bucket: se recargan maxEventsPerSecond tokens por segundo
+            # con un máximo de un segundo de ráfaga.
+            now = time.monotonic()
+            elapsed = now - self._lastRefill
+            self._lastRefill = now
+            self._tokens = min(
+                self.maxEventsPerSecond,
+                self._tokens + elapsed * self.maxEventsPerSecond,
+            )
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+
+        return True
+
+
+def _compilePredicates(
+    eventTypes: typing.Optional[typing.Iterable[str]],
+    userLevel: typing.Optional[int],
+    userLanguage: typing.Optional[str],
+    audioRequestID: typing.Optional[str],
+) -> tuple[EventPredicate, ...]:
+    """Construye los predicados de filtrado a partir de los parámetros del cliente."""
+    predicates: list[EventPredicate] = []
+
+    if eventTypes is not None:
+        allowedTypes = frozenset(
+            eventType.strip() for eventType in eventTypes if eventType and eventType.strip()
+        )
+        if allowedTypes:
+            predicates.append(lambda event: event.eventType in allowedTypes)
+
+    if userLevel is not None:
+        predicates.append(lambda event: event.userLevel == userLevel)
+
+    if isinstance(userLanguage, str) and userLanguage.strip():
+        language = userLanguage.strip().lower()
+        predicates.append(
+            lambda event: event.userLanguage is not None
+            and event.userLanguage.lower() == language
+        )
+
+    if isinstance(audioRequestID, str) and audioRequestID.strip():
+        requestID = audioRequestID.strip()
+        predicates.append(lambda event: event.audioRequestID == requestID)
+
+    return tuple(predicates)
+
 
 def normalizeArtifact(value: typing.Optional[str]) -> str:
     """Normaliza nombres de artefacto para storage interno en buffers."""
@@ -34,22 +174,213 @@ def normalizeArtifactFilter(value: typing.Optional[str]) -> str:
     return _ALL_ARTIFACT_KEY
 
 
-async def snapshotEvents(artifact: str) -> list[LoggingSchema]:
-    """Obtiene una copia de los eventos recientes para un artefacto o para todos."""
+async def snapshotEvents(
+    artifact: str,
+    subscription: typing.Optional[RealtimeSubscription] = None,
+) -> list[LoggingSchema]:
+    """
+    Obtiene una copia de los eventos recientes para un artefacto o para todos.
+
+    Cuando se entrega una suscripción solo se incluyen los eventos que cumplen
+    sus filtros (sin aplicar muestreo ni tope de tasa).
+    """
     async with _bufferLock:
         if artifact == _ALL_ARTIFACT_KEY:
-            aggregated: list[LoggingSchema] = []
+            candidates: list[LoggingSchema] = []
             for events in _eventBuffer.values():
-                aggregated.extend(event.model_copy(deep=True) for event in events)
-            aggregated.sort(key=lambda evt: getattr(evt, "timestamp", 0))
-            return aggregated
-        return [event.model_copy(deep=True) for event in _eventBuffer.get(artifact, [])]
+                candidates.extend(events)
+        else:
+            candidates = list(_eventBuffer.get(artifact, []))
+
+        if subscription is not None:
+            candidates = [event for event in candidates if subscription.matches(event)]
+
+        snapshot = [event.model_copy(deep=True) for event in candidates]
+
+    if artifact == _ALL_ARTIFACT_KEY:
+        snapshot.sort(key=lambda evt: getattr(evt, "timestamp", 0))
+    return snapshot
+
+
+class _TumblingWindow:
+    """
+    Contadores por artefacto/eventType de una ventana de tamaño fijo.
+
+    Se alinea a múltiplos de ``seconds`` sobre el reloj de recepción del
+    servidor. Todas las mutaciones son síncronas (sin ``await``), por lo que
+    no requieren lock dentro del event loop.
+    """
+
+    __slots__ = ("label", "seconds", "start", "counts", "lastClosed")
+
+    def __init__(self, label: str, seconds: int, now: float) -> None:
+        self.label = label
+        self.seconds = seconds
+        self.start = self._alignStart(now)
+        self.counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.lastClosed: typing.Optional[PipelineEventsWindowSchema] = None
+
+    def _alignStart(self, now: float) -> int:
+        return int(now // self.seconds) * self.seconds
 
+    def roll(self, now: float) -> typing.Optional[PipelineEventsWindowSchema]:
+        """Cierra la ventana si ya expiró y devuelve su resumen."""
+        if now < self.start + self.seconds:
+            return None
+        summary = self.summarize(closed=True)
+        self.lastClosed = summary
+        self.start = self._alignStart(now)
+        self.counts = defaultdict(Counter)
+        return summary
 
-async def registerConnection(artifact: str, websocket: fastapi.WebSocket) -> None:
+    def record(self, artifact: str, eventType: str) -> None:
+        self.counts[artifact][eventType] += 1
+
+    def summarize(self, closed: bool) -> PipelineEventsWindowSchema:
+        counts = {artifact: dict(counter) for artifact, counter in self.counts.items()}
+        return PipelineEventsWindowSchema(
+            window=self.label,
+            windowSeconds=self.seconds,
+            windowStart=self.start,
+            windowEnd=self.start + self.seconds,
+            closed=closed,
+            total=sum(sum(counter.values()) for counter in self.counts.values()),
+            counts=counts,
+        )
+
+
+_statsWindows: dict[str, _TumblingWindow] = {
+    label: _TumblingWindow(label, seconds, time.time())
+    for label, seconds in STATS_WINDOWS.items()
+}
+_statsConnections: dict[str, dict[fastapi.WebSocket, str]] = defaultdict(dict)
+_statsTickerTask: typing.Optional[asyncio.Task[None]] = None
+
+
+def normalizeStatsWindow(value: typing.Optional[str]) -> typing.Optional[str]:
+    """Devuelve la etiqueta de ventana válida o None si no existe."""
+    if isinstance(value, str) and value.strip().lower() in STATS_WINDOWS:
+        return value.strip().lower()
+    return None
+
+
+def _filterWindowSummary(
+    summary: PipelineEventsWindowSchema,
+    artifact: str,
+) -> PipelineEventsWindowSchema:
+    """Restringe un resumen a un artefacto (o lo devuelve intacto para ALL)."""
+    if artifact == _ALL_ARTIFACT_KEY:
+        return summary
+    counts = summary.counts.get(artifact, {})
+    return summary.model_copy(
+        update={
+            "counts": {artifact: counts} if counts else {},
+            "total": sum(counts.values()),
+        }
+    )
+
+
+def _rollStatsWindows(now: float) -> list[PipelineEventsWindowSchema]:
+    closed: list[PipelineEventsWindowSchema] = []
+    for window in _statsWindows.values():
+        summary = window.roll(now)
+        if summary is not None:
+            closed.append(summary)
+    return closed
+
+
+def getEventStats(artifact: str = _ALL_ARTIFACT_KEY) -> list[PipelineEventsWindowSchema]:
+    """
+    Devuelve, para cada tamaño de ventana, la ventana en curso y la última cerrada.
+    """
+    _rollStatsWindows(time.time())
+    items: list[PipelineEventsWindowSchema] = []
+    for window in _statsWindows.values():
+        items.append(_filterWindowSummary(window.summarize(closed=False), artifact))
+        if window.lastClosed is not None:
+            items.append(_filterWindowSummary(window.lastClosed, artifact))
+    return items
+
+
+def lastClosedWindow(window: str, artifact: str) -> typing.Optional[PipelineEventsWindowSchema]:
+    """Último resumen cerrado para la ventana indicada, filtrado por artefacto."""
+    summary = _statsWindows[window].lastClosed
+    if summary is None:
+        return None
+    return _filterWindowSummary(summary, artifact)
+
+
+async def _publishWindowSummaries(summaries: list[PipelineEventsWindowSchema]) -> None:
+    """Envía cada resumen cerrado a los websockets suscritos a su ventana."""
+    for summary in summaries:
+        async with _connectionsLock:
+            subscribers = list(_statsConnections.get(summary.window, {}).items())
+        if not subscribers:
+            continue
+
+        payloadByArtifact: dict[str, dict[str, typing.Any]] = {}
+        disconnected: list[fastapi.WebSocket] = []
+        for socket, artifact in subscribers:
+            payload = payloadByArtifact.get(artifact)
+            if payload is None:
+                payload = _filterWindowSummary(summary, artifact).model_dump(mode="json")
+                payloadByArtifact[artifact] = payload
+            try:
+                await socket.send_json(payload)
+            except (fastapi.WebSocketDisconnect, RuntimeError):
+                disconnected.append(socket)
+            except Exception:  # pragma: no cover - diagnostic logging only
+                LOGGER.exception("[PIPELINE][STATS] Failed to send window summary")
+                disconnected.append(socket)
+
+        for socket in disconnected:
+            await removeStatsConnection(summary.window, socket)
+
+
+async def _runStatsTicker() -> None:
+    """Cierra ventanas vencidas cada segundo mientras existan suscriptores."""
+    global _statsTickerTask
+    try:
+        while _statsConnections:
+            now = time.time()
+            await asyncio.sleep(1.0 - (now % 1.0))
+            await _publishWindowSummaries(_rollStatsWindows(time.time()))
+    finally:
+        _statsTickerTask = None
+
+
+async def registerStatsConnection(
+    window: str,
+    artifact: str,
+    websocket: fastapi.WebSocket,
+) -> None:
+    """Suscribe un websocket a los resúmenes de una ventana de agregación."""
+    global _statsTickerTask
+    async with _connectionsLock:
+        _statsConnections[window][websocket] = artifact
+    if _statsTickerTask is None:
+        _statsTickerTask = asyncio.create_task(_runStatsTicker())
+
+
+async def removeStatsConnection(window: str, websocket: fastapi.WebSocket) -> None:
+    """Elimina la suscripción a resúmenes y limpia la ventana si queda vacía."""
+    async with _connectionsLock:
+        sockets = _statsConnections.get(window)
+        if sockets is None:
+            return
+        sockets.pop(websocket, None)
+        if not sockets:
+            _statsConnections.pop(window, None)
+
+
+async def registerConnection(
+    artifact: str,
+    websocket: fastapi.WebSocket,
+    subscription: typing.Optional[RealtimeSubscription] = None,
+) -> None:
     """Asocia un websocket a un artefacto para recibir eventos en vivo."""
     async with _connectionsLock:
-        _activeConnections[artifact].add(websocket)
+        _activeConnections[artifact][websocket] = subscription or RealtimeSubscription()
 
 
 async def removeConnection(artifact: str, websocket: fastapi.WebSocket) -> None:
@@ -58,54 +389,74 @@ async def removeConnection(artifact: str, websocket: fastapi.WebSocket) -> None:
         sockets = _activeConnections.get(artifact)
         if sockets is None:
             return
-        sockets.discard(websocket)
+        sockets.pop(websocket, None)
         if not sockets:
             _activeConnections.pop(artifact, None)
 
 
-async def _getConnections(artifact: str) -> list[fastapi.WebSocket]:
-    """Devuelve una lista desconectada de websockets para el artefacto dado."""
+async def _getConnections(
+    artifact: str,
+) -> list[tuple[fastapi.WebSocket, RealtimeSubscription]]:
+    """Devuelve una lista desconectada de websockets (y su suscripción) para el artefacto dado."""
     async with _connectionsLock:
-        return list(_activeConnections.get(artifact, set()))
+        return list(_activeConnections.get(artifact, {}).items())
 
 
 async def dispatchRealtimeEvent(event: LoggingSchema) -> None:
-    """Bufferiza el evento y lo transmite a todos los sockets interesados."""
+    """
+    Bufferiza el evento y lo transmite a los sockets interesados.
+
+    Los filtros de cada suscripción se evalúan antes de serializar, de modo que
+    el payload solo se construye (una vez por codificación) si al menos un
+    cliente lo recibirá.
+    """
     artifact = normalizeArtifact(event.receivedArtifact)
     eventCopy = event.model_copy(deep=True)
 
     async with _bufferLock:
         _eventBuffer[artifact].append(eventCopy)
 
-    payload = eventCopy.model_dump(mode="json", by_alias=True, round_trip=True)
+    # Las ventanas vencidas se cierran antes de contar el evento en la ventana vigente.
+    closedSummaries = _rollStatsWindows(time.time())
+    for window in _statsWindows.values():
+        window.record(artifact, eventCopy.eventType)
+    if closedSummaries:
+        await _publishWindowSummaries(closedSummaries)
 
     directConnections = await _getConnections(artifact)
     broadcastConnections = await _getConnections(_ALL_ARTIFACT_KEY)
 
-    targets: list[fastapi.WebSocket] = []
+    targets: list[tuple[str, fastapi.WebSocket, str]] = []
     seen = set()
-    for socket in directConnections + broadcastConnections:
-        if id(socket) in seen:
-            continue
-        seen.add(id(socket))
-        targets.append(socket)
+    for artifactKey, connections in (
+        (artifact, directConnections),
+        (_ALL_ARTIFACT_KEY, broadcastConnections),
+    ):
+        for socket, subscription in connections:
+            if id(socket) in seen:
+                continue
+            seen.add(id(socket))
+            if subscription.admit(eventCopy):
+                targets.append((artifactKey, socket, subscription.encoding))
 
     if not targets:
         return
 
+    frames: dict[str, str | bytes] = {}
+
     disconnected: list[tuple[str, fastapi.WebSocket]] = []
-    for socket in targets:
+    for artifactKey, socket, encoding in targets:
+        frame = frames.get(encoding)
+        if frame is None:
+            frame = encodeEvent(eventCopy, encoding)
+            frames[encoding] = frame
         try:
-            await socket.send_json(payload)
+            await sendEncoded(socket, frame)
         except (fastapi.WebSocketDisconnect, RuntimeError):
-            disconnected.append(
-                (artifact if socket in directConnections else _ALL_ARTIFACT_KEY, socket)
-            )
+            disconnected.append((artifactKey, socket))
         except Exception:  # pragma: no cover - diagnostic logging only
             LOGGER.exception("[PIPELINE][EVENTS] Failed to send realtime event")
-            disconnected.append(
-                (artifact if socket in directConnections else _ALL_ARTIFACT_KEY, socket)
-            )
+            disconnected.append((artifactKey, socket))
 
     if disconnected:
         for artifactKey, socket in disconnected:
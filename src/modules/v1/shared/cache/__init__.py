@@ -0,0 +1,6 @@
+from .backends import BoundedMemoryCache, SQLiteCache, acquireSharedLease, createCache, deleteKeys, describeKeys
+from .decorators import SharedCachedStampede, cachedStampede, getRegisteredCaches, refreshCached
+from .keys import quantizeDateRange
+from .loaders import BatchLoader
+from .serializers import PydanticJsonSerializer
+from .stats import getCacheStats
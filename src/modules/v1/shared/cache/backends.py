@@ -0,0 +1,479 @@
+import asyncio
+import collections
+import logging
+import sqlite3
+import threading
+import time
+import typing
+
+import aiocache
+import aiocache.backends.memory
+import aiocache.base
+
+from src.config import ENVIRONMENT_CONFIG
+from . import stats
+from .serializers import PydanticJsonSerializer
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.shared.cache.backends")
+
+# Sufijo de las claves de lock de estampida; se excluyen de métricas e invalidación.
+LOCK_KEY_SUFFIX = "-lock"
+
+# Cada cuántas escrituras se eliminan las entradas expiradas del archivo SQLite.
+_SQLITE_PURGE_EVERY_WRITES = 500
+
+
+class SQLiteCache(aiocache.base.BaseCache):
+    """
+    Cache respaldado por un archivo SQLite en modo WAL.
+
+    Permite que todos los workers de uvicorn de un mismo host compartan
+    resultados y locks de estampida sin depender de un servidor externo. Las
+    operaciones se ejecutan en un hilo para no bloquear el event loop.
+    """
+
+    NAME = "sqlite"
+
+    def __init__(self, path: str, serializer=None, **kwargs) -> None:
+        super().__init__(serializer=serializer or PydanticJsonSerializer(), **kwargs)
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._threadLock = threading.Lock()
+        self._writesSincePurge = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB,"
+                " expiresAt REAL"
+                ")"
+            )
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, operation: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        return await asyncio.to_thread(self._runSync, operation, *args)
+
+    def _runSync(self, operation: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        with self._threadLock:
+            return operation(self._connect(), time.time(), *args)
+
+    @staticmethod
+    def _expiresAt(now: float, ttl: float | None) -> float | None:
+        return now + ttl if ttl else None
+
+    def _afterWrite(self, connection: sqlite3.Connection, now: float) -> None:
+        self._writesSincePurge += 1
+        if self._writesSincePurge >= _SQLITE_PURGE_EVERY_WRITES:
+            self._writesSincePurge = 0
+            connection.execute(
+                "DELETE FROM cache_entries WHERE expiresAt IS NOT NULL AND expiresAt <= ?",
+                (now,),
+            )
+
+    @staticmethod
+    def _selectValue(connection: sqlite3.Connection, now: float, key: str) -> typing.Any:
+        row = connection.execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND (expiresAt IS NULL OR expiresAt > ?)",
+            (key, now),
+        ).fetchone()
+        return row[0] if row else None
+
+    async def _get(self, key, encoding="utf-8", _conn=None):
+        return await self._run(self._selectValue, key)
+
+    async def _gets(self, key, encoding="utf-8", _conn=None):
+        return await self._get(key, encoding=encoding, _conn=_conn)
+
+    async def _multi_get(self, keys, encoding="utf-8", _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> list[typing.Any]:
+            return [self._selectValue(connection, now, key) for key in keys]
+
+        return await self._run(operation)
+
+    async def _set(self, key, value, ttl=None, _cas_token=None, _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> typing.Any:
+            if _cas_token is not None and self._selectValue(connection, now, key) != _cas_token:
+                return 0
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expiresAt) VALUES (?, ?, ?)",
+                (key, value, self._expiresAt(now, ttl)),
+            )
+            self._afterWrite(connection, now)
+            return True
+
+        return await self._run(operation)
+
+    async def _multi_set(self, pairs, ttl=None, _conn=None):
+        for key, value in pairs:
+            await self._set(key, value, ttl=ttl)
+        return True
+
+    async def _add(self, key, value, ttl=None, _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> int:
+            # BEGIN IMMEDIATE serializa el add entre procesos (usado por los locks de estampida).
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE key = ? AND expiresAt IS NOT NULL AND expiresAt <= ?",
+                    (key, now),
+                )
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO cache_entries (key, value, expiresAt) VALUES (?, ?, ?)",
+                    (key, value, self._expiresAt(now, ttl)),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            return cursor.rowcount
+
+        inserted = await self._run(operation)
+        if not inserted:
+            raise ValueError("Key {} already exists, use .set to update the value".format(key))
+        return True
+
+    async def _exists(self, key, _conn=None):
+        return await self._run(self._selectValue, key) is not None
+
+    async def _increment(self, key, delta, _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> int:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                current = self._selectValue(connection, now, key)
+                try:
+                    newValue = int(current or 0) + delta
+                except ValueError:
+                    raise TypeError("Value is not an integer") from None
+                connection.execute(
+                    "INSERT INTO cache_entries (key, value, expiresAt) VALUES (?, ?, NULL)"
+                    " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (key, newValue),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            return newValue
+
+        return await self._run(operation)
+
+    async def _expire(self, key, ttl, _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> bool:
+            cursor = connection.execute(
+                "UPDATE cache_entries SET expiresAt = ? WHERE key = ? AND (expiresAt IS NULL OR expiresAt > ?)",
+                (self._expiresAt(now, ttl), key, now),
+            )
+            return cursor.rowcount > 0
+
+        return await self._run(operation)
+
+    async def _delete(self, key, _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> int:
+            return connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount
+
+        return await self._run(operation)
+
+    async def _clear(self, namespace=None, _conn=None):
+        def operation(connection: sqlite3.Connection, now: float) -> bool:
+            if namespace:
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?",
+                    (len(namespace), namespace),
+                )
+            else:
+                connection.execute("DELETE FROM cache_entries")
+            return True
+
+        return await self._run(operation)
+
+    async def _redlock_release(self, key, value):
+        def operation(connection: sqlite3.Connection, now: float) -> int:
+            return connection.execute(
+                "DELETE FROM cache_entries WHERE key = ? AND value = ?",
+                (key, value),
+            ).rowcount
+
+        return await self._run(operation)
+
+    async def _describePrefix(self, prefix: str) -> tuple[int, int]:
+        def operation(connection: sqlite3.Connection, now: float) -> tuple[int, int]:
+            count, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries"
+                " WHERE substr(key, 1, ?) = ? AND key NOT LIKE ? AND (expiresAt IS NULL OR expiresAt > ?)",
+                (len(prefix), prefix, f"%{LOCK_KEY_SUFFIX}", now),
+            ).fetchone()
+            return count, size
+
+        return await self._run(operation)
+
+    async def _deletePrefix(self, prefix: str) -> int:
+        def operation(connection: sqlite3.Connection, now: float) -> int:
+            return connection.execute(
+                "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ? AND key NOT LIKE ?",
+                (len(prefix), prefix, f"%{LOCK_KEY_SUFFIX}"),
+            ).rowcount
+
+        return await self._run(operation)
+
+    async def _close(self, *args, _conn=None, **kwargs):
+        def operation(connection: sqlite3.Connection, now: float) -> None:
+            connection.close()
+            self._connection = None
+
+        if self._connection is not None:
+            await self._run(operation)
+
+
+class BoundedMemoryCache(aiocache.SimpleMemoryCache):
+    """
+    Cache en memoria con límite de entradas y de bytes aproximados (LRU).
+
+    SimpleMemoryCache solo libera entradas al vencer su ttl, por lo que consultas
+    variadas (listas de IDs, distribuciones completas) hacían crecer la memoria
+    del worker sin límite. Al superar maxEntries o maxBytes se descartan las
+    entradas usadas hace más tiempo.
+    """
+
+    NAME = "bounded-memory"
+
+    def __init__(
+        self,
+        maxEntries: int,
+        maxBytes: int,
+        statsName: str | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.statsName = statsName
+        self.totalBytes = 0
+        self._entrySizes: collections.OrderedDict[str, int] = collections.OrderedDict()
+
+    def _touch(self, key: str) -> None:
+        if key in self._entrySizes:
+            self._entrySizes.move_to_end(key)
+
+    def _forget(self, key: str) -> None:
+        size = self._entrySizes.pop(key, None)
+        if size is not None:
+            self.totalBytes -= size
+
+    def _evict(self) -> None:
+        while self._entrySizes and (
+            len(self._entrySizes) > self.maxEntries or self.totalBytes > self.maxBytes
+        ):
+            oldestKey = next(iter(self._entrySizes))
+            self._SimpleMemoryBackend__delete(oldestKey)
+            if self.statsName is not None:
+                stats.recordEviction(self.statsName)
+
+    def getEntrySize(self, key: str) -> int:
+        return self._entrySizes.get(key, 0)
+
+    async def _get(self, key, encoding="utf-8", _conn=None):
+        self._touch(key)
+        return await super()._get(key, encoding=encoding, _conn=_conn)
+
+    async def _multi_get(self, keys, encoding="utf-8", _conn=None):
+        for key in keys:
+            self._touch(key)
+        return await super()._multi_get(keys, encoding=encoding, _conn=_conn)
+
+    async def _set(self, key, value, ttl=None, _cas_token=None, _conn=None):
+        result = await super()._set(key, value, ttl=ttl, _cas_token=_cas_token, _conn=_conn)
+        # Los locks de estampida no se contabilizan para que nunca sean expulsados.
+        if result and not key.endswith(LOCK_KEY_SUFFIX):
+            self._forget(key)
+            size = _estimateSize(value)
+            if size > self.maxBytes:
+                # Un valor que por sí solo supera el límite no desplaza al resto.
+                self._SimpleMemoryBackend__delete(key)
+                if self.statsName is not None:
+                    stats.recordEviction(self.statsName)
+                return result
+            self._entrySizes[key] = size
+            self.totalBytes += size
+            self._evict()
+        return result
+
+    async def _clear(self, namespace=None, _conn=None):
+        result = await super()._clear(namespace=namespace, _conn=_conn)
+        if not namespace:
+            self._entrySizes.clear()
+            self.totalBytes = 0
+        return result
+
+    def _SimpleMemoryBackend__delete(self, key):
+        # Todas las bajas de SimpleMemoryBackend (delete, ttl vencido, liberar lock)
+        # pasan por este método privado; se sobrescribe para mantener la contabilidad.
+        self._forget(key)
+        return aiocache.backends.memory.SimpleMemoryBackend._SimpleMemoryBackend__delete(self, key)
+
+
+_sharedCache: aiocache.base.BaseCache | None = None
+
+
+def _buildSharedCache() -> aiocache.base.BaseCache:
+    cacheConfig = ENVIRONMENT_CONFIG.CACHE_CONFIG
+
+    if cacheConfig.CACHE_BACKEND == "redis":
+        # Un SQLite local no reemplaza a Redis entre hosts, por lo que sin cliente se
+        # falla al iniciar en lugar de perder el cache compartido en silencio.
+        if aiocache.Cache.REDIS is None:
+            raise RuntimeError("CACHE_BACKEND=redis requiere el paquete redis instalado.")
+        cache = aiocache.Cache.from_url(cacheConfig.CACHE_REDIS_URL)
+        cache.serializer = PydanticJsonSerializer()
+        cache.namespace = cacheConfig.CACHE_NAMESPACE
+        return cache
+
+    return SQLiteCache(
+        path=cacheConfig.CACHE_SQLITE_PATH,
+        namespace=cacheConfig.CACHE_NAMESPACE,
+    )
+
+
+def createCache(
+    maxEntries: int | None = None,
+    maxBytes: int | None = None,
+    statsName: str | None = None,
+) -> aiocache.base.BaseCache:
+    """
+    Devuelve el cache a usar por una función decorada según CACHE_BACKEND.
+
+    En memoria cada función recibe su propia instancia acotada por maxEntries y
+    maxBytes (o los valores por defecto de CacheConfig); los backends
+    compartidos usan una única instancia por proceso y delegan la expulsión en
+    el propio backend, por lo que ignoran esos límites.
+    """
+    global _sharedCache
+
+    cacheConfig = ENVIRONMENT_CONFIG.CACHE_CONFIG
+
+    if cacheConfig.CACHE_BACKEND == "memory":
+        return BoundedMemoryCache(
+            maxEntries=maxEntries or cacheConfig.CACHE_MEMORY_MAX_ENTRIES,
+            maxBytes=maxBytes or cacheConfig.CACHE_MEMORY_MAX_BYTES,
+            statsName=statsName,
+        )
+
+    if _sharedCache is None:
+        _sharedCache = _buildSharedCache()
+    return _sharedCache
+
+
+async def acquireSharedLease(name: str, ttl: float) -> bool:
+    """
+    Intenta tomar un lease con nombre en el backend compartido por ttl segundos.
+
+    Con el backend en memoria cada worker tiene su propio cache, por lo que el
+    lease siempre se concede; en los backends compartidos solo un worker lo
+    obtiene hasta que vence.
+    """
+
+    if ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_BACKEND == "memory":
+        return True
+
+    cache = createCache()
+    try:
+        await cache._add(cache.build_key(f"{name}-lease"), "1", ttl=ttl)
+    except ValueError:
+        return False
+    return True
+
+
+def _escapeRedisGlob(value: str) -> str:
+    return "".join(f"\\{char}" if char in "[]*?\\" else char for char in value)
+
+
+_SIZE_SERIALIZER = PydanticJsonSerializer()
+
+
+def _estimateSize(value: typing.Any) -> int:
+    try:
+        return len(_SIZE_SERIALIZER.dumps(value))
+    except Exception:
+        return 0
+
+
+async def _scanRedisKeys(cache: aiocache.base.BaseCache, rawPrefix: str) -> list[bytes]:
+    keys: list[bytes] = []
+    async for key in cache.client.scan_iter(match=f"{_escapeRedisGlob(rawPrefix)}*", count=500):
+        if not key.endswith(LOCK_KEY_SUFFIX.encode()):
+            keys.append(key)
+    return keys
+
+
+async def describeKeys(cache: aiocache.base.BaseCache, prefix: str) -> tuple[int, int]:
+    """
+    Cuenta las entradas vigentes cuyo nombre comienza con prefix y estima su tamaño.
+
+    Returns:
+        tuple[int, int]: (entradas, bytes aproximados). En memoria el tamaño es
+        el del valor serializado a JSON; en SQLite y Redis, el almacenado.
+    """
+
+    rawPrefix = cache.build_key(prefix)
+
+    if isinstance(cache, SQLiteCache):
+        return await cache._describePrefix(rawPrefix)
+
+    if isinstance(cache, BoundedMemoryCache):
+        keys = [
+            key
+            for key in list(cache._cache.keys())
+            if key.startswith(rawPrefix) and not key.endswith(LOCK_KEY_SUFFIX)
+        ]
+        return len(keys), sum(cache.getEntrySize(key) for key in keys)
+
+    if isinstance(cache, aiocache.SimpleMemoryCache):
+        entries = [
+            value
+            for key, value in list(cache._cache.items())
+            if key.startswith(rawPrefix) and not key.endswith(LOCK_KEY_SUFFIX)
+        ]
+        return len(entries), sum(_estimateSize(value) for value in entries)
+
+    keys = await _scanRedisKeys(cache, rawPrefix)
+    if not keys:
+        return 0, 0
+    async with cache.client.pipeline(transaction=False) as pipeline:
+        for key in keys:
+            pipeline.strlen(key)
+        sizes = await pipeline.execute()
+    return len(keys), sum(sizes)
+
+
+async def deleteKeys(cache: aiocache.base.BaseCache, prefix: str) -> int:
+    """Elimina las entradas cuyo nombre comienza con prefix (sin tocar los locks)."""
+
+    rawPrefix = cache.build_key(prefix)
+
+    if isinstance(cache, SQLiteCache):
+        return await cache._deletePrefix(rawPrefix)
+
+    if isinstance(cache, aiocache.SimpleMemoryCache):
+        keys = [
+            key
+            for key in list(cache._cache.keys())
+            if key.startswith(rawPrefix) and not key.endswith(LOCK_KEY_SUFFIX)
+        ]
+        for key in keys:
+            await cache._delete(key)
+        return len(keys)
+
+    keys = await _scanRedisKeys(cache, rawPrefix)
+    if not keys:
+        return 0
+    return await cache.client.delete(*keys)
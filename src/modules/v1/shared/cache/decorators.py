@@ -0,0 +1,333 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+import typing
+import uuid
+
+import aiocache
+
+from src.config import ENVIRONMENT_CONFIG
+from . import stats
+from .backends import LOCK_KEY_SUFFIX, createCache, deleteKeys, describeKeys
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.shared.cache.decorators")
+
+if typing.TYPE_CHECKING:
+    from .loaders import BatchLoader
+
+# Funciones decoradas y loaders por nombre completo, para métricas e invalidación.
+_REGISTRY: dict[str, "SharedCachedStampede | BatchLoader"] = {}
+
+# Claves del sobre guardado cuando stale-while-revalidate está activo.
+_VALUE_FIELD = "value"
+_FRESH_UNTIL_FIELD = "freshUntil"
+
+
+class SharedCachedStampede(aiocache.cached_stampede):
+    """
+    Variante de aiocache.cached_stampede que funciona entre workers.
+
+    El RedLock de aiocache solo espera eventos asyncio del propio proceso, por
+    lo que con varios workers cada uno recalculaba el valor en paralelo. Aquí
+    el lock vive en el backend compartido y quien no lo obtiene consulta el
+    cache periódicamente hasta que el dueño publique el resultado o venza el
+    lease.
+
+    Con maxStaleSeconds se activa stale-while-revalidate: vencido el ttl el
+    valor se sigue entregando hasta maxStaleSeconds más, mientras una única
+    tarea en segundo plano lo recalcula.
+    """
+
+    # Eventos locales para que las corrutinas del mismo proceso no hagan polling.
+    _localEvents: dict[str, asyncio.Event] = {}
+
+    # Referencias a las revalidaciones en curso para que no sean recolectadas.
+    _refreshTasks: set[asyncio.Task] = set()
+
+    def __init__(
+        self,
+        maxStaleSeconds: int | None = None,
+        isNegativeResult: typing.Callable[[typing.Any], bool] | None = None,
+        negativeTtl: float | None = None,
+        maxEntries: int | None = None,
+        maxBytes: int | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        if maxStaleSeconds and not isinstance(self.ttl, (int, float)):
+            raise ValueError("maxStaleSeconds requiere un ttl numérico.")
+        self.maxStaleSeconds = maxStaleSeconds
+        self.isNegativeResult = isNegativeResult
+        self.negativeTtl = negativeTtl
+
+    def __call__(self, f):
+        wrapper = super().__call__(f)
+        self.statsName = f"{f.__module__}.{f.__qualname__}"
+        self.cache = createCache(
+            maxEntries=self.maxEntries,
+            maxBytes=self.maxBytes,
+            statsName=self.statsName,
+        )
+        self.functionName = f.__name__
+        self.keyPrefix = f"{f.__module__ or ''}{f.__name__}["
+        self.signature = inspect.signature(f)
+        wrapper.cache = self.cache
+        wrapper.refresh = functools.partial(self.refresh, f)
+        registerCache(self.statsName, self)
+        return wrapper
+
+    def _key_from_args(self, func, args, kwargs):
+        # Los argumentos se normalizan contra la firma para que una llamada posicional
+        # y otra con nombres compartan la misma clave.
+        try:
+            bound = self.signature.bind(*args, **kwargs)
+        except TypeError:
+            return super()._key_from_args(func, args, kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        if self.noself and arguments:
+            arguments.pop(next(iter(arguments)))
+        return (func.__module__ or "") + func.__name__ + str(sorted(arguments.items()))
+
+    async def describeEntries(self) -> tuple[int, int]:
+        """Entradas vigentes de esta función y su tamaño aproximado en bytes."""
+
+        return await describeKeys(self.cache, self.keyPrefix)
+
+    async def invalidate(self) -> int:
+        """Elimina todas las entradas de esta función y devuelve cuántas se borraron."""
+
+        return await deleteKeys(self.cache, self.keyPrefix)
+
+    async def _compute(self, f, args, kwargs) -> typing.Any:
+        startedAt = time.perf_counter()
+        try:
+            return await f(*args, **kwargs)
+        finally:
+            stats.recordCompute(self.statsName, time.perf_counter() - startedAt)
+
+    async def _readEntry(self, key: str) -> tuple[typing.Any, bool]:
+        """Devuelve (valor, esFresco); el valor es None si no hay entrada."""
+
+        entry = await self.get_from_cache(key)
+        if entry is None or not self.maxStaleSeconds:
+            return entry, True
+
+        try:
+            return entry[_VALUE_FIELD], time.time() < entry[_FRESH_UNTIL_FIELD]
+        except (KeyError, TypeError):
+            # Entrada escrita sin sobre (p. ej. antes de activar el modo): se descarta.
+            return None, True
+
+    def _resolveTtl(self, value: typing.Any) -> typing.Any:
+        """
+        Los resultados vacíos (isNegativeResult) se guardan con un ttl más corto
+        para no repetir el escaneo completo sin ocultar por mucho tiempo datos nuevos.
+        """
+
+        if self.isNegativeResult is None or not self.isNegativeResult(value):
+            return self.ttl
+
+        negativeTtl = self.negativeTtl or ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_NEGATIVE_TTL_SECONDS
+        if isinstance(self.ttl, (int, float)):
+            return min(self.ttl, negativeTtl)
+        return negativeTtl
+
+    async def set_in_cache(self, key, value):
+        ttl = self._resolveTtl(value)
+
+        if not self.maxStaleSeconds:
+            try:
+                await self.cache.set(key, value, ttl=ttl)
+            except Exception:
+                LOGGER.exception("No se pudo guardar la clave %s", key)
+            return
+
+        entry = {_VALUE_FIELD: value, _FRESH_UNTIL_FIELD: time.time() + ttl}
+        try:
+            await self.cache.set(key, entry, ttl=ttl + self.maxStaleSeconds)
+        except Exception:
+            LOGGER.exception("No se pudo guardar la clave %s", key)
+
+    async def _acquireLease(self, lockKey: str, token: str, lease: float | None = None) -> bool:
+        try:
+            await self.cache._add(lockKey, token, ttl=lease or self.lease)
+        except ValueError:
+            return False
+        except Exception:
+            # Si el backend falla se calcula igualmente, como si no hubiera cache.
+            LOGGER.exception("No se pudo tomar el lock %s", lockKey)
+        return True
+
+    async def _releaseLease(self, lockKey: str, token: str) -> None:
+        try:
+            await self.cache._redlock_release(lockKey, token)
+        except Exception:
+            LOGGER.exception("No se pudo liberar el lock %s", lockKey)
+
+    async def _waitForValue(self, key: str, lockKey: str) -> typing.Any:
+        localEvent = self._localEvents.get(lockKey)
+        if localEvent is not None:
+            try:
+                await asyncio.wait_for(localEvent.wait(), timeout=self.lease)
+            except asyncio.TimeoutError:
+                pass
+            value, _ = await self._readEntry(key)
+            return value
+
+        pollInterval = ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_LOCK_POLL_INTERVAL_SECONDS
+        deadline = time.monotonic() + self.lease
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(pollInterval)
+            value, _ = await self._readEntry(key)
+            if value is not None:
+                return value
+            try:
+                if not await self.cache._exists(lockKey):
+                    break
+            except Exception:
+                break
+
+        value, _ = await self._readEntry(key)
+        return value
+
+    async def _revalidate(self, f, key: str, lockKey: str, token: str, args, kwargs) -> None:
+        try:
+            result = await self._compute(f, args, kwargs)
+            if not self.skip_cache_func(result):
+                await self.set_in_cache(key, result)
+        except Exception:
+            # El valor anterior se sigue sirviendo hasta agotar maxStaleSeconds.
+            LOGGER.exception("Falló la revalidación en segundo plano de %s", self.statsName)
+        finally:
+            await self._releaseLease(lockKey, token)
+
+    async def _scheduleRevalidation(self, f, key: str, args, kwargs) -> None:
+        lockKey = self.cache.build_key(f"{key}{LOCK_KEY_SUFFIX}")
+        token = uuid.uuid4().hex
+
+        # El mismo lock de estampida garantiza una sola revalidación entre workers; se
+        # libera al terminar y el lease solo acota el caso de un worker caído.
+        revalidationLease = ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_REVALIDATION_LEASE_SECONDS
+        if not await self._acquireLease(lockKey, token, lease=revalidationLease):
+            return
+
+        task = asyncio.create_task(self._revalidate(f, key, lockKey, token, args, kwargs))
+        self._refreshTasks.add(task)
+        task.add_done_callback(self._refreshTasks.discard)
+
+    async def refresh(self, f, *args, **kwargs) -> typing.Any:
+        """
+        Recalcula y guarda el valor aunque siga vigente (usado por el precalentado).
+
+        Si otro worker ya está calculando la misma clave no hace nada y devuelve None.
+        """
+
+        key = self.get_cache_key(f, args, kwargs)
+        lockKey = self.cache.build_key(f"{key}{LOCK_KEY_SUFFIX}")
+        token = uuid.uuid4().hex
+
+        revalidationLease = ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_REVALIDATION_LEASE_SECONDS
+        if not await self._acquireLease(lockKey, token, lease=revalidationLease):
+            return None
+
+        try:
+            result = await self._compute(f, args, kwargs)
+            if not self.skip_cache_func(result):
+                await self.set_in_cache(key, result)
+            return result
+        finally:
+            await self._releaseLease(lockKey, token)
+
+    async def decorator(self, f, *args, **kwargs):
+        key = self.get_cache_key(f, args, kwargs)
+
+        value, isFresh = await self._readEntry(key)
+        if value is not None:
+            if isFresh:
+                stats.recordHit(self.statsName)
+            else:
+                stats.recordStaleHit(self.statsName)
+                await self._scheduleRevalidation(f, key, args, kwargs)
+            return value
+
+        if not self.lease:
+            stats.recordMiss(self.statsName)
+            result = await self._compute(f, args, kwargs)
+            if not self.skip_cache_func(result):
+                await self.set_in_cache(key, result)
+            return result
+
+        lockKey = self.cache.build_key(f"{key}{LOCK_KEY_SUFFIX}")
+        token = uuid.uuid4().hex
+
+        if not await self._acquireLease(lockKey, token):
+            stats.recordStampedeWait(self.statsName)
+            value = await self._waitForValue(key, lockKey)
+            if value is not None:
+                stats.recordHit(self.statsName)
+                return value
+            # El dueño del lock falló o no guardó el resultado: se calcula aquí.
+            stats.recordMiss(self.statsName)
+            return await self._compute(f, args, kwargs)
+
+        localEvent = asyncio.Event()
+        self._localEvents[lockKey] = localEvent
+
+        try:
+            value, _ = await self._readEntry(key)
+            if value is not None:
+                stats.recordHit(self.statsName)
+                return value
+
+            stats.recordMiss(self.statsName)
+            result = await self._compute(f, args, kwargs)
+
+            if not self.skip_cache_func(result):
+                await self.set_in_cache(key, result)
+
+            return result
+        finally:
+            localEvent.set()
+            self._localEvents.pop(lockKey, None)
+            await self._releaseLease(lockKey, token)
+
+
+def cachedStampede(**kwargs: typing.Any) -> SharedCachedStampede:
+    """
+    Decorador de cache con protección de estampida sobre el backend configurado.
+
+    Acepta los mismos argumentos que aiocache.cached_stampede más
+    maxStaleSeconds (stale-while-revalidate), isNegativeResult/negativeTtl
+    (resultados vacíos con ttl corto) y maxEntries/maxBytes (límite LRU del
+    cache en memoria); el backend se elige con CACHE_BACKEND (memory, sqlite o
+    redis).
+    """
+
+    return SharedCachedStampede(**kwargs)
+
+
+async def refreshCached(function: typing.Callable[..., typing.Awaitable[typing.Any]], *args, **kwargs) -> typing.Any:
+    """Fuerza el recálculo de una función decorada con cachedStampede."""
+
+    refresh = getattr(function, "refresh", None)
+    if refresh is None:
+        return await function(*args, **kwargs)
+    return await refresh(*args, **kwargs)
+
+
+def registerCache(name: str, cache: "SharedCachedStampede | BatchLoader") -> None:
+    """Registra un cache con nombre para exponerlo en métricas e invalidación."""
+
+    _REGISTRY[name] = cache
+
+
+def getRegisteredCaches() -> dict[str, "SharedCachedStampede | BatchLoader"]:
+    """Devuelve las funciones decoradas con cachedStampede y los BatchLoader por nombre completo."""
+
+    return dict(_REGISTRY)
@@ -0,0 +1,53 @@
+import math
+
+from src.config import ENVIRONMENT_CONFIG
+
+MINUTE_SECONDS = 60
+HOUR_SECONDS = 3_600
+DAY_SECONDS = 86_400
+
+
+def _resolveStep(rangeSeconds: int) -> int:
+    cacheConfig = ENVIRONMENT_CONFIG.CACHE_CONFIG
+
+    if rangeSeconds <= cacheConfig.CACHE_RANGE_MINUTE_MAX_SECONDS:
+        return MINUTE_SECONDS
+    if rangeSeconds <= cacheConfig.CACHE_RANGE_HOUR_MAX_SECONDS:
+        return HOUR_SECONDS
+    return DAY_SECONDS
+
+
+def quantizeDateRange(
+    fromDate: int | None,
+    toDate: int | None,
+) -> tuple[int | None, int | None]:
+    """
+    Ajusta un rango de timestamps a bordes de minuto, hora o día (UTC).
+
+    Los dashboards envían rangos relativos a "ahora" que cambian unos segundos
+    en cada llamada, por lo que la clave de cache casi nunca coincidía. El paso
+    depende del largo del rango: fromDate se lleva al inicio de su paso y toDate
+    al último segundo del suyo (los filtros son inclusivos), de modo que el
+    rango ajustado siempre contiene al original.
+
+    Los controladores lo aplican antes de llamar al servicio y devuelven el
+    rango ajustado en la respuesta, para que el cliente sepa qué intervalo se
+    contó realmente.
+
+    Returns:
+        tuple[int | None, int | None]: El rango ajustado, o el original si falta
+        alguna fecha o la cuantización está deshabilitada.
+    """
+
+    if fromDate is None or toDate is None:
+        return fromDate, toDate
+
+    if not ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_RANGE_QUANTIZATION_ENABLED:
+        return fromDate, toDate
+
+    step = _resolveStep(toDate - fromDate)
+
+    quantizedFromDate = (fromDate // step) * step
+    quantizedToDate = math.ceil((toDate + 1) / step) * step - 1
+
+    return quantizedFromDate, quantizedToDate
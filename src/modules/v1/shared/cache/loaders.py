@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+import typing
+
+from src.config import ENVIRONMENT_CONFIG
+from . import stats
+from .backends import createCache, deleteKeys, describeKeys
+from .decorators import registerCache
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.shared.cache.loaders")
+
+# Valor guardado para las claves que no existen (ttl negativo).
+_MISSING_MARKER = {"__missing__": True}
+
+ValueT = typing.TypeVar("ValueT")
+
+
+class BatchLoader(typing.Generic[ValueT]):
+    """
+    Carga por lotes con cache por clave, al estilo DataLoader.
+
+    Cada clave se cachea por separado, por lo que dos listas que se solapan
+    comparten sus entradas. Las claves que faltan en el cache y se piden en la
+    misma vuelta del event loop (incluso desde solicitudes distintas) se
+    agrupan en una única llamada a batchFunction; una clave que ya se está
+    cargando no se vuelve a pedir.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batchFunction: typing.Callable[[list[str]], typing.Awaitable[dict[str, ValueT]]],
+        ttl: float,
+        negativeTtl: float | None = None,
+        maxEntries: int | None = None,
+        maxBytes: int | None = None,
+    ) -> None:
+        self.statsName = name
+        self.functionName = name.rsplit(".", 1)[-1]
+        self.keyPrefix = f"{name}["
+        self.batchFunction = batchFunction
+        self.ttl = ttl
+        self.negativeTtl = negativeTtl
+        self.cache = createCache(
+            maxEntries=maxEntries,
+            maxBytes=maxBytes,
+            statsName=name,
+        )
+
+        self._pending: dict[str, asyncio.Future] = {}
+        self._queue: list[str] = []
+        self._dispatchScheduled = False
+        self._dispatchTasks: set[asyncio.Task] = set()
+
+        registerCache(name, self)
+
+    def _buildKey(self, key: str) -> str:
+        return f"{self.keyPrefix}{key}]"
+
+    async def describeEntries(self) -> tuple[int, int]:
+        """Entradas vigentes del loader y su tamaño aproximado en bytes."""
+
+        return await describeKeys(self.cache, self.keyPrefix)
+
+    async def invalidate(self) -> int:
+        """Elimina todas las entradas del loader y devuelve cuántas se borraron."""
+
+        return await deleteKeys(self.cache, self.keyPrefix)
+
+    async def load(self, key: str) -> ValueT | None:
+        """Devuelve el valor de una clave, o None si no existe."""
+
+        return (await self.loadMany([key]))[key]
+
+    async def loadMany(self, keys: typing.Iterable[str]) -> dict[str, ValueT | None]:
+        """
+        Devuelve los valores de las claves pedidas (None para las inexistentes),
+        sirviendo desde el cache las disponibles y cargando el resto en lote.
+        """
+
+        uniqueKeys = list(dict.fromkeys(keys))
+        if not uniqueKeys:
+            return {}
+
+        try:
+            cached = await self.cache.multi_get([self._buildKey(key) for key in uniqueKeys])
+        except Exception:
+            LOGGER.exception("No se pudieron leer las claves de %s", self.statsName)
+            cached = [None] * len(uniqueKeys)
+
+        results: dict[str, ValueT | None] = {}
+        missingKeys: list[str] = []
+        for key, value in zip(uniqueKeys, cached):
+            if value is None:
+                missingKeys.append(key)
+            else:
+                results[key] = None if value == _MISSING_MARKER else value
+
+        stats.recordHit(self.statsName, len(results))
+
+        if missingKeys:
+            stats.recordMiss(self.statsName, len(missingKeys))
+            futures = [self._enqueue(key) for key in missingKeys]
+            # shield: cancelar a un solicitante no cancela la carga compartida con otros.
+            values = await asyncio.gather(*(asyncio.shield(future) for future in futures))
+            results.update(zip(missingKeys, values))
+
+        return {key: results[key] for key in uniqueKeys}
+
+    def _enqueue(self, key: str) -> asyncio.Future:
+        future = self._pending.get(key)
+        if future is not None:
+            stats.recordStampedeWait(self.statsName)
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        self._queue.append(key)
+
+        if not self._dispatchScheduled:
+            self._dispatchScheduled = True
+            loop.call_soon(self._startDispatch)
+
+        return future
+
+    def _startDispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        self._dispatchScheduled = False
+
+        task = asyncio.get_running_loop().create_task(self._dispatch(keys))
+        self._dispatchTasks.add(task)
+        task.add_done_callback(self._dispatchTasks.discard)
+
+    async def _dispatch(self, keys: list[str]) -> None:
+        futures = {key: self._pending[key] for key in keys}
+
+        try:
+            startedAt = time.perf_counter()
+            try:
+                loaded = await self.batchFunction(keys)
+            finally:
+                stats.recordCompute(self.statsName, time.perf_counter() - startedAt)
+        except Exception as error:
+            for key, future in futures.items():
+                if not future.done():
+                    future.set_exception(error)
+                self._pending.pop(key, None)
+            return
+
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(loaded.get(key))
+
+        # Las claves siguen pendientes hasta quedar en cache para no pedirlas dos veces.
+        try:
+            await self._store(keys, loaded)
+        finally:
+            for key in keys:
+                self._pending.pop(key, None)
+
+    async def _store(self, keys: list[str], loaded: dict[str, ValueT]) -> None:
+        found = [(self._buildKey(key), loaded[key]) for key in keys if loaded.get(key) is not None]
+        missing = [(self._buildKey(key), _MISSING_MARKER) for key in keys if loaded.get(key) is None]
+
+        negativeTtl = self.negativeTtl or ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_NEGATIVE_TTL_SECONDS
+
+        try:
+            if found:
+                await self.cache.multi_set(found, ttl=self.ttl)
+            if missing:
+                await self.cache.multi_set(missing, ttl=min(self.ttl, negativeTtl))
+        except Exception:
+            LOGGER.exception("No se pudieron guardar las claves de %s", self.statsName)
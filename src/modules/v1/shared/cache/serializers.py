@@ -0,0 +1,71 @@
+import importlib
+import json
+import typing
+
+import aiocache.serializers
+import pydantic
+
+# Solo se reconstruyen modelos definidos dentro del proyecto.
+_ALLOWED_MODULE_PREFIX = "src."
+
+_MODEL_TAG = "__pydantic__"
+_DATA_TAG = "data"
+
+
+def _resolveModel(path: str) -> type[pydantic.BaseModel]:
+    moduleName, _, qualifiedName = path.partition(":")
+    if not moduleName.startswith(_ALLOWED_MODULE_PREFIX) or not qualifiedName:
+        raise ValueError(f"Modelo no permitido en cache: {path}")
+
+    target: typing.Any = importlib.import_module(moduleName)
+    for attribute in qualifiedName.split("."):
+        target = getattr(target, attribute)
+
+    if not isinstance(target, type) or not issubclass(target, pydantic.BaseModel):
+        raise ValueError(f"{path} no es un modelo pydantic")
+    return target
+
+
+def _encodeValue(value: typing.Any) -> typing.Any:
+    if isinstance(value, pydantic.BaseModel):
+        modelClass = type(value)
+        return {
+            _MODEL_TAG: f"{modelClass.__module__}:{modelClass.__qualname__}",
+            _DATA_TAG: value.model_dump(mode="json", by_alias=True),
+        }
+    if isinstance(value, (list, tuple)):
+        return [_encodeValue(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encodeValue(item) for key, item in value.items()}
+    return value
+
+
+def _decodeValue(value: typing.Any) -> typing.Any:
+    if isinstance(value, list):
+        return [_decodeValue(item) for item in value]
+    if isinstance(value, dict):
+        if _MODEL_TAG in value:
+            return _resolveModel(value[_MODEL_TAG]).model_validate(value[_DATA_TAG])
+        return {key: _decodeValue(item) for key, item in value.items()}
+    return value
+
+
+class PydanticJsonSerializer(aiocache.serializers.BaseSerializer):
+    """
+    Serializador JSON que conserva los schemas pydantic de los servicios.
+
+    Cada modelo se guarda junto a su ruta de importación y se reconstruye con
+    model_validate al leerlo, por lo que los backends compartidos (SQLite o
+    Redis) devuelven los mismos tipos que el cache en memoria. A diferencia de
+    pickle, solo se instancian modelos del propio proyecto.
+    """
+
+    def dumps(self, value: typing.Any) -> str:
+        return json.dumps(_encodeValue(value), separators=(",", ":"))
+
+    def loads(self, value: str | bytes | None) -> typing.Any:
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode(self.encoding or "utf-8")
+        return _decodeValue(json.loads(value))
@@ -0,0 +1,91 @@
+import collections
+import threading
+
+
+class CacheCounters:
+    __slots__ = (
+        "hits",
+        "staleHits",
+        "misses",
+        "stampedeWaits",
+        "evictions",
+        "computes",
+        "computeSeconds",
+        "maxComputeSeconds",
+    )
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.staleHits = 0
+        self.misses = 0
+        self.stampedeWaits = 0
+        self.evictions = 0
+        self.computes = 0
+        self.computeSeconds = 0.0
+        self.maxComputeSeconds = 0.0
+
+
+_countersLock = threading.Lock()
+_counters: dict[str, CacheCounters] = collections.defaultdict(CacheCounters)
+
+
+def recordHit(name: str, count: int = 1) -> None:
+    with _countersLock:
+        _counters[name].hits += count
+
+
+def recordStaleHit(name: str) -> None:
+    with _countersLock:
+        _counters[name].staleHits += 1
+
+
+def recordMiss(name: str, count: int = 1) -> None:
+    with _countersLock:
+        _counters[name].misses += count
+
+
+def recordStampedeWait(name: str) -> None:
+    with _countersLock:
+        _counters[name].stampedeWaits += 1
+
+
+def recordEviction(name: str) -> None:
+    with _countersLock:
+        _counters[name].evictions += 1
+
+
+def recordCompute(name: str, seconds: float) -> None:
+    with _countersLock:
+        counters = _counters[name]
+        counters.computes += 1
+        counters.computeSeconds += seconds
+        counters.maxComputeSeconds = max(counters.maxComputeSeconds, seconds)
+
+
+def getCacheStats() -> dict[str, dict[str, float]]:
+    """
+    Devuelve los contadores de cache del proceso por función decorada.
+
+    Los contadores son locales a cada worker. staleHits son respuestas servidas
+    vencidas mientras se revalidaban; hitRatio las incluye y es 0 sin llamadas.
+    stampedeWaits cuenta las llamadas que esperaron a que otro cálculo de la
+    misma clave terminara, evictions las entradas descartadas por el límite de
+    memoria, y computes/computeSeconds las ejecuciones reales de la función
+    (incluidas revalidaciones y precalentado).
+    """
+
+    with _countersLock:
+        snapshot = {
+            name: {attribute: getattr(counters, attribute) for attribute in CacheCounters.__slots__}
+            for name, counters in _counters.items()
+        }
+
+    stats: dict[str, dict[str, float]] = {}
+    for name, values in sorted(snapshot.items()):
+        calls = values["hits"] + values["staleHits"] + values["misses"]
+        values["hitRatio"] = (values["hits"] + values["staleHits"]) / calls if calls else 0.0
+        values["avgComputeSeconds"] = (
+            values["computeSeconds"] / values["computes"] if values["computes"] else 0.0
+        )
+        stats[name] = values
+    return stats
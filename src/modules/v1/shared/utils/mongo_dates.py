@@ -0,0 +1,85 @@
+import typing
+
+import pymongo.asynchronous.collection
+
+
+def dateFieldExpression(fieldPath: str, isMigrated: bool) -> typing.Any:
+    """
+    Expresión de agregación que lee fieldPath como fecha.
+
+    Mientras la colección no esté migrada el campo puede ser una cadena y se
+    convierte con $convert (los valores inválidos quedan en None); migrada, se
+    lee tal cual y solo el campo ausente se normaliza a None, como hacía onNull.
+    """
+
+    if isMigrated:
+        return {"$ifNull": [f"${fieldPath}", None]}
+
+    return {
+        "$convert": {
+            "input": f"${fieldPath}",
+            "to": "date",
+            "onError": None,
+            "onNull": None,
+        }
+    }
+
+
+def _buildConversionPipeline(fieldPath: str) -> list[dict[str, typing.Any]]:
+    # Las cadenas vacías pasan a null; las que $convert no entiende se conservan
+    # para revisarlas a mano en lugar de perder el dato.
+    return [
+        {
+            "$set": {
+                fieldPath: {
+                    "$cond": {
+                        "if": {"$eq": [{"$trim": {"input": f"${fieldPath}"}}, ""]},
+                        "then": None,
+                        "else": {
+                            "$convert": {
+                                "input": f"${fieldPath}",
+                                "to": "date",
+                                "onError": f"${fieldPath}",
+                                "onNull": None,
+                            }
+                        },
+                    }
+                }
+            }
+        }
+    ]
+
+
+async def countStringDates(
+    collection: pymongo.asynchronous.collection.AsyncCollection,
+    fieldPaths: typing.Iterable[str],
+) -> dict[str, int]:
+    """Cuenta, por campo, los documentos cuya fecha sigue guardada como cadena."""
+
+    return {
+        fieldPath: await collection.count_documents({fieldPath: {"$type": "string"}})
+        for fieldPath in fieldPaths
+    }
+
+
+async def convertStringDates(
+    collection: pymongo.asynchronous.collection.AsyncCollection,
+    fieldPaths: typing.Iterable[str],
+) -> dict[str, int]:
+    """
+    Convierte en el servidor las fechas guardadas como cadena a fechas BSON.
+
+    Es idempotente: solo toca documentos donde el campo aún es una cadena.
+
+    Returns:
+        dict[str, int]: Documentos modificados por campo.
+    """
+
+    modified: dict[str, int] = {}
+    for fieldPath in fieldPaths:
+        result = await collection.update_many(
+            {fieldPath: {"$type": "string"}},
+            _buildConversionPipeline(fieldPath),
+        )
+        modified[fieldPath] = result.modified_count
+    return modified
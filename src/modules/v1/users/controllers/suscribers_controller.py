@@ -1,8 +1,9 @@
 import typing
 import fastapi
 import logging
+from src.modules.v1.shared import cache as cache_utils
 from ..schemas import suscribers_schema
-from ..services import suscribers_service
+from ..services import suscribers_export_service, suscribers_service
 
 LOGGER = logging.getLogger("uvicorn").getChild("v1.users.controllers.suscribers")
 
@@ -48,7 +49,9 @@ async def getSuscribers(
             status_code=400,
             detail="El parámetro toDate debe ser mayor o igual que fromDate.",
         )
-        
+
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+
     LOGGER.info(
         f"Obteniendo suscriptores con isActive={isActive}, fromDate={fromDate}, toDate={toDate}"
     )    
@@ -64,4 +67,119 @@ async def getSuscribers(
         f"Se encontraron {count} suscriptores con isActive={isActive}, fromDate={fromDate}, toDate={toDate}"
     )
 
-    return suscribers_schema.SuscribersSchema(count=count, fromDate=fromDate, toDate=toDate)
\ No newline at end of file
+    return suscribers_schema.SuscribersSchema(count=count, fromDate=fromDate, toDate=toDate)
+
+
+@ROUTER.get(
+    "/count/by-status",
+    summary="Obtener suscriptores activos e inactivos en una sola consulta",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=suscribers_schema.SuscribersStatusCountSchema,
+    responses={
+        200: {"description": "Respuesta exitosa", "model": suscribers_schema.SuscribersStatusCountSchema},
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def getSuscribersByStatus(
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+) -> suscribers_schema.SuscribersStatusCountSchema:
+    """
+    Obtiene los suscriptores activos e inactivos, separados por membresía
+    mensual y anual, a partir de una sola agregación.
+
+    Sin rango de fechas devuelve el total histórico; con fromDate/toDate solo
+    contabiliza suscriptores con pago dentro del intervalo.
+    """
+
+    # Ambas fechas deben ser provistas juntas o ninguna
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Los parámetros fromDate y toDate deben proporcionarse juntos o no incluirse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro toDate debe ser mayor o igual que fromDate.",
+        )
+
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+
+    counts = await suscribers_service.getSuscribersCountByStatus(
+        fromDate=fromDate,
+        toDate=toDate,
+    )
+
+    LOGGER.info(
+        f"Se encontraron {counts.active.total} suscriptores activos y {counts.inactive.total} inactivos, fromDate={fromDate}, toDate={toDate}"
+    )
+
+    return counts
+
+
+@ROUTER.get(
+    "/export",
+    summary="Exportar suscriptores en CSV, NDJSON o Parquet",
+    response_class=fastapi.responses.StreamingResponse,
+    responses={
+        200: {
+            "description": "Archivo generado por bloques",
+            "content": {
+                mediaType: {}
+                for mediaType in suscribers_export_service.EXPORT_MEDIA_TYPES.values()
+            },
+        },
+        400: {"description": "Solicitud inválida"},
+        500: {"description": "Error interno del servidor"},
+    },
+)
+async def exportSuscribers(
+    format: typing.Annotated[
+        typing.Literal["csv", "ndjson", "parquet"],
+        fastapi.Query(description="Formato del archivo: csv, ndjson o parquet."),
+    ] = "csv",
+    isActive: typing.Annotated[bool, fastapi.Query()] = True,
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+) -> fastapi.responses.StreamingResponse:
+    """
+    Exporta la lista de suscriptores con las mismas reglas de actividad y
+    rango de pago que /suscribers/count.
+
+    Las filas se leen del cursor de la agregación y se envían por bloques, sin
+    cargar la lista completa en memoria.
+    """
+
+    # Ambas fechas deben ser provistas juntas o ninguna
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Los parámetros fromDate y toDate deben proporcionarse juntos o no incluirse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro toDate debe ser mayor o igual que fromDate.",
+        )
+
+    LOGGER.info(
+        f"Exportando suscriptores en {format} con isActive={isActive}, fromDate={fromDate}, toDate={toDate}"
+    )
+
+    status = "active" if isActive else "inactive"
+    filename = f"suscribers-{status}.{format}"
+
+    return fastapi.responses.StreamingResponse(
+        suscribers_export_service.streamSuscribersExport(
+            exportFormat=format,
+            isActive=isActive,
+            fromDate=fromDate,
+            toDate=toDate,
+        ),
+        media_type=suscribers_export_service.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,5 +1,7 @@
 import typing
 import fastapi
+from src.config import ENVIRONMENT_CONFIG
+from src.modules.v1.shared import cache as cache_utils
 from ..schemas import user_schema
 from ..services import users_service
 
@@ -7,6 +9,115 @@ from ..services import users_service
 ROUTER = fastapi.APIRouter()
 
 
+@ROUTER.get(
+    "",
+    summary="Listar usuarios con paginación por cursor",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=user_schema.UserPageSchema,
+    responses={
+    200: {"description": "Respuesta exitosa", "model": user_schema.UserPageSchema},
+    400: {"description": "Solicitud inválida"},
+    500: {"description": "Error interno del servidor"},
+    },
+)
+async def listUsers(
+    cursor: typing.Annotated[
+        typing.Optional[str],
+        fastapi.Query(description="Token nextCursor de la página anterior; omitir para la primera página."),
+    ] = None,
+    pageSize: typing.Annotated[
+        int,
+        fastapi.Query(
+            ge=1,
+            le=ENVIRONMENT_CONFIG.USERS_CONFIG.USER_PAGE_SIZE_MAX,
+            description="Cantidad de usuarios por página.",
+        ),
+    ] = ENVIRONMENT_CONFIG.USERS_CONFIG.USER_PAGE_SIZE_DEFAULT,
+    portal: typing.Annotated[
+        typing.Optional[str],
+        fastapi.Query(description="Portal (userLevel) de los usuarios."),
+    ] = None,
+    subscriberActive: typing.Annotated[
+        typing.Optional[bool],
+        fastapi.Query(description="Filtra por suscriptores activos (True) o inactivos (False)."),
+    ] = None,
+    hasHypnosisRequest: typing.Annotated[
+        typing.Optional[bool],
+        fastapi.Query(description="True filtra usuarios con solicitudes de hipnosis"),
+    ] = None,
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    hypnosisFromDate: typing.Annotated[
+        typing.Optional[int],
+        fastapi.Query(description="Timestamp Unix (segundos, entero) aplicado a las solicitudes de hipnosis."),
+    ] = None,
+    hypnosisToDate: typing.Annotated[
+        typing.Optional[int],
+        fastapi.Query(description="Timestamp Unix (segundos, entero) aplicado a las solicitudes de hipnosis."),
+    ] = None,
+) -> user_schema.UserPageSchema:
+    """
+    Lista los usuarios que respaldan las distribuciones, con los mismos filtros
+    que /distribution/portal y /distribution/general.
+
+    Las páginas se ordenan por _id y se recorren con el token nextCursor, por lo
+    que cada página tiene el mismo costo sin importar cuán avanzada esté. Los
+    filtros deben repetirse al pedir la página siguiente.
+    """
+
+    if portal is not None and not portal:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="El parámetro portal no puede estar vacío.",
+        )
+
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="fromDate y toDate deben proporcionarse juntas o no enviarse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="toDate debe ser mayor o igual que fromDate.",
+        )
+
+    if (hypnosisFromDate is None) ^ (hypnosisToDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="hypnosisFromDate y hypnosisToDate deben proporcionarse juntas o no enviarse.",
+        )
+
+    if hypnosisFromDate is not None and hypnosisToDate is not None and hypnosisToDate < hypnosisFromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="hypnosisToDate debe ser mayor o igual que hypnosisFromDate.",
+        )
+
+    if (hypnosisFromDate is not None or hypnosisToDate is not None) and hasHypnosisRequest is None:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="Debe indicar hasHypnosisRequest (True o False) para usar hypnosisFromDate/hypnosisToDate.",
+        )
+
+    try:
+        page = await users_service.getUsersPage(
+            cursor=cursor,
+            pageSize=pageSize,
+            portal=portal,
+            fromDate=fromDate,
+            toDate=toDate,
+            subscriberActive=subscriberActive,
+            hasHypnosisRequest=hasHypnosisRequest,
+            hypnosisFromDate=hypnosisFromDate,
+            hypnosisToDate=hypnosisToDate,
+        )
+    except ValueError as error:
+        raise fastapi.HTTPException(status_code=400, detail=str(error)) from error
+
+    return page
+
 
 @ROUTER.get(
     "/count/aura",
@@ -59,6 +170,8 @@ async def getUsersWithAURA(
             detail="toDate debe ser mayor o igual que fromDate.",
         )
 
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+
     # Si se define un rango de fechas el conteo solo incluye usuarios creados dentro de ese intervalo.
     count = await users_service.getUsersWithAURACount(
         isActive=auraEnabled,
@@ -118,6 +231,8 @@ async def getUserHypnosisRequestCount(
             detail="toDate debe ser mayor o igual que fromDate.",
         )
 
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+
     # Con rango de fechas solo se consideran usuarios cuya primera solicitud cae dentro del intervalo.
     count = await users_service.getUsersByHypnosisRequestCount(
         isActive=hasRequest,
@@ -129,6 +244,51 @@ async def getUserHypnosisRequestCount(
     return user_schema.UserCountSchema(count=count, fromDate=fromDate, toDate=toDate)
 
 
+@ROUTER.get(
+    "/count/facts-cube",
+    summary="Obtener cubo de conteos de usuarios (AURA × suscripción × hipnosis)",
+    response_class=fastapi.responses.JSONResponse,
+    response_model=user_schema.UserFactsCubeSchema,
+    responses={
+    200: {"description": "Respuesta exitosa", "model": user_schema.UserFactsCubeSchema},
+    400: {"description": "Solicitud inválida"},
+    500: {"description": "Error interno del servidor"},
+    },
+)
+async def getUserFactsCube(
+    fromDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+    toDate: typing.Annotated[typing.Optional[int], fastapi.Query(description="Timestamp Unix (segundos, entero)")] = None,
+) -> user_schema.UserFactsCubeSchema:
+    """
+    Entrega el cruce completo auraEnabled × suscriptor activo/inactivo/sin membresía ×
+    solicitud de hipnosis, calculado en una sola agregación.
+    Con fromDate/toDate cada celda indica además si los usuarios fueron creados en el
+    intervalo (createdInRange) y hasHypnosisRequest considera solo solicitudes del intervalo,
+    de modo que los conteos de /count/aura y /count/user-with-hypnosis-request se derivan del cubo.
+    """
+
+    if (fromDate is None) ^ (toDate is None):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="fromDate y toDate deben proporcionarse juntas o no enviarse.",
+        )
+
+    if fromDate is not None and toDate is not None and toDate < fromDate:
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="toDate debe ser mayor o igual que fromDate.",
+        )
+
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+
+    cube = await users_service.getUserFactsCube(
+        fromDate=fromDate,
+        toDate=toDate,
+    )
+
+    return cube
+
+
 @ROUTER.get(
     "/portals",
     summary="Listar portales disponibles",
@@ -212,6 +372,9 @@ async def getGeneralUserDistribution(
             detail="Debe indicar hasHypnosisRequest (True o False) para usar hypnosisFromDate/hypnosisToDate.",
         )
 
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+    hypnosisFromDate, hypnosisToDate = cache_utils.quantizeDateRange(hypnosisFromDate, hypnosisToDate)
+
     # Con un rango definido la distribución considera únicamente usuarios creados en ese periodo.
     # hypnosisFromDate/hypnosisToDate acotan las solicitudes de hipnosis utilizadas en el filtro.
     distribution = await users_service.getGeneralUserDistribution(
@@ -301,6 +464,9 @@ async def getUserPortalDistribution(
             detail="Debe indicar hasHypnosisRequest (True o False) para usar hypnosisFromDate/hypnosisToDate.",
         )
 
+    fromDate, toDate = cache_utils.quantizeDateRange(fromDate, toDate)
+    hypnosisFromDate, hypnosisToDate = cache_utils.quantizeDateRange(hypnosisFromDate, hypnosisToDate)
+
     # Al limitar por fechas solo se incluyen usuarios del portal creados dentro del intervalo indicado.
     # hypnosisFromDate/hypnosisToDate acotan las solicitudes de hipnosis consideradas al filtrar.
     distribution = await users_service.getUserPortalDistribution(
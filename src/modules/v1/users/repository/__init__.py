@@ -1,4 +1,5 @@
 from .users_repository import (
     UsersRepository as UsersRepository,
     USERS_REPOSITORY as USERS_REPOSITORY,
+    SUSCRIBER_EXPORT_PROJECTION as SUSCRIBER_EXPORT_PROJECTION,
     )
\ No newline at end of file
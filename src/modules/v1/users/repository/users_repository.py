@@ -1,13 +1,42 @@
+import asyncio
+import bson
+import bson.errors
 import pydantic_mongo
 import pymongo
 from src.config import ENVIRONMENT_CONFIG
 from src.modules.v1.shared.utils import dates as dates_utils
-from ..schemas import user_schema
+from src.modules.v1.shared.utils import mongo_dates as mongo_dates_utils
+from ..schemas import suscribers_schema, user_schema
 import logging
 import typing
 
 LOGGER = logging.getLogger("uvicorn").getChild("v1.users.repository.users")
 
+SUBSCRIBER_MEMBERSHIP_TYPES = ["monthly", "yearly"]
+
+# Fechas de la membresía que la migración convierte de cadena a fecha BSON.
+MEMBERSHIP_DATE_FIELDS: tuple[str, ...] = (
+    "lastMembership.membershipDate",
+    "lastMembership.membershipPaymentDate",
+    "lastMembership.billingDate",
+)
+
+# Columnas exportadas de cada suscriptor (el orden define el de los archivos).
+SUSCRIBER_EXPORT_PROJECTION: dict[str, typing.Any] = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "names": 1,
+    "lastnames": 1,
+    "email": 1,
+    "gender": 1,
+    "language": 1,
+    "userLevel": 1,
+    "membershipType": "$lastMembership.type",
+    "membershipDate": "$membershipDateConverted",
+    "membershipPaymentDate": "$payDate",
+    "billingDate": "$billDate",
+}
+
 
 class UsersRepository(
     pydantic_mongo.AsyncAbstractRepository[user_schema.UserSchema]
@@ -21,33 +50,91 @@ class UsersRepository(
         fromDate: int | None,
         toDate: int | None,
     ) -> list[dict[str, typing.Any]]:
-        pipeline: list[dict[str, typing.Any]] = [
+        pipeline = self._buildSubscribersDateStages(
+            fromDate=fromDate,
+            toDate=toDate,
+        )
+
+        activeExpr = self._buildSubscriberActiveExpr()
+
+        statusExpr: dict[str, typing.Any]
+        if isActive:
+            statusExpr = activeExpr
+        else:
+            statusExpr = {"$not": [activeExpr]}
+
+        pipeline.append(
             {
-                "$addFields": {
-                    "payDate": {
-                        "$convert": {
-                            "input": "$lastMembership.membershipPaymentDate",
-                            "to": "date",
-                            "onError": None,
-                            "onNull": None,
-                        }
-                    },
-                    "rawBillingDate": {
-                        "$convert": {
-                            "input": "$lastMembership.billingDate",
-                            "to": "date",
-                            "onError": None,
-                            "onNull": None,
-                        }
-                    },
-                    "membershipDateConverted": {
-                        "$convert": {
-                            "input": "$lastMembership.membershipDate",
-                            "to": "date",
-                            "onError": None,
-                            "onNull": None,
+                "$match": {
+                    "lastMembership.type": {"$in": SUBSCRIBER_MEMBERSHIP_TYPES},
+                    "$expr": statusExpr,
+                }
+            }
+        )
+
+        return pipeline
+
+    def _buildSubscriberActiveExpr(self) -> dict[str, typing.Any]:
+        """
+        Expresión que evalúa si un suscriptor está activo:
+        membershipPaymentDate <= hoy <= billingDate.
+
+        Requiere los campos calculados por _buildSubscribersDateStages.
+        """
+        activeConditions: list[dict[str, typing.Any]] = [
+            {"$ne": ["$payDate", None]},
+            {"$ne": ["$billDate", None]},
+            {"$lte": ["$payDate", "$$NOW"]},
+            {"$gte": ["$billDate", "$$NOW"]},
+        ]
+
+        return {"$and": activeConditions}
+
+    def _buildSubscribersDateStages(
+        self,
+        fromDate: int | None,
+        toDate: int | None,
+    ) -> list[dict[str, typing.Any]]:
+        """
+        Etapas que derivan payDate/billDate de lastMembership y, con rango,
+        filtran por payDate dentro del intervalo.
+
+        Con USER_MEMBERSHIP_DATES_MIGRATED las fechas se leen sin $convert y el
+        rango se aplica como filtro simple sobre membershipPaymentDate.
+        """
+        isMigrated = ENVIRONMENT_CONFIG.USERS_CONFIG.USER_MEMBERSHIP_DATES_MIGRATED
+        hasRange = fromDate is not None and toDate is not None
+
+        pipeline: list[dict[str, typing.Any]] = []
+
+        if isMigrated and hasRange:
+            # Con fechas BSON el rango de pago se filtra antes de derivar campos y usa índices.
+            pipeline.append(
+                {
+                    "$match": {
+                        "lastMembership.membershipPaymentDate": {
+                            "$gte": dates_utils.timestampToDatetime(fromDate),
+                            "$lte": dates_utils.timestampToDatetime(toDate),
                         }
-                    },
+                    }
+                }
+            )
+
+        pipeline.extend([
+            {
+                "$addFields": {
+                    "payDate": mongo_dates_utils.dateFieldExpression(
+                        "lastMembership.membershipPaymentDate",
+                        isMigrated,
+                    ),
+                    "rawBillingDate": mongo_dates_utils.dateFieldExpression(
+                        "lastMembership.billingDate",
+                        isMigrated,
+                    ),
+                    "membershipDateConverted": mongo_dates_utils.dateFieldExpression(
+                        "lastMembership.membershipDate",
+                        isMigrated,
+                    ),
                 }
             },
             {
@@ -73,9 +160,9 @@ class UsersRepository(
                     }
                 }
             },
-        ]
+        ])
 
-        if fromDate is not None and toDate is not None:
+        if hasRange and not isMigrated:
             fromDateParsed = dates_utils.timestampToDatetime(fromDate)
             toDateParsed = dates_utils.timestampToDatetime(toDate)
 
@@ -93,28 +180,6 @@ class UsersRepository(
                 }
             )
 
-        activeConditions: list[dict[str, typing.Any]] = [
-            {"$ne": ["$payDate", None]},
-            {"$ne": ["$billDate", None]},
-            {"$lte": ["$payDate", "$$NOW"]},
-            {"$gte": ["$billDate", "$$NOW"]},
-        ]
-
-        statusExpr: dict[str, typing.Any]
-        if isActive:
-            statusExpr = {"$and": activeConditions}
-        else:
-            statusExpr = {"$not": [{"$and": activeConditions}]}
-
-        pipeline.append(
-            {
-                "$match": {
-                    "lastMembership.type": {"$in": ["monthly", "yearly"]},
-                    "$expr": statusExpr,
-                }
-            }
-        )
-
         return pipeline
 
     async def countSuscribers(
@@ -155,6 +220,74 @@ class UsersRepository(
 
         return count
 
+    async def countSuscribersByStatus(
+        self,
+        fromDate: int | None,
+        toDate: int | None,
+    ) -> suscribers_schema.SuscribersStatusCountSchema:
+        """
+        Calcula en una sola agregación los suscriptores activos e inactivos,
+        separados por tipo de membresía (monthly / yearly).
+
+        Usa la misma lógica de actividad que countSuscribers.
+        """
+        # El filtro por tipo va primero para descartar no suscriptores antes de convertir fechas.
+        pipeline: list[dict[str, typing.Any]] = [
+            {
+                "$match": {
+                    "lastMembership.type": {"$in": SUBSCRIBER_MEMBERSHIP_TYPES},
+                }
+            }
+        ]
+
+        pipeline.extend(
+            self._buildSubscribersDateStages(
+                fromDate=fromDate,
+                toDate=toDate,
+            )
+        )
+
+        pipeline.append(
+            {
+                "$group": {
+                    "_id": {
+                        "isActive": self._buildSubscriberActiveExpr(),
+                        "type": "$lastMembership.type",
+                    },
+                    "count": {"$sum": 1},
+                }
+            }
+        )
+
+        cursor = await self.get_collection().aggregate(pipeline)
+        documents = await cursor.to_list(length=None)
+
+        active = suscribers_schema.SuscribersBreakdownSchema()
+        inactive = suscribers_schema.SuscribersBreakdownSchema()
+
+        for document in documents:
+            breakdown = active if document["_id"]["isActive"] else inactive
+            count = int(document["count"])
+            breakdown.total += count
+            if document["_id"]["type"] == "monthly":
+                breakdown.monthly += count
+            else:
+                breakdown.yearly += count
+
+        LOGGER.info(
+            "Se contaron %s suscriptores activos y %s inactivos usando la agregación: %s",
+            active.total,
+            inactive.total,
+            pipeline,
+        )
+
+        return suscribers_schema.SuscribersStatusCountSchema(
+            active=active,
+            inactive=inactive,
+            fromDate=fromDate,
+            toDate=toDate,
+        )
+
     async def getSuscribers(
         self,
         isActive: bool,
@@ -176,105 +309,105 @@ class UsersRepository(
 
         return suscribers
 
-    async def getUsersForGeneralDistribution(
+    async def streamSuscribers(
         self,
-        subscriberActive: bool | None,
-        hasHypnosisRequest: bool | None,
+        isActive: bool,
         fromDate: int | None,
         toDate: int | None,
-        hypnosisFromDate: int | None,
-        hypnosisToDate: int | None,
-    ) -> list[user_schema.UserSchema]:
-        pipeline: list[dict[str, typing.Any]] = []
+        batchSize: int,
+    ) -> typing.AsyncIterator[dict[str, typing.Any]]:
+        """
+        Recorre los suscriptores directamente desde el cursor de la agregación,
+        sin cargarlos en memoria ni construir UserSchema.
 
-        if subscriberActive is not None:
-            pipeline.extend(
-                self._buildSubscribersPipeline(
-                    isActive=subscriberActive,
-                    fromDate=fromDate,
-                    toDate=toDate,
-                )
-            )
+        Cada documento trae solo las columnas de SUSCRIBER_EXPORT_PROJECTION,
+        con las fechas de membresía ya convertidas por la agregación.
+        """
+        pipeline = self._buildSubscribersPipeline(
+            isActive=isActive,
+            fromDate=fromDate,
+            toDate=toDate,
+        )
 
-        if fromDate is not None and toDate is not None:
-            fromDateParsed = dates_utils.timestampToDatetime(fromDate)
-            toDateParsed = dates_utils.timestampToDatetime(toDate)
+        pipeline.append({"$project": SUSCRIBER_EXPORT_PROJECTION})
 
-            pipeline.append(
-                {
-                    "$match": {
-                        "createdAt": {
-                            "$gte": fromDateParsed,
-                            "$lte": toDateParsed,
-                        }
-                    }
-                }
-            )
+        LOGGER.info("Exportando suscriptores usando la agregación: %s", pipeline)
 
-        useHypnosisFilter = (
-            hasHypnosisRequest is not None
-            or hypnosisFromDate is not None
-            or hypnosisToDate is not None
-        )
+        cursor = await self.get_collection().aggregate(pipeline, batchSize=batchSize)
+        try:
+            async for document in cursor:
+                yield document
+        finally:
+            await cursor.close()
 
-        if useHypnosisFilter:
-            lookupConditions: list[dict[str, typing.Any]] = [
-                {"$eq": ["$userId", "$$userId"]},
-            ]
+    async def getUsersByListOfIDs(
+        self,
+        userIDs: list[str],
+    ) -> list[user_schema.UserSchema]:
+        """
+        Obtiene los usuarios cuyos _id están en userIDs.
 
-            effectiveHypnosisFrom = hypnosisFromDate if hypnosisFromDate is not None else fromDate
-            effectiveHypnosisTo = hypnosisToDate if hypnosisToDate is not None else toDate
+        La consulta $in se divide en bloques de USER_ID_BATCH_SIZE que se
+        ejecutan en paralelo; los IDs que no son ObjectId válidos se ignoran.
+        El orden del resultado no está garantizado.
+        """
 
-            if effectiveHypnosisFrom is not None and effectiveHypnosisTo is not None:
-                fromDateParsed = dates_utils.timestampToDatetime(effectiveHypnosisFrom)
-                toDateParsed = dates_utils.timestampToDatetime(effectiveHypnosisTo)
+        objectIDs: list[bson.ObjectId] = []
+        for userID in dict.fromkeys(userIDs):
+            try:
+                objectIDs.append(bson.ObjectId(userID))
+            except (bson.errors.InvalidId, TypeError):
+                LOGGER.warning("ID de usuario inválido ignorado: %s", userID)
 
-                createdAtAsDate = {
-                    "$convert": {
-                        "input": "$createdAt",
-                        "to": "date",
-                        "onError": None,
-                        "onNull": None,
-                    }
-                }
+        if not objectIDs:
+            return []
 
-                lookupConditions.extend(
-                    [
-                        {"$gte": [createdAtAsDate, fromDateParsed]},
-                        {"$lte": [createdAtAsDate, toDateParsed]},
-                    ]
-                )
+        batchSize = ENVIRONMENT_CONFIG.USERS_CONFIG.USER_ID_BATCH_SIZE
 
-            # Si no se determina un rango efectivo se evalúa históricamente.
+        async def fetchChunk(chunk: list[bson.ObjectId]) -> list[dict[str, typing.Any]]:
+            cursor = self.get_collection().find({"_id": {"$in": chunk}})
+            return await cursor.to_list(length=len(chunk))
 
-            lookupPipeline: list[dict[str, typing.Any]] = [
-                {
-                    "$match": {
-                        "$expr": {
-                            "$and": lookupConditions,
-                        }
-                    }
-                },
-                {"$limit": 1},
-            ]
-
-            pipeline.append(
-                {
-                    "$lookup": {
-                        "from": ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_COLLECTION_NAME,
-                        "let": {"userId": {"$toString": "$_id"}},
-                        "pipeline": lookupPipeline,
-                        "as": "audioRequests",
-                    }
-                }
+        chunks = await asyncio.gather(
+            *(
+                fetchChunk(objectIDs[start:start + batchSize])
+                for start in range(0, len(objectIDs), batchSize)
             )
+        )
 
-            if hasHypnosisRequest:
-                pipeline.append({"$match": {"audioRequests": {"$ne": []}}})
-            elif hasHypnosisRequest is False:
-                pipeline.append({"$match": {"audioRequests": {"$eq": []}}})
+        users = [
+            user_schema.UserSchema.model_validate(document)
+            for documents in chunks
+            for document in documents
+        ]
 
-            pipeline.append({"$project": {"audioRequests": 0}})
+        LOGGER.info(
+            "Se obtuvieron %s de %s usuarios solicitados por ID en %s consultas",
+            len(users),
+            len(objectIDs),
+            len(chunks),
+        )
+
+        return users
+
+    async def getUsersForGeneralDistribution(
+        self,
+        subscriberActive: bool | None,
+        hasHypnosisRequest: bool | None,
+        fromDate: int | None,
+        toDate: int | None,
+        hypnosisFromDate: int | None,
+        hypnosisToDate: int | None,
+    ) -> list[user_schema.UserSchema]:
+        pipeline = self._buildUsersFilterPipeline(
+            portal=None,
+            fromDate=fromDate,
+            toDate=toDate,
+            subscriberActive=subscriberActive,
+            hasHypnosisRequest=hasHypnosisRequest,
+            hypnosisFromDate=hypnosisFromDate,
+            hypnosisToDate=hypnosisToDate,
+        )
 
         if pipeline:
             cursor = await self.get_collection().aggregate(pipeline)
@@ -288,55 +421,176 @@ class UsersRepository(
 
         return list(cursor)
 
-    async def countUsersByHypnosisRequest(
+    def _buildHypnosisLookupMatch(
         self,
-        isActive: bool,
+        lookupConditions: list[dict[str, typing.Any]],
         fromDate: int | None,
         toDate: int | None,
-        subscriberActive: bool | None,
-    ) -> int:
+    ) -> dict[str, typing.Any]:
         """
-        Cuenta usuarios según hayan generado (activos) o no (inactivos) una
-        solicitud de hipnosis en el rango proporcionado.
+        Cuerpo del $match de los $lookup a audio-requests con el rango sobre
+        createdAt, si se proporciona.
 
-        Sin rango de fechas se evalúa históricamente.
+        Con HYPNOSIS_DATES_MIGRATED el rango va fuera de $expr como filtro
+        simple para que se resuelva con el índice de createdAt; sin migrar,
+        createdAt se convierte a fecha dentro de $expr.
         """
 
-        lookupConditions: list[dict[str, typing.Any]] = [
-            {"$eq": ["$userId", "$$userId"]},
-        ]
+        matchFilter: dict[str, typing.Any] = {}
 
         if fromDate is not None and toDate is not None:
             fromDateParsed = dates_utils.timestampToDatetime(fromDate)
             toDateParsed = dates_utils.timestampToDatetime(toDate)
 
-            createdAtAsDate = {
-                "$convert": {
-                    "input": "$createdAt",
-                    "to": "date",
-                    "onError": None,
-                    "onNull": None,
+            if ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_DATES_MIGRATED:
+                matchFilter["createdAt"] = {
+                    "$gte": fromDateParsed,
+                    "$lte": toDateParsed,
                 }
-            }
-
-            lookupConditions.extend(
-                [
+            else:
+                createdAtAsDate = mongo_dates_utils.dateFieldExpression("createdAt", isMigrated=False)
+                lookupConditions = [
+                    *lookupConditions,
                     {"$gte": [createdAtAsDate, fromDateParsed]},
                     {"$lte": [createdAtAsDate, toDateParsed]},
                 ]
-            )
+
+        matchFilter["$expr"] = {"$and": lookupConditions}
+        return matchFilter
+
+    def _buildHypnosisRequestLookupStage(
+        self,
+        fromDate: int | None,
+        toDate: int | None,
+    ) -> dict[str, typing.Any]:
+        """
+        Etapa $lookup que agrega en audioRequests como máximo una solicitud de
+        hipnosis del usuario, creada dentro del rango cuando se proporciona.
+        """
+
+        lookupConditions: list[dict[str, typing.Any]] = [
+            {"$eq": ["$userId", "$$userId"]},
+        ]
 
         lookupPipeline: list[dict[str, typing.Any]] = [
-            {
-                "$match": {
-                    "$expr": {
-                        "$and": lookupConditions,
-                    }
-                }
-            },
+            {"$match": self._buildHypnosisLookupMatch(lookupConditions, fromDate, toDate)},
             {"$limit": 1},
         ]
 
+        return {
+            "$lookup": {
+                "from": ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_COLLECTION_NAME,
+                "let": {"userId": {"$toString": "$_id"}},
+                "pipeline": lookupPipeline,
+                "as": "audioRequests",
+            }
+        }
+
+    async def getUserFactsCube(
+        self,
+        fromDate: int | None,
+        toDate: int | None,
+    ) -> user_schema.UserFactsCubeSchema:
+        """
+        Cuenta los usuarios cruzando auraEnabled × estado de suscripción ×
+        solicitud de hipnosis en una sola agregación.
+
+        El rango de fechas no filtra usuarios: define si el usuario fue creado
+        dentro del intervalo (createdInRange) y si tiene una solicitud de
+        hipnosis dentro del intervalo (hasHypnosisRequest). Así se pueden
+        derivar tanto countUsersWithAURA (filtra usuarios por createdAt) como
+        countUsersByHypnosisRequest (filtra solicitudes por createdAt).
+        """
+
+        hasRange = fromDate is not None and toDate is not None
+
+        createdInRangeExpr: typing.Any = True
+        if hasRange:
+            createdInRangeExpr = {
+                "$and": [
+                    {"$gte": ["$createdAt", dates_utils.timestampToDatetime(fromDate)]},
+                    {"$lte": ["$createdAt", dates_utils.timestampToDatetime(toDate)]},
+                ]
+            }
+
+        pipeline = self._buildSubscribersDateStages(
+            fromDate=None,
+            toDate=None,
+        )
+
+        pipeline.extend(
+            [
+                self._buildHypnosisRequestLookupStage(
+                    fromDate=fromDate,
+                    toDate=toDate,
+                ),
+                {
+                    "$group": {
+                        "_id": {
+                            "auraEnabled": "$auraEnabled",
+                            "subscriberStatus": {
+                                "$cond": {
+                                    "if": {"$in": ["$lastMembership.type", SUBSCRIBER_MEMBERSHIP_TYPES]},
+                                    "then": {
+                                        "$cond": {
+                                            "if": self._buildSubscriberActiveExpr(),
+                                            "then": "active",
+                                            "else": "inactive",
+                                        }
+                                    },
+                                    "else": "none",
+                                }
+                            },
+                            "hasHypnosisRequest": {"$gt": [{"$size": "$audioRequests"}, 0]},
+                            "createdInRange": createdInRangeExpr,
+                        },
+                        "count": {"$sum": 1},
+                    }
+                },
+            ]
+        )
+
+        cursor = await self.get_collection().aggregate(pipeline)
+        documents = await cursor.to_list(length=None)
+
+        cells = [
+            user_schema.UserFactsCellSchema(
+                auraEnabled=document["_id"].get("auraEnabled"),
+                subscriberStatus=document["_id"]["subscriberStatus"],
+                hasHypnosisRequest=document["_id"]["hasHypnosisRequest"],
+                createdInRange=document["_id"]["createdInRange"],
+                count=int(document["count"]),
+            )
+            for document in documents
+        ]
+
+        LOGGER.info(
+            "Se calculó el cubo de usuarios con %s celdas usando la agregación: %s",
+            len(cells),
+            pipeline,
+        )
+
+        return user_schema.UserFactsCubeSchema(
+            totalUsers=sum(cell.count for cell in cells),
+            cells=cells,
+            fromDate=fromDate,
+            toDate=toDate,
+        )
+
+    async def countUsersByHypnosisRequest(
+        self,
+        isActive: bool,
+        fromDate: int | None,
+        toDate: int | None,
+        subscriberActive: bool | None,
+    ) -> int:
+        """
+        Cuenta usuarios según hayan generado (activos) o no (inactivos) una
+        solicitud de hipnosis en el rango proporcionado.
+
+        Sin rango de fechas se evalúa históricamente.
+        """
+
         pipeline: list[dict[str, typing.Any]] = []
 
         if subscriberActive is not None:
@@ -349,14 +603,10 @@ class UsersRepository(
             )
 
         pipeline.append(
-            {
-                "$lookup": {
-                    "from": ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_COLLECTION_NAME,
-                    "let": {"userId": {"$toString": "$_id"}},
-                    "pipeline": lookupPipeline,
-                    "as": "audioRequests",
-                }
-            }
+            self._buildHypnosisRequestLookupStage(
+                fromDate=fromDate,
+                toDate=toDate,
+            )
         )
 
         if isActive:
@@ -372,41 +622,45 @@ class UsersRepository(
             return typing.cast(int, result[0]["count"])
         return 0
 
-    async def getUsersByPortal(
+    def _buildUsersFilterPipeline(
         self,
-        portal: str,
+        portal: str | None,
         fromDate: int | None,
         toDate: int | None,
         subscriberActive: bool | None,
         hasHypnosisRequest: bool | None,
         hypnosisFromDate: int | None,
         hypnosisToDate: int | None,
-    ) -> list[user_schema.UserSchema]:
+    ) -> list[dict[str, typing.Any]]:
         """
-        Obtiene los usuarios pertenecientes a un portal específico.
+        Etapas que filtran usuarios por portal (userLevel), estado de
+        suscripción, rango de creación y actividad de hipnosis.
 
-        Permite filtrar por rango de fechas utilizando createdAt.
+        Sin portal se consideran todos los usuarios y las solicitudes de
+        hipnosis no se restringen por nivel. Compartido por las distribuciones
+        y el listado paginado para que apliquen exactamente los mismos filtros.
         """
 
-        portalStr = str(portal)
+        pipeline: list[dict[str, typing.Any]] = []
 
         audioPortalLevel: str | None = None
-        try:
-            portalAsInt = int(portalStr)
-        except ValueError:
-            audioPortalLevel = None
-        else:
-            audioPortalLevel = str(max(portalAsInt - 1, 0))
-
-        # Los usuarios se cuentan por el portal actual, pero sus solicitudes pertenecen al nivel previo.
+        if portal is not None:
+            portalStr = str(portal)
+            try:
+                portalAsInt = int(portalStr)
+            except ValueError:
+                audioPortalLevel = None
+            else:
+                audioPortalLevel = str(max(portalAsInt - 1, 0))
 
-        pipeline: list[dict[str, typing.Any]] = [
-            {
-                "$match": {
-                    "userLevel": portalStr,
+            # Los usuarios se cuentan por el portal actual, pero sus solicitudes pertenecen al nivel previo.
+            pipeline.append(
+                {
+                    "$match": {
+                        "userLevel": portalStr,
+                    }
                 }
-            }
-        ]
+            )
 
         if subscriberActive is not None:
             pipeline.extend(
@@ -446,26 +700,6 @@ class UsersRepository(
             effectiveHypnosisFrom = hypnosisFromDate if hypnosisFromDate is not None else fromDate
             effectiveHypnosisTo = hypnosisToDate if hypnosisToDate is not None else toDate
 
-            if effectiveHypnosisFrom is not None and effectiveHypnosisTo is not None:
-                fromDateParsed = dates_utils.timestampToDatetime(effectiveHypnosisFrom)
-                toDateParsed = dates_utils.timestampToDatetime(effectiveHypnosisTo)
-
-                createdAtAsDate = {
-                    "$convert": {
-                        "input": "$createdAt",
-                        "to": "date",
-                        "onError": None,
-                        "onNull": None,
-                    }
-                }
-
-                lookupConditions.extend(
-                    [
-                        {"$gte": [createdAtAsDate, fromDateParsed]},
-                        {"$lte": [createdAtAsDate, toDateParsed]},
-                    ]
-                )
-
             if audioPortalLevel is not None:
                 lookupConditions.append(
                     {
@@ -487,23 +721,24 @@ class UsersRepository(
 
             lookupPipeline: list[dict[str, typing.Any]] = [
                 {
-                    "$match": {
-                        "$expr": {
-                            "$and": lookupConditions,
-                        }
-                    }
+                    "$match": self._buildHypnosisLookupMatch(
+                        lookupConditions,
+                        effectiveHypnosisFrom,
+                        effectiveHypnosisTo,
+                    )
                 },
                 {"$limit": 1},
             ]
 
+            lookupVariables: dict[str, typing.Any] = {"userId": {"$toString": "$_id"}}
+            if audioPortalLevel is not None:
+                lookupVariables["audioPortalLevel"] = audioPortalLevel
+
             pipeline.append(
                 {
                     "$lookup": {
                         "from": ENVIRONMENT_CONFIG.HYPNOSIS_CONFIG.HYPNOSIS_COLLECTION_NAME,
-                        "let": {
-                            "userId": {"$toString": "$_id"},
-                            "audioPortalLevel": audioPortalLevel,
-                        },
+                        "let": lookupVariables,
                         "pipeline": lookupPipeline,
                         "as": "audioRequests",
                     }
@@ -517,6 +752,34 @@ class UsersRepository(
 
             pipeline.append({"$project": {"audioRequests": 0}})
 
+        return pipeline
+
+    async def getUsersByPortal(
+        self,
+        portal: str,
+        fromDate: int | None,
+        toDate: int | None,
+        subscriberActive: bool | None,
+        hasHypnosisRequest: bool | None,
+        hypnosisFromDate: int | None,
+        hypnosisToDate: int | None,
+    ) -> list[user_schema.UserSchema]:
+        """
+        Obtiene los usuarios pertenecientes a un portal específico.
+
+        Permite filtrar por rango de fechas utilizando createdAt.
+        """
+
+        pipeline = self._buildUsersFilterPipeline(
+            portal=portal,
+            fromDate=fromDate,
+            toDate=toDate,
+            subscriberActive=subscriberActive,
+            hasHypnosisRequest=hasHypnosisRequest,
+            hypnosisFromDate=hypnosisFromDate,
+            hypnosisToDate=hypnosisToDate,
+        )
+
         cursor = await self.get_collection().aggregate(pipeline)
         documents = await cursor.to_list(length=None)
 
@@ -529,6 +792,67 @@ class UsersRepository(
 
         return [user_schema.UserSchema.model_validate(document) for document in documents]
 
+    async def getUsersPage(
+        self,
+        afterID: bson.ObjectId | None,
+        pageSize: int,
+        portal: str | None,
+        fromDate: int | None,
+        toDate: int | None,
+        subscriberActive: bool | None,
+        hasHypnosisRequest: bool | None,
+        hypnosisFromDate: int | None,
+        hypnosisToDate: int | None,
+    ) -> tuple[list[user_schema.UserSchema], bool]:
+        """
+        Obtiene una página de usuarios ordenada por _id, continuando después de
+        afterID (keyset), con los mismos filtros que las distribuciones.
+
+        El rango sobre _id y el orden van al inicio para recorrer el índice de
+        _id desde el cursor, de modo que cada página cuesta lo mismo sin
+        importar su posición. Se pide un documento extra para saber si hay más.
+
+        Returns:
+            tuple[list[user_schema.UserSchema], bool]: Usuarios de la página y
+            si existen más resultados después de ella.
+        """
+
+        pipeline: list[dict[str, typing.Any]] = []
+
+        if afterID is not None:
+            pipeline.append({"$match": {"_id": {"$gt": afterID}}})
+
+        pipeline.append({"$sort": {"_id": 1}})
+
+        pipeline.extend(
+            self._buildUsersFilterPipeline(
+                portal=portal,
+                fromDate=fromDate,
+                toDate=toDate,
+                subscriberActive=subscriberActive,
+                hasHypnosisRequest=hasHypnosisRequest,
+                hypnosisFromDate=hypnosisFromDate,
+                hypnosisToDate=hypnosisToDate,
+            )
+        )
+
+        pipeline.append({"$limit": pageSize + 1})
+
+        cursor = await self.get_collection().aggregate(pipeline)
+        documents = await cursor.to_list(length=pageSize + 1)
+
+        hasMore = len(documents) > pageSize
+        users = [user_schema.UserSchema.model_validate(document) for document in documents[:pageSize]]
+
+        LOGGER.info(
+            "Se obtuvo una página de %s usuarios (hasMore=%s) con el pipeline: %s",
+            len(users),
+            hasMore,
+            pipeline,
+        )
+
+        return users, hasMore
+
     async def countUsersWithAURA(
         self,
         isActive: bool,
@@ -609,6 +933,23 @@ class UsersRepository(
         LOGGER.info("Se encontraron %s portales distintos: %s", len(portals), portals)
         return portals
 
+    async def countStringMembershipDates(self) -> dict[str, int]:
+        """Usuarios cuyas fechas de lastMembership siguen guardadas como cadena, por campo."""
+
+        return await mongo_dates_utils.countStringDates(self.get_collection(), MEMBERSHIP_DATE_FIELDS)
+
+    async def migrateMembershipDates(self) -> dict[str, int]:
+        """
+        Convierte a fechas BSON las fechas de lastMembership guardadas como cadena.
+
+        Returns:
+            dict[str, int]: Usuarios modificados por campo.
+        """
+
+        modified = await mongo_dates_utils.convertStringDates(self.get_collection(), MEMBERSHIP_DATE_FIELDS)
+        LOGGER.info("Fechas de membresía migradas a BSON: %s", modified)
+        return modified
+
 USERS_MONGO_CLIENT = pymongo.AsyncMongoClient(
     ENVIRONMENT_CONFIG.CONNECTIONS_CONFIG.MONGO_DATABASE_URL
 )
@@ -2,9 +2,11 @@ import fastapi
 from . import controllers
 
 ROUTER = fastapi.APIRouter(
-    prefix="/users",
     tags=["usuarios"],
 )
 
+# El prefijo se aplica al incluir cada controlador para que el listado pueda
+# publicarse en la raíz del módulo (/users); FastAPI no admite rutas vacías
+# incluidas sin prefijo.
 for controller in controllers.ALL_CONTROLLERS:
-    ROUTER.include_router(controller)
\ No newline at end of file
+    ROUTER.include_router(controller, prefix="/users")
\ No newline at end of file
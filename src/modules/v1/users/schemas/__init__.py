@@ -1,4 +1,5 @@
 from . import (
     membership_schema as membership_schema,
+    suscribers_schema as suscribers_schema,
     user_schema as user_schema,
 )
\ No newline at end of file
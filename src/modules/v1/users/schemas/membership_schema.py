@@ -1,4 +1,6 @@
+import datetime
 import pydantic
+import typing
 
 
 class MembershipSchema(pydantic.BaseModel):
@@ -15,14 +17,14 @@ class MembershipSchema(pydantic.BaseModel):
         description="Identificador único de la membresía.",
     )
 
-    membershipDate: str = pydantic.Field(
+    membershipDate: typing.Union[datetime.datetime, str, None] = pydantic.Field(
         ...,
-        description="Fecha en la que se creó la membresía.",
+        description="Fecha en la que se creó la membresía (cadena hasta migrar las fechas a BSON).",
     )
 
-    membershipPaymentDate: str = pydantic.Field(
+    membershipPaymentDate: typing.Union[datetime.datetime, str, None] = pydantic.Field(
         default="",
-        description="Fecha de vencimiento del pago de la membresía.",
+        description="Fecha de vencimiento del pago de la membresía (cadena hasta migrar las fechas a BSON).",
     )
 
     type: str = pydantic.Field(
@@ -23,4 +23,58 @@ class SuscribersSchema(pydantic.BaseModel):
     toDate: typing.Optional[int] = pydantic.Field(
         default=None,
         description="Timestamp final (segundos Unix) utilizado en el filtrado de suscriptores.",
-    )
\ No newline at end of file
+    )
+
+class SuscribersBreakdownSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    total: int = pydantic.Field(
+        default=0,
+        description="Cantidad total de suscriptores.",
+    )
+
+    monthly: int = pydantic.Field(
+        default=0,
+        description="Suscriptores con membresía mensual.",
+    )
+
+    yearly: int = pydantic.Field(
+        default=0,
+        description="Suscriptores con membresía anual.",
+    )
+
+
+class SuscribersStatusCountSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    active: SuscribersBreakdownSchema = pydantic.Field(
+        default_factory=SuscribersBreakdownSchema,
+        description="Suscriptores activos (membershipPaymentDate <= hoy <= billingDate).",
+    )
+
+    inactive: SuscribersBreakdownSchema = pydantic.Field(
+        default_factory=SuscribersBreakdownSchema,
+        description="Suscriptores inactivos.",
+    )
+
+    fromDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp inicial (segundos Unix) utilizado en el filtrado de suscriptores.",
+    )
+
+    toDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp final (segundos Unix) utilizado en el filtrado de suscriptores.",
+    )
@@ -73,6 +73,46 @@ class UserSchema(pydantic.BaseModel):
         description="Idioma preferido del usuario.",
     )
 
+class UserPageSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    users: typing.List[UserSchema] = pydantic.Field(
+        default_factory=list,
+        description="Usuarios de la página, ordenados por _id.",
+    )
+
+    pageSize: int = pydantic.Field(
+        ...,
+        description="Tamaño de página solicitado.",
+    )
+
+    nextCursor: typing.Optional[str] = pydantic.Field(
+        default=None,
+        description="Token opaco para pedir la página siguiente; None cuando no hay más usuarios.",
+    )
+
+    portal: typing.Optional[str] = pydantic.Field(
+        default=None,
+        description="Portal (userLevel) aplicado en el filtrado.",
+    )
+
+    fromDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp inicial (segundos Unix) utilizado en el filtrado.",
+    )
+
+    toDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp final (segundos Unix) utilizado en el filtrado.",
+    )
+
+
 class UserCountSchema(pydantic.BaseModel):
 
     model_config = pydantic.ConfigDict(
@@ -447,4 +487,68 @@ class UserGeneralDistributionSchema(pydantic.BaseModel):
         default=None,
         description="Timestamp final (segundos Unix) aplicado al filtro de solicitudes de hipnosis.",
         examples=[1733360400],
-    )
\ No newline at end of file
+    )
+
+class UserFactsCellSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    auraEnabled: typing.Optional[bool] = pydantic.Field(
+        default=None,
+        description="Valor de auraEnabled (None cuando el usuario no tiene el campo).",
+    )
+
+    subscriberStatus: typing.Literal["active", "inactive", "none"] = pydantic.Field(
+        ...,
+        description="Estado de suscripción: active, inactive o none (sin membresía monthly/yearly).",
+    )
+
+    hasHypnosisRequest: bool = pydantic.Field(
+        ...,
+        description="Indica si el usuario tiene al menos una solicitud de hipnosis en el rango.",
+    )
+
+    createdInRange: bool = pydantic.Field(
+        ...,
+        description="Indica si el usuario fue creado dentro del rango (siempre True sin rango).",
+    )
+
+    count: int = pydantic.Field(
+        ...,
+        description="Cantidad de usuarios en la celda.",
+    )
+
+
+class UserFactsCubeSchema(pydantic.BaseModel):
+
+    model_config = pydantic.ConfigDict(
+        extra="ignore",
+        validate_by_alias=True,
+        validate_by_name=True,
+        serialize_by_alias=True,
+    )
+
+    totalUsers: int = pydantic.Field(
+        ...,
+        description="Cantidad total de usuarios (suma de todas las celdas).",
+    )
+
+    cells: list[UserFactsCellSchema] = pydantic.Field(
+        default_factory=list,
+        description="Celdas no vacías del cruce auraEnabled × suscripción × hipnosis × createdInRange.",
+    )
+
+    fromDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp inicial (segundos Unix) utilizado en el filtrado.",
+    )
+
+    toDate: typing.Optional[int] = pydantic.Field(
+        default=None,
+        description="Timestamp final (segundos Unix) utilizado en el filtrado.",
+    )
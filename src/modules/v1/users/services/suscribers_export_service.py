@@ -0,0 +1,186 @@
+import csv
+import datetime
+import io
+import json
+import logging
+import typing
+import pyarrow
+import pyarrow.parquet
+from src.config import ENVIRONMENT_CONFIG
+from ..repository import SUSCRIBER_EXPORT_PROJECTION, USERS_REPOSITORY
+
+LOGGER = logging.getLogger("uvicorn").getChild("v1.users.services.suscribers_export")
+
+EXPORT_COLUMNS: tuple[str, ...] = tuple(
+    column for column in SUSCRIBER_EXPORT_PROJECTION if column != "_id"
+)
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+PARQUET_FORMAT = "parquet"
+
+# Tipo de contenido de cada formato de exportación.
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    CSV_FORMAT: "text/csv; charset=utf-8",
+    NDJSON_FORMAT: "application/x-ndjson",
+    PARQUET_FORMAT: "application/vnd.apache.parquet",
+}
+
+
+def _normalizeValue(value: typing.Any) -> typing.Any:
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.isoformat()
+    return value
+
+
+async def _iterateBatches(
+    isActive: bool,
+    fromDate: int | None,
+    toDate: int | None,
+) -> typing.AsyncIterator[list[dict[str, typing.Any]]]:
+    """Agrupa las filas del cursor en bloques de USER_EXPORT_BATCH_SIZE."""
+
+    batchSize = ENVIRONMENT_CONFIG.USERS_CONFIG.USER_EXPORT_BATCH_SIZE
+    batch: list[dict[str, typing.Any]] = []
+    exported = 0
+
+    async for document in USERS_REPOSITORY.streamSuscribers(
+        isActive=isActive,
+        fromDate=fromDate,
+        toDate=toDate,
+        batchSize=batchSize,
+    ):
+        batch.append({column: _normalizeValue(document.get(column)) for column in EXPORT_COLUMNS})
+        exported += 1
+        if len(batch) >= batchSize:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+    LOGGER.info(
+        "Se exportaron %s suscriptores con isActive=%s, fromDate=%s, toDate=%s",
+        exported,
+        isActive,
+        fromDate,
+        toDate,
+    )
+
+
+async def _streamCSV(
+    isActive: bool,
+    fromDate: int | None,
+    toDate: int | None,
+) -> typing.AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for batch in _iterateBatches(isActive, fromDate, toDate):
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+
+async def _streamNDJSON(
+    isActive: bool,
+    fromDate: int | None,
+    toDate: int | None,
+) -> typing.AsyncIterator[str]:
+    async for batch in _iterateBatches(isActive, fromDate, toDate):
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch)
+
+
+class _ParquetChunkSink:
+    """
+    Destino de escritura para pyarrow que acumula los bytes producidos y los
+    entrega por bloques, manteniendo la posición absoluta que el escritor usa
+    para los offsets del footer.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def _streamParquet(
+    isActive: bool,
+    fromDate: int | None,
+    toDate: int | None,
+) -> typing.AsyncIterator[bytes]:
+    # Cada bloque se escribe como un row group y se envía apenas se cierra.
+    schema = pyarrow.schema([(column, pyarrow.string()) for column in EXPORT_COLUMNS])
+    sink = _ParquetChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(pyarrow.PythonFile(sink, mode="w"), schema)
+
+    try:
+        async for batch in _iterateBatches(isActive, fromDate, toDate):
+            columns = {
+                column: [None if row[column] is None else str(row[column]) for row in batch]
+                for column in EXPORT_COLUMNS
+            }
+            writer.write_table(pyarrow.table(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+def streamSuscribersExport(
+    exportFormat: str,
+    isActive: bool,
+    fromDate: int | None,
+    toDate: int | None,
+) -> typing.AsyncIterator[str] | typing.AsyncIterator[bytes]:
+    """
+    Genera la exportación de suscriptores por bloques para un StreamingResponse.
+
+    Args:
+        exportFormat: csv, ndjson o parquet.
+        isActive: Exporta suscriptores activos o inactivos.
+        fromDate: Inicio del rango de pago (timestamp Unix) o None.
+        toDate: Fin del rango de pago (timestamp Unix) o None.
+
+    Returns:
+        Iterador asíncrono de bloques de texto (csv/ndjson) o bytes (parquet).
+    """
+
+    if exportFormat == CSV_FORMAT:
+        return _streamCSV(isActive, fromDate, toDate)
+    if exportFormat == NDJSON_FORMAT:
+        return _streamNDJSON(isActive, fromDate, toDate)
+    if exportFormat == PARQUET_FORMAT:
+        return _streamParquet(isActive, fromDate, toDate)
+
+    raise ValueError(f"Formato de exportación no soportado: {exportFormat}")
@@ -1,12 +1,18 @@
-import aiocache
 import typing
+from src.config import ENVIRONMENT_CONFIG
+from src.modules.v1.shared import cache as cache_utils
 from ..repository import USERS_REPOSITORY
+from ..schemas import suscribers_schema
 
+# Los conteos vencidos se siguen sirviendo mientras se recalculan en segundo plano.
+ANALYTICS_MAX_STALE_SECONDS = ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_ANALYTICS_MAX_STALE_SECONDS
 
-@aiocache.cached_stampede(
+
+@cache_utils.cachedStampede(
     lease=2,
     ttl=300,
-    skip_cache_func=lambda count: count == 0,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda count: count == 0,
 )
 async def _getAllSuscribersCount(
     isActive: bool,
@@ -22,9 +28,35 @@ async def _getAllSuscribersCount(
 
     return count
 
+@cache_utils.cachedStampede(
+    lease=2,
+    ttl=300,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda counts: counts.active.total + counts.inactive.total == 0,
+)
+async def _getSuscribersCountByStatus(
+    fromDate: int | None,
+    toDate: int | None,
+) -> suscribers_schema.SuscribersStatusCountSchema:
+
+    counts = await USERS_REPOSITORY.countSuscribersByStatus(
+        fromDate=fromDate,
+        toDate=toDate,
+    )
+
+    return counts
+
 getAllSuscribersCount = typing.cast(
     typing.Callable[
         [bool, int | None, int | None], typing.Awaitable[int]
     ],
     _getAllSuscribersCount,
 )
+
+getSuscribersCountByStatus = typing.cast(
+    typing.Callable[
+        [int | None, int | None],
+        typing.Awaitable[suscribers_schema.SuscribersStatusCountSchema],
+    ],
+    _getSuscribersCountByStatus,
+)
@@ -1,16 +1,34 @@
-import aiocache
+import base64
 import collections
 import datetime
+import functools
+import logging
+import threading
 import typing
+from src.config import ENVIRONMENT_CONFIG
+from src.modules.v1.shared import cache as cache_utils
 from src.modules.v1.shared.utils import dates as dates_utils
 from ..repository import USERS_REPOSITORY
 from ..schemas import user_schema
+import anyio
+import anyio.to_process
 import anyio.to_thread
+import bson
+import bson.errors
+import numpy as np
+import pandas as pd
 
-@aiocache.cached_stampede(
+LOGGER = logging.getLogger("uvicorn").getChild("v1.users.services.users")
+
+# Los conteos y distribuciones vencidos se siguen sirviendo mientras se recalculan en segundo plano.
+ANALYTICS_MAX_STALE_SECONDS = ENVIRONMENT_CONFIG.CACHE_CONFIG.CACHE_ANALYTICS_MAX_STALE_SECONDS
+
+
+@cache_utils.cachedStampede(
     lease=2,
     ttl=300,
-    skip_cache_func=lambda count: count == 0,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda count: count == 0,
 )
 async def _getUsersWithAURACount(
     isActive: bool,
@@ -30,10 +48,22 @@ async def _getUsersWithAURACount(
 
 
 
-@aiocache.cached_stampede(
-    lease=2,
+async def _loadUsersByIDs(userIDs: list[str]) -> dict[str, user_schema.UserSchema]:
+    users = await USERS_REPOSITORY.getUsersByListOfIDs(userIDs=userIDs)
+    return {str(user.id): user for user in users}
+
+
+# Cache por ID compartido por getUserByID y getUsersByListOfIDs: las listas que se
+# solapan reutilizan sus usuarios y solo los faltantes se piden en un único lote.
+USERS_BY_ID_LOADER: cache_utils.BatchLoader[user_schema.UserSchema] = cache_utils.BatchLoader(
+    name=f"{__name__}.USERS_BY_ID_LOADER",
+    batchFunction=_loadUsersByIDs,
     ttl=300,
+    maxEntries=4096,
+    maxBytes=16 * 1024 * 1024,
 )
+
+
 async def _getUserByID(
     userID: str,
 ) -> user_schema.UserSchema | None:
@@ -41,33 +71,28 @@ async def _getUserByID(
     Obtiene un usuario por su ID.
     """
 
-    user = await USERS_REPOSITORY.getUserByID(userID=userID)
-    return user
+    return await USERS_BY_ID_LOADER.load(userID)
 
 
-
-@aiocache.cached_stampede(
-    lease=2,
-    ttl=300,
-    skip_cache_func=lambda userIDs: len(userIDs) == 0,
-)
 async def _getUsersByListOfIDs(
     userIDs: list[str],
 ) -> list[user_schema.UserSchema]:
     """
-    Obtiene una lista de usuarios por sus IDs.
+    Obtiene una lista de usuarios por sus IDs, en el orden solicitado y
+    omitiendo los que no existen.
     """
 
-    users = await USERS_REPOSITORY.getUsersByListOfIDs(userIDs=userIDs)
+    usersByID = await USERS_BY_ID_LOADER.loadMany(userIDs)
 
-    return users
+    return [user for user in usersByID.values() if user is not None]
 
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=300,
-    skip_cache_func=lambda count: count == 0,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda count: count == 0,
 )
 async def _getUsersByHypnosisRequestCount(
     isActive: bool,
@@ -86,6 +111,59 @@ async def _getUsersByHypnosisRequestCount(
     return count
 
 
+@cache_utils.cachedStampede(
+    lease=2,
+    ttl=300,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda cube: cube.totalUsers == 0,
+)
+async def _getUserFactsCube(
+    fromDate: int | None,
+    toDate: int | None,
+) -> user_schema.UserFactsCubeSchema:
+
+    cube = await USERS_REPOSITORY.getUserFactsCube(
+        fromDate=fromDate,
+        toDate=toDate,
+    )
+
+    return cube
+
+
+def countFromUserFactsCube(
+    cube: user_schema.UserFactsCubeSchema,
+    auraEnabled: bool | None = None,
+    subscriberActive: bool | None = None,
+    hasHypnosisRequest: bool | None = None,
+    createdInRange: bool | None = None,
+) -> int:
+    """
+    Suma las celdas del cubo que cumplen los filtros dados (None no filtra).
+
+    auraEnabled + createdInRange=True equivale a countUsersWithAURA y
+    hasHypnosisRequest equivale a countUsersByHypnosisRequest, ambos con el
+    mismo subscriberActive.
+    """
+
+    subscriberStatus: str | None = None
+    if subscriberActive is not None:
+        subscriberStatus = "active" if subscriberActive else "inactive"
+
+    total = 0
+    for cell in cube.cells:
+        if auraEnabled is not None and cell.auraEnabled is not auraEnabled:
+            continue
+        if subscriberStatus is not None and cell.subscriberStatus != subscriberStatus:
+            continue
+        if hasHypnosisRequest is not None and cell.hasHypnosisRequest is not hasHypnosisRequest:
+            continue
+        if createdInRange is not None and cell.createdInRange is not createdInRange:
+            continue
+        total += cell.count
+
+    return total
+
+
 getUsersByHypnosisRequestCount = typing.cast(
     typing.Callable[
         [bool, int | None, int | None, bool | None], typing.Awaitable[int]
@@ -94,19 +172,21 @@ getUsersByHypnosisRequestCount = typing.cast(
 )
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=300,
-    skip_cache_func=lambda portals: len(portals) == 0,
+    isNegativeResult=lambda portals: len(portals) == 0,
 )
 async def _getUserPortals() -> list[int]:
     return await USERS_REPOSITORY.getDistinctPortals()
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=300,
-    skip_cache_func=lambda distribution: distribution.totalUsers == 0,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda distribution: distribution.totalUsers == 0,
+    maxEntries=128,
 )
 async def _getGeneralUserDistribution(
     subscriberActive: bool | None,
@@ -136,7 +216,7 @@ async def _getGeneralUserDistribution(
         hypnosisToDate=effectiveHypnosisToDate,
     )
 
-    return _buildGeneralDistribution(
+    return await _buildGeneralDistribution(
         users=users,
         subscriberActive=subscriberActive,
         hasHypnosisRequest=hasHypnosisRequest,
@@ -183,7 +263,7 @@ def _calculateAge(birthdate: str, reference: datetime.datetime) -> int | None:
     return years if hasHadBirthday else years - 1
 
 
-def _resolveAgeBucket(age: int) -> str:
+def _scanAgeBucket(age: int) -> str:
     if age < AGE_BUCKETS[0][1]:
         return UNDERAGE_BUCKET
 
@@ -196,6 +276,65 @@ def _resolveAgeBucket(age: int) -> str:
     return AGE_BUCKETS[-1][0]
 
 
+# Tabla edad -> bucket precalculada hasta el inicio del último rango (abierto).
+_AGE_BUCKET_TABLE: tuple[str, ...] = tuple(
+    _scanAgeBucket(age) for age in range(AGE_BUCKETS[-1][1] + 1)
+)
+
+
+def _resolveAgeBucket(age: int) -> str:
+    if age < 0:
+        return UNDERAGE_BUCKET
+    if age < len(_AGE_BUCKET_TABLE):
+        return _AGE_BUCKET_TABLE[age]
+    return AGE_BUCKETS[-1][0]
+
+
+@functools.lru_cache(maxsize=ENVIRONMENT_CONFIG.USERS_CONFIG.USER_BIRTHDATE_CACHE_MAX_ENTRIES)
+def _resolveBirthdateBucket(birthdate: str, referenceDay: datetime.date) -> str:
+    """
+    Bucket de edad de una fecha de nacimiento para el día de referencia (UTC).
+
+    Muchos usuarios comparten fecha y el mismo conjunto se recuenta en la
+    distribución general y en la de cada portal, por lo que el resultado se
+    memoriza; el día forma parte de la clave porque la edad depende de él.
+    """
+
+    reference = datetime.datetime(
+        referenceDay.year,
+        referenceDay.month,
+        referenceDay.day,
+        tzinfo=datetime.timezone.utc,
+    )
+
+    age = _calculateAge(birthdate, reference)
+    if age is None or age < 0:
+        return UNKNOWN_AGE
+    return _resolveAgeBucket(age)
+
+
+_birthdateCacheDay: datetime.date | None = None
+_birthdateCacheLock = threading.Lock()
+
+
+def _prepareBirthdateCache(referenceDate: datetime.datetime) -> datetime.date:
+    """
+    Devuelve el día de referencia (UTC) y vacía el cache de fechas de
+    nacimiento cuando cambia, ya que sus entradas dejan de servir.
+    """
+
+    global _birthdateCacheDay
+
+    referenceDay = referenceDate.astimezone(datetime.timezone.utc).date()
+    if referenceDay != _birthdateCacheDay:
+        with _birthdateCacheLock:
+            if referenceDay != _birthdateCacheDay:
+                _resolveBirthdateBucket.cache_clear()
+                _birthdateCacheDay = referenceDay
+
+    return referenceDay
+
+
 def _buildOrderedAgeDistribution(counter: collections.Counter[str]) -> dict[str, int]:
     ordered: dict[str, int] = {}
 
@@ -209,7 +348,7 @@ def _buildOrderedAgeDistribution(counter: collections.Counter[str]) -> dict[str,
     return ordered
 
 
-def _buildPortalDistribution(
+async def _buildPortalDistribution(
     portal: str,
     users: list[user_schema.UserSchema],
     fromDate: int | None,
@@ -219,7 +358,7 @@ def _buildPortalDistribution(
     hypnosisFromDate: int | None,
     hypnosisToDate: int | None,
 ) -> user_schema.UserPortalDistributionSchema:
-    baseDistribution = _buildGeneralDistribution(
+    baseDistribution = await _buildGeneralDistribution(
         users=users,
         subscriberActive=subscriberActive,
         hasHypnosisRequest=hasHypnosisRequest,
@@ -243,49 +382,184 @@ def _buildPortalDistribution(
     )
 
 
-def _buildGeneralDistribution(
-    users: list[user_schema.UserSchema],
-    subscriberActive: bool | None,
-    hasHypnosisRequest: bool | None,
-    fromDate: int | None,
-    toDate: int | None,
-    hypnosisFromDate: int | None,
-    hypnosisToDate: int | None,
-) -> user_schema.UserGeneralDistributionSchema:
-    totalUsers = len(users)
+def _newLanguageStats() -> dict[str, typing.Any]:
+    return {
+        "total": 0,
+        "genderCounter": collections.Counter(),
+        "ageCounter": collections.Counter(),
+        "genderAgeCounter": collections.defaultdict(collections.Counter),
+    }
+
 
+def _countDistributionScalar(
+    languages: list[str],
+    genders: list[str],
+    birthdates: list[str],
+    referenceDate: datetime.datetime,
+) -> tuple[dict[str, dict[str, typing.Any]], collections.Counter[str]]:
     languageStats: dict[str, dict[str, typing.Any]] = {}
     overallGenderCounter: collections.Counter[str] = collections.Counter()
+    referenceDay = _prepareBirthdateCache(referenceDate)
 
-    referenceDate = datetime.datetime.now(datetime.timezone.utc)
-
-    for user in users:
-        languageKey = user.language or UNKNOWN_LABEL
-        stats = languageStats.setdefault(
-            languageKey,
-            {
-                "total": 0,
-                "genderCounter": collections.Counter(),
-                "ageCounter": collections.Counter(),
-                "genderAgeCounter": collections.defaultdict(collections.Counter),
-            },
-        )
+    for languageKey, genderKey, birthdate in zip(languages, genders, birthdates):
+        stats = languageStats.get(languageKey)
+        if stats is None:
+            stats = languageStats[languageKey] = _newLanguageStats()
 
         stats["total"] += 1
 
-        genderKey = user.gender or UNKNOWN_LABEL
         stats["genderCounter"][genderKey] += 1
         overallGenderCounter[genderKey] += 1
 
-        age = _calculateAge(user.birthdate, referenceDate)
-        if age is None or age < 0:
-            ageBucket = UNKNOWN_AGE
-        else:
-            ageBucket = _resolveAgeBucket(age)
+        ageBucket = _resolveBirthdateBucket(birthdate, referenceDay)
 
         stats["ageCounter"][ageBucket] += 1
         stats["genderAgeCounter"][genderKey][ageBucket] += 1
 
+    return languageStats, overallGenderCounter
+
+
+def _resolveAgeBucketsVectorized(
+    birthdates: list[str],
+    referenceDate: datetime.datetime,
+) -> np.ndarray:
+    """
+    Calcula el bucket de edad de cada fecha de nacimiento en bloque.
+
+    Las fechas se factorizan para resolver cada valor distinto una sola vez con
+    el mismo cache del camino escalar; el resultado se expande con NumPy.
+    """
+
+    codes, uniqueBirthdates = pd.factorize(pd.Series(birthdates, dtype=object))
+    referenceDay = _prepareBirthdateCache(referenceDate)
+
+    uniqueBuckets = np.array(
+        [_resolveBirthdateBucket(birthdate, referenceDay) for birthdate in uniqueBirthdates],
+        dtype=object,
+    )
+
+    return uniqueBuckets[codes]
+
+
+def _countDistributionVectorized(
+    languages: list[str],
+    genders: list[str],
+    birthdates: list[str],
+    referenceDate: datetime.datetime,
+) -> tuple[dict[str, dict[str, typing.Any]], collections.Counter[str]]:
+    frame = pd.DataFrame(
+        {
+            "language": languages,
+            "gender": genders,
+            "ageBucket": _resolveAgeBucketsVectorized(birthdates, referenceDate),
+        }
+    )
+
+    # sort=False conserva el orden de primera aparición, igual que los Counter del camino escalar.
+    groupCounts = frame.groupby(["language", "gender", "ageBucket"], sort=False).size()
+
+    languageStats: dict[str, dict[str, typing.Any]] = {}
+    overallGenderCounter: collections.Counter[str] = collections.Counter()
+
+    for (languageKey, genderKey, ageBucket), count in groupCounts.items():
+        count = int(count)
+        stats = languageStats.get(languageKey)
+        if stats is None:
+            stats = languageStats[languageKey] = _newLanguageStats()
+
+        stats["total"] += count
+        stats["genderCounter"][genderKey] += count
+        stats["ageCounter"][ageBucket] += count
+        stats["genderAgeCounter"][genderKey][ageBucket] += count
+        overallGenderCounter[genderKey] += count
+
+    return languageStats, overallGenderCounter
+
+
+def _countDistribution(
+    languages: list[str],
+    genders: list[str],
+    birthdates: list[str],
+    referenceDate: datetime.datetime,
+) -> tuple[dict[str, dict[str, typing.Any]], collections.Counter[str]]:
+    # Sobre el umbral se cuenta en bloque con pandas/NumPy; ambos caminos producen
+    # exactamente los mismos conteos y el mismo orden de claves.
+    if len(languages) >= ENVIRONMENT_CONFIG.USERS_CONFIG.USER_DISTRIBUTION_VECTORIZED_MIN_USERS:
+        return _countDistributionVectorized(languages, genders, birthdates, referenceDate)
+    return _countDistributionScalar(languages, genders, birthdates, referenceDate)
+
+
+_processLimiter: anyio.CapacityLimiter | None = None
+
+
+def _getProcessLimiter() -> anyio.CapacityLimiter:
+    global _processLimiter
+
+    if _processLimiter is None:
+        _processLimiter = anyio.CapacityLimiter(
+            ENVIRONMENT_CONFIG.USERS_CONFIG.USER_DISTRIBUTION_PROCESS_WORKERS
+        )
+    return _processLimiter
+
+
+async def _countDistributionOffloaded(
+    users: list[user_schema.UserSchema],
+    referenceDate: datetime.datetime,
+) -> tuple[dict[str, dict[str, typing.Any]], collections.Counter[str]]:
+    """
+    Cuenta la distribución fuera del event loop.
+
+    Se envían solo tres columnas de texto (no la lista de UserSchema) para que
+    el envío a otro proceso sea barato. Con USER_DISTRIBUTION_PROCESS_WORKERS
+    mayor a 0 los conjuntos grandes se cuentan en procesos aparte, liberando el
+    GIL del worker web; el resto se cuenta en un hilo.
+    """
+
+    languages = [user.language or UNKNOWN_LABEL for user in users]
+    genders = [user.gender or UNKNOWN_LABEL for user in users]
+    birthdates = [user.birthdate for user in users]
+
+    usersConfig = ENVIRONMENT_CONFIG.USERS_CONFIG
+    if (
+        usersConfig.USER_DISTRIBUTION_PROCESS_WORKERS > 0
+        and len(users) >= usersConfig.USER_DISTRIBUTION_PROCESS_MIN_USERS
+    ):
+        try:
+            return await anyio.to_process.run_sync(
+                _countDistribution,
+                languages,
+                genders,
+                birthdates,
+                referenceDate,
+                limiter=_getProcessLimiter(),
+            )
+        except anyio.BrokenWorkerProcess:
+            LOGGER.exception("Falló el proceso de distribución; se calcula en un hilo.")
+
+    return await anyio.to_thread.run_sync(
+        _countDistribution,
+        languages,
+        genders,
+        birthdates,
+        referenceDate,
+    )
+
+
+async def _buildGeneralDistribution(
+    users: list[user_schema.UserSchema],
+    subscriberActive: bool | None,
+    hasHypnosisRequest: bool | None,
+    fromDate: int | None,
+    toDate: int | None,
+    hypnosisFromDate: int | None,
+    hypnosisToDate: int | None,
+) -> user_schema.UserGeneralDistributionSchema:
+    totalUsers = len(users)
+
+    referenceDate = datetime.datetime.now(datetime.timezone.utc)
+
+    languageStats, overallGenderCounter = await _countDistributionOffloaded(users, referenceDate)
+
     languageDistributions: list[user_schema.UserLanguageDistributionSchema] = []
 
     for languageKey in sorted(languageStats.keys()):
@@ -318,10 +592,12 @@ def _buildGeneralDistribution(
     )
 
 
-@aiocache.cached_stampede(
+@cache_utils.cachedStampede(
     lease=2,
     ttl=300,
-    skip_cache_func=lambda distribution: distribution.totalUsers == 0,
+    maxStaleSeconds=ANALYTICS_MAX_STALE_SECONDS,
+    isNegativeResult=lambda distribution: distribution.totalUsers == 0,
+    maxEntries=256,
 )
 async def _getUserPortalDistribution(
     portal: str,
@@ -353,19 +629,90 @@ async def _getUserPortalDistribution(
         hypnosisToDate=effectiveHypnosisToDate,
     )
 
-    return await anyio.to_thread.run_sync(
-        _buildPortalDistribution,
-        portal,
-        users,
-        fromDate,
-        toDate,
-        subscriberActive,
-        hasHypnosisRequest,
-        effectiveHypnosisFromDate,
-        effectiveHypnosisToDate,
+    return await _buildPortalDistribution(
+        portal=portal,
+        users=users,
+        fromDate=fromDate,
+        toDate=toDate,
+        subscriberActive=subscriberActive,
+        hasHypnosisRequest=hasHypnosisRequest,
+        hypnosisFromDate=effectiveHypnosisFromDate,
+        hypnosisToDate=effectiveHypnosisToDate,
+    )
+
+
+
+def _encodeUsersCursor(objectID: bson.ObjectId) -> str:
+    return base64.urlsafe_b64encode(objectID.binary).decode("ascii").rstrip("=")
+
+
+def _decodeUsersCursor(cursor: str) -> bson.ObjectId:
+    """Convierte el token de continuación en el _id del último usuario entregado."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return bson.ObjectId(raw)
+    except (ValueError, TypeError, bson.errors.InvalidId) as error:
+        raise ValueError("El cursor de paginación no es válido.") from error
+
+
+async def getUsersPage(
+    cursor: str | None,
+    pageSize: int,
+    portal: str | None,
+    fromDate: int | None,
+    toDate: int | None,
+    subscriberActive: bool | None,
+    hasHypnosisRequest: bool | None,
+    hypnosisFromDate: int | None,
+    hypnosisToDate: int | None,
+) -> user_schema.UserPageSchema:
+    """
+    Obtiene una página del listado de usuarios con paginación por _id.
+
+    No se cachea: cada página es barata (recorre el índice desde el cursor) y
+    el listado se usa para revisar usuarios concretos.
+
+    Raises:
+        ValueError: Si el cursor no corresponde a un token emitido por el listado.
+    """
+
+    afterID = _decodeUsersCursor(cursor) if cursor else None
+
+    effectiveHypnosisFromDate = hypnosisFromDate
+    effectiveHypnosisToDate = hypnosisToDate
+
+    # Mismo criterio que las distribuciones: sin rango propio se reutiliza el de creación.
+    if effectiveHypnosisFromDate is None and hasHypnosisRequest is not None:
+        effectiveHypnosisFromDate = fromDate
+
+    if effectiveHypnosisToDate is None and hasHypnosisRequest is not None:
+        effectiveHypnosisToDate = toDate
+
+    users, hasMore = await USERS_REPOSITORY.getUsersPage(
+        afterID=afterID,
+        pageSize=pageSize,
+        portal=portal,
+        fromDate=fromDate,
+        toDate=toDate,
+        subscriberActive=subscriberActive,
+        hasHypnosisRequest=hasHypnosisRequest,
+        hypnosisFromDate=effectiveHypnosisFromDate,
+        hypnosisToDate=effectiveHypnosisToDate,
     )
 
+    nextCursor: str | None = None
+    if hasMore and users and users[-1].id is not None:
+        nextCursor = _encodeUsersCursor(users[-1].id)
 
+    return user_schema.UserPageSchema(
+        users=users,
+        pageSize=pageSize,
+        nextCursor=nextCursor,
+        portal=portal,
+        fromDate=fromDate,
+        toDate=toDate,
+    )
 
 
 getUsersWithAURACount = typing.cast(
@@ -414,3 +761,12 @@ getGeneralUserDistribution = typing.cast(
     ],
     _getGeneralUserDistribution,
 )
+
+
+getUserFactsCube = typing.cast(
+    typing.Callable[
+        [int | None, int | None],
+        typing.Awaitable[user_schema.UserFactsCubeSchema],
+    ],
+    _getUserFactsCube,
+)